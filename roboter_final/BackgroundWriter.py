@@ -0,0 +1,55 @@
+import queue
+import threading
+
+
+class BackgroundWriter:
+    """
+    Führt Schreibaufträge (txt-Dateien, Debug-Bilder, ...) in einem eigenen Thread aus,
+    damit sie nicht zwischen Anhalten am Knoten und Weiterfahren liegen.
+
+    Die Warteschlange ist begrenzt: ist sie voll, wird der Auftrag verworfen statt
+    den Aufrufer zu blockieren.
+    """
+
+    def __init__(self, max_queue=16, name="BackgroundWriter"):
+        self._queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args, **kwargs) -> bool:
+        """
+        Reiht func(*args, **kwargs) zur Ausführung im Hintergrund ein.
+
+        Returns:
+            True, wenn der Auftrag angenommen wurde, False wenn die Warteschlange voll war.
+        """
+        try:
+            self._queue.put_nowait((func, args, kwargs))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            print(f"⚠️ BackgroundWriter voll, Auftrag {getattr(func, '__name__', func)} verworfen")
+            return False
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                func, args, kwargs = job
+                func(*args, **kwargs)
+            except Exception as e:
+                print(f"❌ Fehler im BackgroundWriter: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Wartet, bis alle bisher eingereihten Aufträge geschrieben sind."""
+        self._queue.join()
+
+    def close(self):
+        """Schreibt die restlichen Aufträge und beendet den Thread."""
+        self._queue.put(None)
+        self._thread.join()
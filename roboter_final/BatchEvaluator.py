@@ -0,0 +1,163 @@
+"""
+Headless Batch-Auswertung ganzer Bildordner (z.B. nach jedem Neutraining).
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.BatchEvaluator --model roboter_final/my_model.pt \
+        --images roboter_final/dataset scripts/work/pictures --out results.npz --batch 8
+
+Die Bilder werden von einem begrenzten Thread-Pool dekodiert (höchstens
+--prefetch Bilder liegen gleichzeitig im Speicher) und in Batches von --batch
+Bildern durch den Detector geschickt. Das Ergebnis ist eine spaltenweise Datei
+(.csv oder .npz) mit einer Zeile pro Erkennung.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from roboter_final.YoloDetector import YoloDetector
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+COLUMNS = ['image', 'klasse', 'vertrauen', 'x1', 'y1', 'x2', 'y2']
+
+
+def iter_image_paths(image_dirs, recursive=False):
+    """Bildpfade aller Ordner, sortiert (bearbeitete Bilder werden übersprungen)."""
+    for image_dir in image_dirs:
+        if os.path.isfile(image_dir):
+            yield image_dir
+            continue
+        walker = os.walk(image_dir) if recursive else [(image_dir, [], os.listdir(image_dir))]
+        for root, dirs, names in walker:
+            dirs.sort()
+            for name in sorted(names):
+                if name.lower().endswith(IMAGE_EXTENSIONS) and not name.startswith('bearbeitet_'):
+                    yield os.path.join(root, name)
+
+
+def iter_decoded(paths, workers=4, prefetch=16):
+    """
+    Dekodiert die Bilder parallel, liefert sie aber in der Reihenfolge von paths.
+
+    Es sind nie mehr als prefetch Bilder gleichzeitig in Arbeit oder fertig im Speicher.
+
+    Yields:
+        (pfad, frame) - frame ist None, wenn das Bild nicht gelesen werden konnte.
+    """
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="decode") as pool:
+        for path in paths:
+            if len(pending) >= prefetch:
+                done_path, future = pending.popleft()
+                yield done_path, future.result()
+            pending.append((path, pool.submit(cv2.imread, path)))
+        while pending:
+            done_path, future = pending.popleft()
+            yield done_path, future.result()
+
+
+def iter_batches(decoded, batch_size):
+    batch = []
+    for path, frame in decoded:
+        if frame is None:
+            print(f"⚠️ Bild konnte nicht gelesen werden: {path}")
+            continue
+        batch.append((path, frame))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class BatchEvaluator:
+    def __init__(self, detector: YoloDetector, batch_size=8, workers=4, prefetch=None, confidence_threshold=0.1):
+        self.detector = detector
+        self.batch_size = batch_size
+        self.workers = workers
+        self.prefetch = prefetch or 2 * batch_size
+        self.confidence_threshold = confidence_threshold
+
+    def run(self, paths):
+        """
+        Wertet alle Bilder aus.
+
+        Returns:
+            (images, rows, elapsed) - images: ausgewertete Bildpfade, rows: eine Zeile pro Erkennung
+            (bild_index, klasse, vertrauen, x1, y1, x2, y2), elapsed: Laufzeit in Sekunden.
+        """
+        images, rows = [], []
+        start = time.perf_counter()
+        for batch in iter_batches(iter_decoded(paths, self.workers, self.prefetch), self.batch_size):
+            results = self.detector.detect_batch([frame for _, frame in batch], self.confidence_threshold)
+            for (path, _), objects in zip(batch, results):
+                index = len(images)
+                images.append(path)
+                for obj in objects:
+                    rows.append((index, obj.klasse, obj.vertrauen) + tuple(obj.bounding_box))
+            print(f"  {len(images)} Bilder, {len(images) / (time.perf_counter() - start):.1f} Bilder/s", end="\r")
+        print()
+        return images, rows, time.perf_counter() - start
+
+
+def write_results(path, images, rows):
+    """Schreibt die Erkennungen spaltenweise als .csv oder .npz."""
+    if path.endswith(".npz"):
+        image_index = np.array([r[0] for r in rows], dtype=np.int32)
+        np.savez_compressed(
+            path,
+            images=np.array(images),
+            image_index=image_index,
+            klasse=np.array([r[1] for r in rows], dtype=str),
+            vertrauen=np.array([r[2] for r in rows], dtype=np.float32),
+            bbox=np.array([r[3:] for r in rows], dtype=np.int32).reshape(-1, 4),
+            detections_per_image=np.bincount(image_index, minlength=len(images)).astype(np.int32),
+        )
+    elif path.endswith(".csv"):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for index, klasse, vertrauen, x1, y1, x2, y2 in rows:
+                writer.writerow([images[index], klasse, f"{vertrauen:.1f}", x1, y1, x2, y2])
+    else:
+        raise ValueError(f"Unbekanntes Ausgabeformat: {path} (möglich: .csv, .npz)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="Pfad zum .pt- oder .onnx-Modell")
+    parser.add_argument("--images", nargs="+", required=True, help="Bildordner oder einzelne Bilder")
+    parser.add_argument("--out", required=True, help="Ergebnisdatei (.csv oder .npz)")
+    parser.add_argument("--recursive", action="store_true", help="Unterordner mit auswerten")
+    parser.add_argument("--backend", default="ultralytics", choices=["ultralytics", "onnx", "openvino"])
+    parser.add_argument("--precision", default="fp32", choices=["fp32", "int8"])
+    parser.add_argument("--batch", type=int, default=8, help="Bilder pro Detector-Aufruf")
+    parser.add_argument("--workers", type=int, default=4, help="Threads zum Dekodieren")
+    parser.add_argument("--prefetch", type=int, default=None, help="Max. dekodierte Bilder im Speicher")
+    parser.add_argument("--conf", type=float, default=0.1)
+    args = parser.parse_args()
+
+    paths = list(iter_image_paths(args.images, args.recursive))
+    if not paths:
+        print("❌ Keine Bilder gefunden")
+        return 1
+
+    detector = YoloDetector(args.model, backend=args.backend, precision=args.precision)
+    print(f"🧠 {detector}, {len(paths)} Bilder")
+    evaluator = BatchEvaluator(detector, args.batch, args.workers, args.prefetch, args.conf)
+    images, rows, elapsed = evaluator.run(paths)
+    write_results(args.out, images, rows)
+
+    print(f"✔ {len(images)} Bilder, {len(rows)} Erkennungen in {elapsed:.1f}s "
+          f"({len(images) / elapsed:.1f} Bilder/s) -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,25 +2,38 @@
 
 import cv2
 import numpy as np
-from shapely.geometry import LineString, box
 # Stellen Sie sicher, dass dieser Import für Ihre Projektstruktur korrekt ist
 from roboter_final.ErkannteObjekte import Objekt
+from roboter_final.Detections import Detections
+from roboter_final.Geometry import segment_hits_any_rect, segments_hit_rects
+from roboter_final.lineDetection import to_gray
 
 
 class CheckConnection:
     """
     Analysiert und visualisiert eine Verbindung auf einem einzigen, bearbeiteten Bild.
-    Benötigt nur den Pfad zum bearbeiteten Bild und die Objektliste.
+    Benötigt nur das bearbeitete Bild (Pfad oder Array) und die Objektliste.
     """
 
-    def __init__(self, image_path, object_list):
-        self.image_path = image_path
-        self.image_for_analysis = cv2.imread(self.image_path, cv2.IMREAD_GRAYSCALE)
-        if self.image_for_analysis is None:
-            raise FileNotFoundError(f"Bild konnte nicht geladen werden: {self.image_path}")
+    def __init__(self, image, object_list):
+        """
+        Args:
+            image: Pfad zum bearbeiteten Bild oder das Bild selbst als Array, entweder
+                   Graustufen (lineDetection.process_frame mit return_gray=True) oder BGR.
+        """
+        if isinstance(image, np.ndarray):
+            self.image_path = None
+            self.image_for_analysis = to_gray(image)
+        else:
+            self.image_path = image
+            self.image_for_analysis = cv2.imread(self.image_path, cv2.IMREAD_GRAYSCALE)
+            if self.image_for_analysis is None:
+                raise FileNotFoundError(f"Bild konnte nicht geladen werden: {self.image_path}")
 
         self.height, self.width = self.image_for_analysis.shape
-        self.all_objects = self._parse_objects(object_list)
+        self._non_white_masks = {}
+        self._bar_mask = None
+        self.detections = self._parse_objects(object_list)
         self._reset_analysis_state()
 
     def _reset_analysis_state(self):
@@ -28,106 +41,109 @@ class CheckConnection:
         self.candidate_objects = []
         self.winning_object = None
         self.is_wall_collision = False
-        self.bottom_grid_squares = []
+        # Raster unten im Bild, eine Zeile pro Quadrat: x_start, y_start, x_end, y_end, is_candidate, is_winner
+        self.bottom_grid = np.zeros((0, 6), dtype=np.int64)
         self.last_line_check_details = {}
+        self.ranking = []
 
     def _parse_objects(self, object_list):
         """
-        Parst eine Liste von Objekten in ein einheitliches Dictionary-Format.
-        Diese Methode kann drei Arten von Listen verarbeiten:
-        1. Eine Liste von rohen Strings aus einer Textdatei.
-        2. Eine bereits geparste Liste von Dictionaries.
-        3. Eine Liste von `Objekt`-Instanzen aus ErkannteObjekte.py.
+        Wandelt die Objektliste in eine Detections-Tabelle um.
+        Diese Methode kann vier Arten von Eingaben verarbeiten:
+        1. Eine Detections-Tabelle (wird direkt übernommen).
+        2. Eine Liste von rohen Strings aus einer Textdatei.
+        3. Eine bereits geparste Liste von Dictionaries.
+        4. Eine Liste von `Objekt`-Instanzen (ErkannteObjekte.py, YoloDetector.py, ...).
         """
+        if isinstance(object_list, Detections):
+            return object_list
         if not object_list:
-            return []
+            return Detections()
 
-        parsed_list = []
         first_item = object_list[0]
-
-        # Fall 1: Die Liste enthält rohe Strings
         if isinstance(first_item, str):
-            for line in object_list:
-                line = line.strip()
-                if not line: continue
-                try:
-                    parts = line.strip(';').split(';')
-                    typ = parts[0]
-                    # Bbox wird bereits als int geparst
-                    bbox = tuple(map(int, parts[2].strip('()').split(',')))
-                    # Zentrum wird bereits als int geparst
-                    center = tuple(int(float(c)) for c in parts[4].strip('()').split(','))
-                    parsed_list.append({'type': typ, 'bbox': bbox, 'center': center})
-                except Exception as e:
-                    print(f"Warnung: Konnte String nicht parsen: '{line}' - {e}")
-            return parsed_list
-
-        # Fall 2: Die Liste enthält bereits Dictionaries
-        elif isinstance(first_item, dict):
-            # Wir nehmen an, das Format ist bereits korrekt und geben es direkt zurück.
-            return object_list
-
-        # Fall 3: Die Liste enthält Instanzen der 'Objekt'-Klasse
-        else:
-            for obj in object_list:
-                try:
-                    # KORREKTUR 1: Wandle das Zentrum-Tupel von float in int um.
-                    # Dies ist entscheidend, um den cv2.line-Fehler zu verhindern.
-                    center_as_int = (int(obj.zentrum[0]), int(obj.zentrum[1]))
-
-                    # KORREKTUR 2: Verwende die korrekten Attributnamen aus der Objekt-Klasse.
-                    parsed_list.append({
-                        'type': obj.klasse,  # Statt 'obj.typ'
-                        'bbox': obj.bounding_box,  # Statt 'obj.bbox'
-                        'center': center_as_int  # Statt 'obj.center'
-                    })
-                except AttributeError as e:
-                    print(f"Warnung: Attribut-Fehler beim Parsen der Objekt-Instanz. {e}")
-                except (ValueError, TypeError) as e:
-                    print(f"Warnung: Typ-Fehler beim Umwandeln der Zentrum-Koordinaten für {obj}: {e}")
-            return parsed_list
+            return Detections.from_lines(object_list)
+        if isinstance(first_item, dict):
+            return Detections.from_dicts(object_list)
+        try:
+            return Detections.from_objects(object_list)
+        except (AttributeError, ValueError, TypeError) as e:
+            print(f"Warnung: Objekt-Instanzen konnten nicht geparst werden: {e}")
+            return Detections()
+
+    @property
+    def all_objects(self):
+        """Alle Objekte im Dict-Format ({'type', 'bbox', 'center'}), z.B. für die Visualisierung."""
+        return self.detections.to_dicts()
+
+    def _non_white_mask(self, weiss_schwelle):
+        """Maske der nicht-weissen Pixel, pro Bild und Schwelle nur einmal berechnet."""
+        mask = self._non_white_masks.get(weiss_schwelle)
+        if mask is None:
+            mask = self._non_white_masks[weiss_schwelle] = self.image_for_analysis < weiss_schwelle
+        return mask
+
+    @property
+    def bottom_grid_squares(self):
+        """Das Raster als Dicts ({'rect', 'is_candidate', 'is_winner'}), nur für die Visualisierung."""
+        squares = []
+        for x_start, y_start, x_end, y_end, is_candidate, is_winner in self.bottom_grid.tolist():
+            square = {'rect': (x_start, y_start, x_end, y_end), 'is_candidate': bool(is_candidate)}
+            if is_winner:
+                square['is_winner'] = True
+            squares.append(square)
+        return squares
 
     def _find_bottom_target_point(self, weiss_schwelle):
-        self.bottom_grid_squares = []
         search_y_start = self.height - 150  # Robusterer, größerer Suchbereich
         square_size = 50
-        non_white_mask = self.image_for_analysis < weiss_schwelle
-        candidate_squares = []
-        for x in range(0, self.width, square_size):
-            x_start, x_end = x, min(x + square_size, self.width)
-            y_start, y_end = search_y_start, self.height
-            square_roi = non_white_mask[y_start:y_end, x_start:x_end]
-            non_white_pixel_count = np.count_nonzero(square_roi)
-            center_point = (x_start + (x_end - x_start) // 2, y_start + (y_end - y_start) // 2)
-            grid_square_info = {'rect': (x_start, y_start, x_end, y_end), 'is_candidate': non_white_pixel_count > 50}
-            self.bottom_grid_squares.append(grid_square_info)
-            if grid_square_info['is_candidate']:
-                candidate_squares.append({'center': center_point, 'pos_x': center_point[0]})
-        if not candidate_squares: return None
-        image_center_x = self.width / 2
-        candidate_squares.sort(key=lambda sq: abs(sq['pos_x'] - image_center_x))
-        winner_center_x = candidate_squares[0]['pos_x']
-        for sq in self.bottom_grid_squares:
-            if (sq['rect'][0] + (sq['rect'][2] - sq['rect'][0]) // 2) == winner_center_x:
-                sq['is_winner'] = True
-        return candidate_squares[0]['center']
+        # Der Streifen allein ist billig, die ganze Maske nur verwenden, wenn sie schon existiert
+        mask = self._non_white_masks.get(weiss_schwelle)
+        band = (mask[search_y_start:self.height] if mask is not None
+                else self.image_for_analysis[search_y_start:self.height] < weiss_schwelle)
+        # Nicht-weisse Pixel pro 50-px-Quadrat: Spaltensummen des Streifens, dann pro Quadrat summiert
+        x_starts = np.arange(0, self.width, square_size)
+        column_counts = (cv2.reduce(band.view(np.uint8), 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S)[0]
+                         if band.size else np.zeros(self.width, dtype=np.int32))
+        counts = np.add.reduceat(column_counts, x_starts)
+        x_ends = np.minimum(x_starts + square_size, self.width)
+        centers_x = x_starts + (x_ends - x_starts) // 2
+
+        grid = np.zeros((len(x_starts), 6), dtype=np.int64)
+        grid[:, 0], grid[:, 1], grid[:, 2], grid[:, 3] = x_starts, search_y_start, x_ends, self.height
+        grid[:, 4] = counts > 50
+        self.bottom_grid = grid
+        candidates = np.flatnonzero(grid[:, 4])
+        if len(candidates) == 0: return None
+        # Das Quadrat, das horizontal am nächsten zur Bildmitte liegt (bei Gleichstand das linke)
+        winner = candidates[np.argmin(np.abs(centers_x[candidates] - self.width / 2))]
+        grid[winner, 5] = 1
+        return int(centers_x[winner]), search_y_start + (self.height - search_y_start) // 2
 
     def _find_candidate_objects(self):
-        candidate_types = ['point', 'pointa', 'pointb', 'pointc', 'barrier']
-        candidates = [obj for obj in self.all_objects if obj['type'] in candidate_types]
-        if not candidates: return []
-        image_center_x = self.width / 2
-        candidates.sort(key=lambda obj: abs(obj['center'][0] - image_center_x))
-        return candidates[:2]
+        # Die zwei Punkte/Barrieren, die horizontal am nächsten zur Bildmitte liegen
+        return self.detections.nodes().nearest_to_x(self.width / 2, k=2).to_dicts()
+
+    def _bar_coverage(self, p1, p2, weiss_schwelle, balken_breite):
+        """(nicht-weisse Pixel, Pixel) im Balken von p1 nach p2."""
+        # Der Balken wird auf eine wiederverwendete Maske gezeichnet und nur in seinem
+        # umgebenden Rechteck gezählt und wieder gelöscht: Aufwand ~ Balken- statt Bildgrösse.
+        if self._bar_mask is None:
+            self._bar_mask = np.zeros_like(self.image_for_analysis)
+        cv2.line(self._bar_mask, p1, p2, 255, thickness=balken_breite)
+        margin = balken_breite // 2 + 2
+        x0, y0 = max(min(p1[0], p2[0]) - margin, 0), max(min(p1[1], p2[1]) - margin, 0)
+        x1, y1 = max(p1[0], p2[0]) + margin + 1, max(p1[1], p2[1]) + margin + 1
+        bar = self._bar_mask[y0:y1, x0:x1]
+        bar_pixels = bar.view(bool)
+        total_pixels = np.count_nonzero(bar_pixels)
+        non_white_pixels = np.count_nonzero(self._non_white_mask(weiss_schwelle)[y0:y1, x0:x1] & bar_pixels)
+        bar[:] = 0
+        return non_white_pixels, total_pixels
 
     def _is_line_present(self, p1, p2, weiss_schwelle, linien_schwelle, balken_breite):
-        mask = np.zeros_like(self.image_for_analysis)
-        cv2.line(mask, p1, p2, 255, thickness=balken_breite)
-        total_pixels = np.count_nonzero(mask)
+        non_white_pixels, total_pixels = self._bar_coverage(p1, p2, weiss_schwelle, balken_breite)
         if total_pixels == 0: return False
-        non_white_mask = (self.image_for_analysis < weiss_schwelle).astype(np.uint8) * 255
-        intersection = cv2.bitwise_and(non_white_mask, mask)
-        non_white_pixels = np.count_nonzero(intersection)
         ratio = (non_white_pixels / total_pixels) if total_pixels > 0 else 0
         if not self.last_line_check_details:
             self.last_line_check_details = {
@@ -138,12 +154,7 @@ class CheckConnection:
         return ratio > linien_schwelle
 
     def _check_wall_collision(self, p1, p2):
-        line = LineString([p1, p2])
-        wall_objects = [obj for obj in self.all_objects if obj['type'] == 'wall']
-        for wall in wall_objects:
-            if line.intersects(box(wall['bbox'][0], wall['bbox'][1], wall['bbox'][2], wall['bbox'][3])):
-                return True
-        return False
+        return segment_hits_any_rect(p1, p2, self.detections.walls().bboxes)
 
     def check_connection(self, linien_schwelle=0.05, weiss_schwelle=255, balken_breite=10):
         self._reset_analysis_state()
@@ -162,15 +173,78 @@ class CheckConnection:
         else:
             return 1
 
+    def rank_connections(self, linien_schwelle=0.05, weiss_schwelle=255, balken_breite=10,
+                         center_zone_width_pixels=600):
+        """
+        Bewertet die Verbindung vom Startpunkt zu allen Punkten und Barrieren im Bild, nicht
+        nur zu den zwei mittleren wie check_connection.
+
+        Returns:
+            Liste von Dicts ({'type', 'bbox', 'center'} plus 'coverage' (Anteil nicht-weisser
+            Pixel im Balken), 'connected', 'wall', 'direction' und 'status' (0-3 wie
+            check_connection)). Verbundene zuerst, danach jeweils nach horizontalem Abstand
+            zur Bildmitte. Gibt es bei check_connection einen Gewinner, steht er vorne.
+            Leer, wenn unten keine Linie gefunden wird.
+        """
+        start_point = self._find_bottom_target_point(weiss_schwelle)
+        nodes = self.detections.nodes().nearest_to_x(self.width / 2)
+        if start_point is None or len(nodes) == 0:
+            self.ranking = []
+            return self.ranking
+
+        hypotheses = nodes.to_dicts()
+        coverage = np.zeros(len(hypotheses))
+        # Balken für Balken auf der einmal berechneten Maske: nur das umgebende Rechteck wird
+        # gelesen. Alle Balken-Indizes zu sammeln und in einem Zug zu zählen war langsamer.
+        for i, candidate in enumerate(hypotheses):
+            non_white_pixels, total_pixels = self._bar_coverage(start_point, candidate['center'], weiss_schwelle,
+                                                                balken_breite)
+            coverage[i] = non_white_pixels / total_pixels if total_pixels else 0.0
+        connected = coverage > linien_schwelle
+        centers = np.array([candidate['center'] for candidate in hypotheses])
+        walls = segments_hit_rects([start_point] * len(hypotheses), centers,
+                                   self.detections.walls().bboxes).any(axis=1)
+        directions = self._turn_directions(centers[:, 0], center_zone_width_pixels)
+        is_barrier = nodes.classes == 'barrier'
+        status = np.where(~connected, 0, np.where(is_barrier, 3, np.where(walls, 2, 1)))
+
+        for i, hypothesis in enumerate(hypotheses):
+            hypothesis.update(coverage=float(coverage[i]), connected=bool(connected[i]), wall=bool(walls[i]),
+                              direction=str(directions[i]), status=int(status[i]))
+        # Stabil: innerhalb von verbunden/nicht verbunden bleibt die Reihenfolge nach Abstand zur Mitte
+        self.ranking = [hypotheses[i] for i in np.argsort(~connected, kind='stable')]
+        return self.ranking
 
     def visualize_connection_analysis(self, final_status, show_grid=True):
-        vis_img = cv2.imread(self.image_path)
+        vis_img_display = self.render_connection_analysis(final_status, show_grid)
+        if vis_img_display is None:
+            return
+
+        window_name = "Analyse-Visualisierung"
+        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+        cv2.imshow(window_name, vis_img_display)
+        cv2.waitKey(0)
+        cv2.destroyAllWindows()
+
+    def render_connection_analysis(self, final_status, show_grid=True, max_height=720):
+        """
+        Zeichnet das Ergebnis der letzten check_connection-Analyse (nichts wird neu berechnet).
+
+        Args:
+            max_height: Maximale Höhe des Bildes, grössere Bilder werden verkleinert.
+
+        Returns:
+            Das BGR-Bild oder None, wenn das Bild nicht geladen werden konnte.
+        """
+        if self.image_path is None:
+            vis_img = cv2.cvtColor(self.image_for_analysis, cv2.COLOR_GRAY2BGR)
+        else:
+            vis_img = cv2.imread(self.image_path)
         if vis_img is None:
             print("Fehler: Visualisierungsbild konnte nicht geladen werden.")
-            return
+            return None
 
         # --- BILD-SKALIERUNG ---
-        max_height = 720  # Maximale Höhe für das Fenster
         h, w, _ = vis_img.shape
         scale_factor = 1.0  # Standard-Skalierungsfaktor ist 1 (keine Änderung)
 
@@ -223,7 +297,7 @@ class CheckConnection:
                 cv2.putText(vis_img_display, text, pos, cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 3)
                 cv2.putText(vis_img_display, text, pos, cv2.FONT_HERSHEY_SIMPLEX, 0.6, text_color, 1)
 
-        if show_grid and self.bottom_grid_squares:
+        if show_grid:
             for sq in self.bottom_grid_squares:
                 rect_scaled = scale_rect(sq['rect'])
                 if sq.get('is_winner', False):
@@ -261,17 +335,15 @@ class CheckConnection:
         cv2.putText(vis_img_display, status_text, (20, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 4, cv2.LINE_AA)
         cv2.putText(vis_img_display, status_text, (20, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, colors['text'], 2, cv2.LINE_AA)
 
-        window_name = "Analyse-Visualisierung"
-        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-        cv2.imshow(window_name, vis_img_display)
-        cv2.waitKey(0)
-        cv2.destroyAllWindows()
+        return vis_img_display
 
     def get_turn_direction(self, center_zone_width_pixels=600):
         if self.winning_object is None:
             return "keine Richtung"
+        return str(self._turn_directions(np.array([self.winning_object['center'][0]]), center_zone_width_pixels)[0])
 
-        object_center_x = self.winning_object['center'][0]
+    def _turn_directions(self, object_center_x, center_zone_width_pixels):
+        """'links', 'mitte' oder 'rechts' für jedes x in object_center_x."""
         image_center_x = self.width / 2
 
         # Berechne die halbe Breite der "Mitte"-Zone in Pixeln
@@ -281,13 +353,8 @@ class CheckConnection:
         left_zone_end = image_center_x - half_center_zone_width
         right_zone_start = image_center_x + half_center_zone_width
 
-        if object_center_x < left_zone_end:
-            return "links"
-        elif object_center_x > right_zone_start:
-            return "rechts"
-        else:
-            return "mitte"
-
+        return np.where(object_center_x < left_zone_end, "links",
+                        np.where(object_center_x > right_zone_start, "rechts", "mitte"))
 
 if __name__ == "__main__":
     processed_image_path = r"C:\Users\marin\PycharmProjects\PREN1G11\roboter_final\dummy_data\edited_F.jpg"
@@ -0,0 +1,115 @@
+import copy
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+# Standard-Schwelle für "gleiche Ansicht": höchstens so viele der 64 Hash-Bits dürfen abweichen
+DEFAULT_MAX_DISTANCE = 6
+
+
+def dhash(frame, hash_size=8):
+    """
+    Difference-Hash des Frames: Graustufen, auf (hash_size + 1) x hash_size verkleinert,
+    pro Pixel ein Bit "heller als der rechte Nachbar". Ergibt einen hash_size² Bit Integer.
+    """
+    # Vorher jede n-te Zeile/Spalte nehmen: bei 8x9 Zielpixeln ändert das am Hash praktisch nichts
+    step = max(1, min(frame.shape[0] // (hash_size * 8), frame.shape[1] // ((hash_size + 1) * 8)))
+    frame = frame[::step, ::step]
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+class DetectionCache:
+    """
+    LRU-Cache vor YoloDetector.detect für Wiederholungsaufnahmen am selben Knoten.
+
+    Schlüssel ist der dHash des Frames plus Modellversion, Vertrauensschwelle und der
+    Standpunkt (view, z.B. Knoten und Ausrichtung). Ein Frame gilt als "gleiche Ansicht",
+    wenn er vom selben Standpunkt kommt und sein Hash höchstens max_distance Bits von einem
+    gespeicherten Hash abweicht. max_distance=0 lässt nur identische Hashes zu.
+    Ohne view werden alle Frames verglichen; die Aufnahmen an verschiedenen Knoten sind
+    aber zum grössten Teil weisses Feld und liegen im Hash oft nah beieinander.
+    """
+
+    def __init__(self, max_entries=32, max_distance=DEFAULT_MAX_DISTANCE):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._entries = OrderedDict()  # (model_version, confidence, view, hash) -> Objekt-Liste
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, frame_hash, model_version, confidence_threshold, view=None):
+        """Gespeicherte Objekte zur ähnlichsten Ansicht oder None."""
+        with self._lock:
+            best_key, best_distance = None, self.max_distance + 1
+            for key in self._entries:
+                version, confidence, cached_view, cached_hash = key
+                if version != model_version or confidence != confidence_threshold or cached_view != view:
+                    continue
+                distance = hamming_distance(frame_hash, cached_hash)
+                if distance < best_distance:
+                    best_key, best_distance = key, distance
+                    if distance == 0:
+                        break
+
+            if best_key is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best_key)
+            return copy.deepcopy(self._entries[best_key])
+
+    def store(self, frame_hash, model_version, confidence_threshold, objects, view=None):
+        with self._lock:
+            key = (model_version, confidence_threshold, view, frame_hash)
+            self._entries[key] = copy.deepcopy(objects)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def detect(self, detector, image, confidence_threshold=0.1, as_table=False, view=None):
+        """
+        Wie detector.detect (bzw. detector.detect_table mit as_table=True), aber bei einem
+        Treffer ohne Inferenz. Treffer gibt es nur unter gleichem view (hashbar, z.B.
+        (Knoten, Ausrichtung)).
+
+        Die zurückgegebenen Objekte sind Kopien, Änderungen (z.B. gesetzte Buchstaben)
+        wirken sich nicht auf den Cache aus.
+        """
+        frame = detector.decode_frame(image)
+        frame_hash = dhash(frame)
+        version = f"{detector.model_version}:table" if as_table else detector.model_version
+        objects = self.lookup(frame_hash, version, confidence_threshold, view)
+        if objects is not None:
+            print(f"♻️ Detection-Cache Treffer ({self.hits} Treffer / {self.misses} Fehlschläge)")
+            return objects
+
+        detect = detector.detect_table if as_table else detector.detect
+        objects = detect(frame, confidence_threshold)
+        self.store(frame_hash, version, confidence_threshold, objects, view)
+        return objects
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self._entries),
+        }
@@ -0,0 +1,125 @@
+"""
+Binäres Dateiformat (.det) für Erkennungen, Ersatz für detected_objects.txt.
+
+Aufbau (little-endian):
+    Header   16 Byte  struct "<8sHHI": MAGIC, Version, Anzahl Klassennamen, Anzahl Datensätze
+    Namen    je 16 Byte UTF-8, mit Nullbytes aufgefüllt (Index = class_id); längere Namen
+             lehnt write_detections mit ValueError ab
+    Daten    Anzahl Datensätze x Detections.DETECTION_DTYPE
+
+Beim Lesen werden die Datensätze nicht kopiert (np.frombuffer bzw. np.memmap).
+
+Alte txt-Dateien umwandeln (aus dem Repo-Hauptordner):
+    python -m roboter_final.DetectionFile roboter_final/dataset scripts/work/pictures
+"""
+import os
+import struct
+import sys
+
+import numpy as np
+
+from roboter_final.Detections import DETECTION_DTYPE, Detections
+
+MAGIC = b"PRENDET\0"
+VERSION = 1
+EXTENSION = ".det"
+_HEADER = struct.Struct("<8sHHI")
+_NAME_SIZE = 16
+
+
+def detection_path_for(path):
+    """Zu einem Bild- oder txt-Pfad gehörende .det-Datei."""
+    return os.path.splitext(path)[0] + EXTENSION
+
+
+def write_detections(path, detections: Detections):
+    """Schreibt die Tabelle atomar (erst temporäre Datei, dann umbenennen)."""
+    encoded = [name.encode('utf-8') for name in detections.class_names]
+    too_long = [name for name, raw in zip(detections.class_names, encoded) if len(raw) > _NAME_SIZE]
+    if too_long:
+        # Abgeschnittene Namen würden beim Lesen nicht mehr zur Klassentabelle passen
+        raise ValueError(f"Klassennamen länger als {_NAME_SIZE} Byte: {', '.join(too_long)}")
+    names = b"".join(raw.ljust(_NAME_SIZE, b"\0") for raw in encoded)
+    data = np.ascontiguousarray(detections.data, dtype=DETECTION_DTYPE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(detections.class_names), len(data)))
+        f.write(names)
+        f.write(data.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_detections(path, mmap=False):
+    """
+    Liest eine .det-Datei. Die Datensätze werden nicht kopiert, sondern direkt auf den
+    gelesenen Puffer (bzw. mit mmap=True auf die Datei) abgebildet und sind deshalb nur
+    lesbar; vor Änderungen (z.B. set_letter) Detections.copy() verwenden.
+
+    Args:
+        mmap: Datei per np.memmap abbilden statt einlesen (für sehr grosse Dateien).
+    """
+    with open(path, 'rb') as f:
+        buffer = f.read(_HEADER.size) if mmap else f.read()
+    if len(buffer) < _HEADER.size:
+        raise ValueError(f"{path}: Datei zu kurz für einen Detection-Header")
+    magic, version, n_names, n_records = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: keine Detection-Datei")
+    if version != VERSION:
+        raise ValueError(f"{path}: Version {version} wird nicht unterstützt (erwartet {VERSION})")
+
+    offset = _HEADER.size + n_names * _NAME_SIZE
+    if mmap:
+        with open(path, 'rb') as f:
+            f.seek(_HEADER.size)
+            names = f.read(n_names * _NAME_SIZE)
+        data = (np.memmap(path, dtype=DETECTION_DTYPE, mode='r', offset=offset, shape=(n_records,))
+                if n_records else np.zeros(0, dtype=DETECTION_DTYPE))
+    else:
+        names = buffer[_HEADER.size:offset]
+        data = np.frombuffer(buffer, dtype=DETECTION_DTYPE, count=n_records, offset=offset)
+
+    class_names = [names[i:i + _NAME_SIZE].rstrip(b"\0").decode('utf-8') for i in range(0, len(names), _NAME_SIZE)]
+    return Detections(data, class_names)
+
+
+def read_txt(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return Detections.from_lines(f.read().splitlines())
+
+
+def load_detections(path, mmap=False):
+    """Liest .det oder (ältere) .txt-Dateien; bei einer .txt wird eine vorhandene .det bevorzugt."""
+    det_path = detection_path_for(path)
+    if os.path.exists(det_path):
+        return read_detections(det_path, mmap)
+    return read_txt(path)
+
+
+def convert_txt(txt_path, det_path=None):
+    """Wandelt eine detected_objects-txt in eine .det-Datei daneben um."""
+    det_path = det_path or detection_path_for(txt_path)
+    write_detections(det_path, read_txt(txt_path))
+    return det_path
+
+
+def main(paths):
+    if not paths:
+        print(__doc__)
+        return 1
+    converted = 0
+    for path in paths:
+        txt_paths = [path] if os.path.isfile(path) else [
+            os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".txt")]
+        for txt_path in txt_paths:
+            try:
+                print(f"✔ {txt_path} -> {convert_txt(txt_path)}")
+                converted += 1
+            except (OSError, ValueError) as e:
+                print(f"❌ {txt_path}: {e}")
+    print(f"{converted} Dateien umgewandelt")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
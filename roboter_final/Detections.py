@@ -0,0 +1,259 @@
+"""
+Kompakte Erkennungstabelle: alle Erkennungen eines Bildes in einem NumPy-Structured-Array
+statt einer Liste von Objekt-Instanzen.
+
+Spalten: class_id, confidence (Prozent wie Objekt.vertrauen), bbox (x1, y1, x2, y2),
+center (wie Objekt.zentrum, bei 'barrier' der Punkt auf dem Balken), area und letter.
+class_id verweist auf class_names der Tabelle (beim YoloDetector die Modell-Labels).
+"""
+import numpy as np
+
+CLASSES = ('point', 'pointa', 'pointb', 'pointc', 'barrier', 'wall')
+POINT_CLASSES = ('point', 'pointa', 'pointb', 'pointc')
+# Klassen, die als Knoten in Frage kommen (Punkte und Barrieren)
+NODE_CLASSES = POINT_CLASSES + ('barrier',)
+FIXED_LETTERS = {'pointa': 'A', 'pointb': 'B', 'pointc': 'C'}
+
+# Feste Byte-Reihenfolge, damit DetectionFile die Datensätze ohne Kopie lesen kann
+DETECTION_DTYPE = np.dtype([
+    ('class_id', '<i2'),
+    ('confidence', '<f4'),
+    ('bbox', '<i4', 4),
+    ('center', '<f4', 2),
+    ('area', '<i8'),
+    ('letter', '<U1'),
+])
+
+
+def parse_tuple(text, cast=float):
+    """'(1, 2, 3)' -> (1, 2, 3) ohne eval; cast wird auf jeden Wert angewendet."""
+    return tuple(cast(v) for v in text.strip().strip('()').split(','))
+
+
+def compute_centers(bboxes, class_ids, barrier_id):
+    """Zentren wie Objekt._center, 'barrier' bekommt den Punkt unten auf dem Balken."""
+    bboxes = bboxes.astype(np.float64)
+    centers = np.empty((len(bboxes), 2), dtype=np.float64)
+    centers[:, 0] = (bboxes[:, 0] + bboxes[:, 2]) / 2
+    centers[:, 1] = (bboxes[:, 1] + bboxes[:, 3]) / 2
+    is_barrier = class_ids == barrier_id
+    centers[is_barrier, 1] = bboxes[is_barrier, 3] - (bboxes[is_barrier, 2] - bboxes[is_barrier, 0]) / 2
+    return centers
+
+
+class Detections:
+    def __init__(self, data=None, class_names=CLASSES):
+        self.data = np.zeros(0, dtype=DETECTION_DTYPE) if data is None else data
+        self.class_names = tuple(class_names)
+
+    # --- Erzeugen ---
+
+    @classmethod
+    def from_arrays(cls, boxes, confidences, class_ids, class_names=CLASSES):
+        """
+        Aus der Backend-Ausgabe (boxes_xyxy, confidences 0..1, class_ids).
+
+        Args:
+            class_names: Name pro class_id, Liste oder Dict {id: name} (z.B. YoloDetector.labels).
+        """
+        if isinstance(class_names, dict):
+            class_names = [class_names.get(i, str(i)) for i in range(max(class_names) + 1)]
+        data = np.zeros(len(boxes), dtype=DETECTION_DTYPE)
+        if len(data):
+            names = np.asarray(class_names)
+            data['class_id'] = class_ids
+            data['confidence'] = np.asarray(confidences, dtype=np.float32) * 100
+            data['bbox'] = np.asarray(boxes).astype(np.int32)
+            bbox = data['bbox'].astype(np.int64)
+            data['area'] = (bbox[:, 2] - bbox[:, 0]) * (bbox[:, 3] - bbox[:, 1])
+            barrier_id = class_names.index('barrier') if 'barrier' in class_names else -1
+            data['center'] = compute_centers(data['bbox'], data['class_id'], barrier_id)
+            for klasse, letter in FIXED_LETTERS.items():
+                if klasse in class_names:
+                    data['letter'][names[data['class_id']] == klasse] = letter
+        return cls(data, class_names)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Aus (klasse, vertrauen, bbox, zentrum, buchstabe)-Tupeln; zentrum None = aus bbox berechnen.
+        """
+        class_names = list(CLASSES)
+        data = np.zeros(len(records), dtype=DETECTION_DTYPE)
+        if not records:
+            return cls(data, class_names)
+
+        for klasse, *_ in records:
+            if klasse not in class_names:
+                class_names.append(klasse)
+        index = {name: i for i, name in enumerate(class_names)}
+        data['class_id'] = [index[r[0]] for r in records]
+        data['confidence'] = [r[1] for r in records]
+        data['bbox'] = [r[2] for r in records]
+        data['letter'] = [r[4] or FIXED_LETTERS.get(r[0], '') for r in records]
+        bbox = data['bbox'].astype(np.int64)
+        data['area'] = (bbox[:, 2] - bbox[:, 0]) * (bbox[:, 3] - bbox[:, 1])
+
+        missing = np.array([r[3] is None for r in records], dtype=bool)
+        if not np.all(missing):
+            data['center'][~missing] = [r[3] for r in records if r[3] is not None]
+        if np.any(missing):
+            data['center'][missing] = compute_centers(bbox[missing], data['class_id'][missing], index['barrier'])
+        return cls(data, class_names)
+
+    @classmethod
+    def from_objects(cls, objects):
+        """Aus einer Liste von Objekt-Instanzen (egal aus welcher Objekt-Kopie)."""
+        return cls.from_records([(obj.klasse, obj.vertrauen, obj.bounding_box, obj.zentrum,
+                                  getattr(obj, 'buchstabe', None)) for obj in objects])
+
+    @classmethod
+    def from_dicts(cls, dicts):
+        """Aus dem Dict-Format von CheckConnection ({'type', 'bbox', 'center'})."""
+        return cls.from_records([(d['type'], d.get('confidence', 0.0), d['bbox'], d.get('center'), d.get('letter'))
+                                 for d in dicts])
+
+    @classmethod
+    def from_lines(cls, lines):
+        """
+        Aus den Zeilen einer detected_objects.txt ("klasse;vertrauen%;(bbox);flaeche;(zentrum);buchstabe").
+        Nicht lesbare Zeilen werden mit einer Warnung übersprungen.
+        """
+        records = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                parts = line.strip(';').split(';')
+                bbox = parse_tuple(parts[2], int)
+                center = parse_tuple(parts[4]) if len(parts) > 4 else None
+                letter = parts[5] if len(parts) > 5 and parts[5] else None
+                records.append((parts[0], float(parts[1].rstrip('%')), bbox, center, letter))
+            except (IndexError, ValueError) as e:
+                print(f"Warnung: Konnte String nicht parsen: '{line}' - {e}")
+        return cls.from_records(records)
+
+    # --- Zugriff ---
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, key):
+        """Ganzzahl -> einzelner Eintrag (np.void), sonst (Maske, Slice, Indizes) -> neue Tabelle."""
+        if isinstance(key, (int, np.integer)):
+            return self.data[key]
+        return Detections(self.data[key], self.class_names)
+
+    def __repr__(self):
+        entries = [f"{klasse}={letter}" if letter else str(klasse) for klasse, letter in zip(self.classes, self.letters)]
+        return f"Detections({', '.join(entries)})"
+
+    def copy(self):
+        return Detections(self.data.copy(), self.class_names)
+
+    @property
+    def classes(self):
+        """Klassennamen pro Zeile."""
+        return np.asarray(self.class_names + ('',))[self.data['class_id']]
+
+    @property
+    def bboxes(self):
+        return self.data['bbox']
+
+    @property
+    def centers(self):
+        return self.data['center']
+
+    @property
+    def confidences(self):
+        return self.data['confidence']
+
+    @property
+    def areas(self):
+        return self.data['area']
+
+    @property
+    def letters(self):
+        return self.data['letter']
+
+    def set_letter(self, index, letter):
+        self.data['letter'][index] = letter or ''
+        return self
+
+    # --- Vektorisierte Filter ---
+
+    def class_mask(self, *names):
+        ids = [i for i, name in enumerate(self.class_names) if name in names]
+        return np.isin(self.data['class_id'], ids)
+
+    def of_class(self, *names):
+        return self[self.class_mask(*names)]
+
+    def points(self):
+        return self.of_class(*POINT_CLASSES)
+
+    def nodes(self):
+        """Punkte und Barrieren (alles, was ein Knoten sein kann)."""
+        return self.of_class(*NODE_CLASSES)
+
+    def walls(self):
+        return self.of_class('wall')
+
+    def with_letter(self):
+        return self[self.data['letter'] != '']
+
+    def without_letter(self):
+        return self[self.data['letter'] == '']
+
+    def center_distances(self, point):
+        return np.hypot(self.centers[:, 0] - point[0], self.centers[:, 1] - point[1])
+
+    def nearest_to(self, point, k=None):
+        """Nach euklidischer Distanz des Zentrums zu point sortiert (stabil), optional nur die k nächsten."""
+        order = np.argsort(self.center_distances(point), kind='stable')
+        return self[order[:k]]
+
+    def nearest_to_x(self, x, k=None):
+        """
+        Nach horizontalem Abstand des Zentrums zu x sortiert (stabil), optional nur die k nächsten.
+        Verglichen werden die auf int gekürzten Zentren wie in to_dicts, damit Gleichstände
+        gleich aufgelöst werden wie bisher in CheckConnection.
+        """
+        order = np.argsort(np.abs(np.trunc(self.centers[:, 0]) - x), kind='stable')
+        return self[order[:k]]
+
+    def sorted_by_x(self, descending=False):
+        key = -self.centers[:, 0] if descending else self.centers[:, 0]
+        return self[np.argsort(key, kind='stable')]
+
+    def sorted_by_y(self, descending=True):
+        """Standard: unterster Punkt (grösstes y) zuerst."""
+        key = -self.centers[:, 1] if descending else self.centers[:, 1]
+        return self[np.argsort(key, kind='stable')]
+
+    # --- Umwandeln ---
+
+    def to_dicts(self):
+        """Dict-Format von CheckConnection, Zentren als int wie dort gebraucht."""
+        return [{'type': str(klasse), 'bbox': tuple(int(v) for v in row['bbox']),
+                 'center': (int(row['center'][0]), int(row['center'][1]))}
+                for klasse, row in zip(self.classes, self.data)]
+
+    def to_objects(self, objekt_class):
+        """Liste von Objekt-Instanzen für Code, der noch mit Objekt arbeitet."""
+        objects = []
+        for klasse, row in zip(self.classes, self.data):
+            obj = objekt_class(str(klasse), float(row['confidence']), tuple(int(v) for v in row['bbox']))
+            obj.buchstabe = str(row['letter']) or None
+            objects.append(obj)
+        return objects
+
+    def to_lines(self):
+        """Zeilen im Format der detected_objects.txt (wie YoloDetector.save_to_txt)."""
+        lines = []
+        for klasse, row in zip(self.classes, self.data):
+            bbox = tuple(int(v) for v in row['bbox'])
+            center = (float(row['center'][0]), float(row['center'][1]))
+            lines.append(f"{klasse};{row['confidence']:.1f}%;{bbox};{int(row['area'])};{center};{row['letter']}")
+        return lines
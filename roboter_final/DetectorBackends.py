@@ -0,0 +1,324 @@
+"""
+Austauschbare Inferenz-Backends für den YoloDetector.
+
+- "ultralytics": das ursprüngliche YOLO-Modell (.pt) über PyTorch.
+- "onnx": exportiertes ONNX-Modell über onnxruntime (CPU).
+- "openvino": exportiertes ONNX-Modell über OpenVINO (CPU).
+
+Alle Backends liefern dasselbe Format: (boxes_xyxy, confidences, class_ids) als
+NumPy-Arrays in Koordinaten des Originalbildes, predict_batch eine Liste davon
+(ein Eintrag pro Frame). ultralytics, onnxruntime und
+openvino werden erst beim Erzeugen des jeweiligen Backends importiert, damit auf
+dem Pi nur das gebraucht wird, was auch läuft.
+"""
+import ast
+import hashlib
+import json
+import os
+
+import cv2
+import numpy as np
+
+# Gleiche Standardwerte wie ultralytics, damit die Ergebnisse vergleichbar bleiben
+DEFAULT_IMGSZ = 640
+DEFAULT_IOU = 0.7
+MAX_DETECTIONS = 300
+_MAX_WH = 7680  # Klassen-Offset für klassenweise NMS in einem Durchlauf
+
+
+def letterbox(frame, imgsz=DEFAULT_IMGSZ, color=(114, 114, 114)):
+    """
+    Skaliert den Frame seitenverhältnistreu auf imgsz x imgsz und füllt den Rest auf.
+
+    Returns:
+        (bild, ratio, (pad_x, pad_y)) - ratio und Padding werden zum Zurückrechnen der Boxen gebraucht.
+    """
+    height, width = frame.shape[:2]
+    ratio = min(imgsz / height, imgsz / width)
+    new_w, new_h = int(round(width * ratio)), int(round(height * ratio))
+    pad_x, pad_y = (imgsz - new_w) / 2, (imgsz - new_h) / 2
+
+    if (new_w, new_h) != (width, height):
+        frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    padded = cv2.copyMakeBorder(frame, top, bottom, left, right, cv2.BORDER_CONSTANT, value=color)
+    return padded, ratio, (pad_x, pad_y)
+
+
+def preprocess(frame, imgsz=DEFAULT_IMGSZ):
+    """BGR-Frame -> NCHW float32 Blob (RGB, 0..1) plus Angaben zum Zurückrechnen."""
+    padded, ratio, pad = letterbox(frame, imgsz)
+    blob = cv2.dnn.blobFromImage(padded, scalefactor=1 / 255.0, swapRB=True)
+    return blob, ratio, pad
+
+
+def nms(boxes, scores, iou_threshold):
+    """
+    Greedy Non-Maximum-Suppression.
+
+    Args:
+        boxes: (N, 4) xyxy
+        scores: (N,)
+        iou_threshold: Boxen mit grösserer Überlappung zu einer besseren Box werden verworfen.
+
+    Returns:
+        Indizes der behaltenen Boxen, nach Score absteigend.
+    """
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+    keep = []
+
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        xx1 = np.maximum(x1[i], x1[order[1:]])
+        yy1 = np.maximum(y1[i], y1[order[1:]])
+        xx2 = np.minimum(x2[i], x2[order[1:]])
+        yy2 = np.minimum(y2[i], y2[order[1:]])
+        inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+        iou = inter / (areas[i] + areas[order[1:]] - inter + 1e-9)
+        order = order[1:][iou <= iou_threshold]
+
+    return np.array(keep, dtype=np.int64)
+
+
+def postprocess(output, confidence_threshold, iou_threshold, ratio, pad, frame_shape):
+    """
+    Wandelt die rohe YOLOv8/11-Ausgabe (1, 4 + Klassen, Anker) in Boxen im Originalbild um.
+
+    Returns:
+        (boxes_xyxy float32 (N, 4), confidences (N,), class_ids int (N,))
+    """
+    predictions = np.squeeze(output, axis=0).T  # (Anker, 4 + Klassen)
+    class_scores = predictions[:, 4:]
+    class_ids = class_scores.argmax(axis=1)
+    confidences = class_scores[np.arange(len(class_ids)), class_ids]
+
+    mask = confidences > confidence_threshold
+    if not np.any(mask):
+        return np.zeros((0, 4), dtype=np.float32), np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.int64)
+
+    xywh = predictions[mask, :4]
+    confidences = confidences[mask]
+    class_ids = class_ids[mask]
+
+    boxes = np.empty_like(xywh)
+    boxes[:, 0] = xywh[:, 0] - xywh[:, 2] / 2
+    boxes[:, 1] = xywh[:, 1] - xywh[:, 3] / 2
+    boxes[:, 2] = xywh[:, 0] + xywh[:, 2] / 2
+    boxes[:, 3] = xywh[:, 1] + xywh[:, 3] / 2
+
+    # Klassenweise NMS: Boxen verschiedener Klassen werden auseinandergeschoben
+    keep = nms(boxes + (class_ids * _MAX_WH)[:, None], confidences, iou_threshold)[:MAX_DETECTIONS]
+    boxes, confidences, class_ids = boxes[keep], confidences[keep], class_ids[keep]
+
+    boxes[:, [0, 2]] -= pad[0]
+    boxes[:, [1, 3]] -= pad[1]
+    boxes /= ratio
+    height, width = frame_shape[:2]
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, width)
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, height)
+
+    return boxes.astype(np.float32), confidences.astype(np.float32), class_ids.astype(np.int64)
+
+
+def labels_path_for(onnx_path):
+    return os.path.splitext(onnx_path)[0] + ".labels.json"
+
+
+def source_path_for(onnx_path):
+    return os.path.splitext(onnx_path)[0] + ".source.json"
+
+
+def model_fingerprint(model_path):
+    """SHA-256 des Modells, damit abgeleitete Dateien (ONNX, INT8) einem Stand zugeordnet werden können."""
+    digest = hashlib.sha256()
+    with open(model_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_source_fingerprint(onnx_path):
+    """Fingerabdruck des Modells, aus dem onnx_path erzeugt wurde (None, wenn unbekannt)."""
+    path = source_path_for(onnx_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("fingerprint")
+
+
+def export_onnx(model_path, imgsz=DEFAULT_IMGSZ):
+    """
+    Exportiert ein ultralytics-Modell (.pt) nach ONNX und legt die Klassennamen
+    daneben als <modell>.labels.json ab.
+
+    Returns:
+        Pfad zur .onnx-Datei.
+    """
+    from ultralytics import YOLO
+
+    model = YOLO(model_path)
+    onnx_path = model.export(format="onnx", imgsz=imgsz, dynamic=False, simplify=True)
+    with open(labels_path_for(onnx_path), 'w', encoding='utf-8') as f:
+        json.dump({int(k): v for k, v in model.names.items()}, f)
+    print(f"✔ ONNX-Modell exportiert: {onnx_path}")
+    return onnx_path
+
+
+def _read_labels(onnx_path, metadata=None):
+    """Klassennamen aus der .labels.json, sonst aus den ONNX-Metadaten von ultralytics."""
+    path = labels_path_for(onnx_path)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return {int(k): v for k, v in json.load(f).items()}
+    if metadata and 'names' in metadata:
+        return ast.literal_eval(metadata['names'])
+    raise ValueError(f"Keine Klassennamen für {onnx_path} gefunden")
+
+
+def write_source_fingerprint(derived_path, model_path, fingerprint=None):
+    """Hält fest, aus welchem Modell derived_path erzeugt wurde (<derived>.source.json)."""
+    with open(source_path_for(derived_path), 'w', encoding='utf-8') as f:
+        json.dump({"source": os.path.basename(model_path),
+                   "fingerprint": fingerprint or model_fingerprint(model_path)}, f)
+
+
+def onnx_path_for(model_path, imgsz=DEFAULT_IMGSZ):
+    """
+    Zu einem .pt-Modell gehörendes ONNX-Modell; wird beim ersten Mal exportiert.
+    Die Eingabegrösse ist fest exportiert, andere Grössen als DEFAULT_IMGSZ bekommen
+    deshalb eine eigene Datei (<modell>.<imgsz>.onnx).
+
+    Neben dem Export liegt der Fingerabdruck des .pt (<modell>.source.json). Passt er nicht
+    mehr (Modell neu trainiert) oder fehlt er, wird neu exportiert. Ohne .pt wird ein
+    vorhandener Export unverändert verwendet.
+    """
+    if model_path.endswith(".onnx"):
+        return model_path
+    imgsz = imgsz or DEFAULT_IMGSZ
+    suffix = ".onnx" if imgsz == DEFAULT_IMGSZ else f".{imgsz}.onnx"
+    onnx_path = os.path.splitext(model_path)[0] + suffix
+    if os.path.exists(onnx_path) and not os.path.exists(model_path):
+        return onnx_path
+
+    fingerprint = model_fingerprint(model_path)
+    if os.path.exists(onnx_path):
+        if read_source_fingerprint(onnx_path) == fingerprint:
+            return onnx_path
+        print(f"⚠️ {os.path.basename(onnx_path)} passt nicht zu {os.path.basename(model_path)}, exportiere neu")
+
+    exported = export_onnx(model_path, imgsz)
+    if exported != onnx_path:
+        os.replace(exported, onnx_path)
+        os.replace(labels_path_for(exported), labels_path_for(onnx_path))
+    write_source_fingerprint(onnx_path, model_path, fingerprint)
+    return onnx_path
+
+
+class UltralyticsBackend:
+    name = "ultralytics"
+
+    def __init__(self, model_path, imgsz=None, iou=DEFAULT_IOU):
+        from ultralytics import YOLO
+
+        self.model = YOLO(model_path)
+        self.labels = self.model.names
+        self.imgsz = imgsz
+        self.iou = iou
+
+    def predict(self, frame, confidence_threshold):
+        kwargs = {'imgsz': self.imgsz} if self.imgsz else {}
+        results = self.model(frame, conf=confidence_threshold, iou=self.iou, verbose=False, **kwargs)
+        boxes = results[0].boxes
+        return (boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(),
+                boxes.cls.cpu().numpy().astype(np.int64))
+
+    def predict_batch(self, frames, confidence_threshold):
+        kwargs = {'imgsz': self.imgsz} if self.imgsz else {}
+        results = self.model(list(frames), conf=confidence_threshold, iou=self.iou, verbose=False, **kwargs)
+        return [(r.boxes.xyxy.cpu().numpy(), r.boxes.conf.cpu().numpy(), r.boxes.cls.cpu().numpy().astype(np.int64))
+                for r in results]
+
+
+class OnnxBackend:
+    name = "onnx"
+
+    def __init__(self, model_path, imgsz=None, iou=DEFAULT_IOU, num_threads=4):
+        import onnxruntime as ort
+
+        self.model_path = onnx_path_for(model_path, imgsz)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(self.model_path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        # Fest exportierte Eingabegrösse hat Vorrang
+        input_shape = self.session.get_inputs()[0].shape
+        self.imgsz = input_shape[2] if isinstance(input_shape[2], int) else imgsz or DEFAULT_IMGSZ
+        # Mit fester Batchgrösse 1 exportiert (Standard) -> Batches werden Frame für Frame gerechnet
+        self.dynamic_batch = not isinstance(input_shape[0], int)
+        self.iou = iou
+        self.labels = _read_labels(self.model_path, self.session.get_modelmeta().custom_metadata_map)
+
+    def predict(self, frame, confidence_threshold):
+        blob, ratio, pad = preprocess(frame, self.imgsz)
+        output = self.session.run(None, {self.input_name: blob})[0]
+        return postprocess(output, confidence_threshold, self.iou, ratio, pad, frame.shape)
+
+    def predict_batch(self, frames, confidence_threshold):
+        if not self.dynamic_batch:
+            return [self.predict(frame, confidence_threshold) for frame in frames]
+        prepared = [preprocess(frame, self.imgsz) for frame in frames]
+        outputs = self.session.run(None, {self.input_name: np.concatenate([p[0] for p in prepared])})[0]
+        return [postprocess(outputs[i:i + 1], confidence_threshold, self.iou, ratio, pad, frame.shape)
+                for i, (frame, (_, ratio, pad)) in enumerate(zip(frames, prepared))]
+
+
+class OpenVinoBackend:
+    name = "openvino"
+
+    def __init__(self, model_path, imgsz=None, iou=DEFAULT_IOU, num_threads=4):
+        import openvino as ov
+
+        self.model_path = onnx_path_for(model_path, imgsz)
+        core = ov.Core()
+        model = core.read_model(self.model_path)
+        self.compiled = core.compile_model(model, "CPU", {"INFERENCE_NUM_THREADS": num_threads})
+        self.output = self.compiled.output(0)
+        input_shape = model.input(0).get_partial_shape()
+        self.imgsz = input_shape[2].get_length() if input_shape[2].is_static else imgsz or DEFAULT_IMGSZ
+        self.dynamic_batch = not input_shape[0].is_static
+        self.iou = iou
+        self.labels = _read_labels(self.model_path)
+
+    def predict(self, frame, confidence_threshold):
+        blob, ratio, pad = preprocess(frame, self.imgsz)
+        output = self.compiled([blob])[self.output]
+        return postprocess(output, confidence_threshold, self.iou, ratio, pad, frame.shape)
+
+    def predict_batch(self, frames, confidence_threshold):
+        if not self.dynamic_batch:
+            return [self.predict(frame, confidence_threshold) for frame in frames]
+        prepared = [preprocess(frame, self.imgsz) for frame in frames]
+        outputs = self.compiled([np.concatenate([p[0] for p in prepared])])[self.output]
+        return [postprocess(outputs[i:i + 1], confidence_threshold, self.iou, ratio, pad, frame.shape)
+                for i, (frame, (_, ratio, pad)) in enumerate(zip(frames, prepared))]
+
+
+BACKENDS = {
+    UltralyticsBackend.name: UltralyticsBackend,
+    OnnxBackend.name: OnnxBackend,
+    OpenVinoBackend.name: OpenVinoBackend,
+}
+
+
+def create_backend(name, model_path, **kwargs):
+    """Erzeugt das Backend mit dem Namen name ("ultralytics", "onnx" oder "openvino")."""
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Unbekanntes Backend '{name}', möglich: {', '.join(BACKENDS)}")
+    return backend_class(model_path, **kwargs)
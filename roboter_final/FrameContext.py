@@ -0,0 +1,69 @@
+import os
+
+import cv2
+import numpy as np
+
+
+class FrameContext:
+    """
+    Ein Bild der Matrix-Pipeline, einmal dekodiert und von allen Schritten geteilt
+    (Zuweisung, Adjazenzmatrix, Walls, Zeichnen).
+
+    Graustufen und Masken werden erst beim ersten Zugriff berechnet
+    und danach wiederverwendet.
+    """
+
+    def __init__(self, image_path=None, image=None):
+        """
+        Args:
+            image_path: Pfad zum Bild; wird gelesen, wenn kein image übergeben wird.
+                Bleibt auch mit image gesetzt (Dateiname enthält z.B. den Roboterbuchstaben).
+            image: Bereits dekodiertes BGR- oder Graustufenbild.
+        """
+        if image is None:
+            if image_path is None:
+                raise ValueError("FrameContext braucht image_path oder image")
+            image = cv2.imread(image_path)
+            if image is None:
+                raise FileNotFoundError(f"Bild nicht gefunden: {image_path}")
+        self.image_path = image_path
+        self.image = image
+        self._gray = None
+        self._masks = {}
+
+    @classmethod
+    def of(cls, frame_or_path):
+        """Gibt einen FrameContext unverändert zurück, aus einem Pfad wird ein neuer erzeugt."""
+        return frame_or_path if isinstance(frame_or_path, cls) else cls(frame_or_path)
+
+    @property
+    def name(self):
+        """Dateiname des Bildes (leer ohne Pfad)."""
+        return os.path.basename(self.image_path) if self.image_path else ""
+
+    @property
+    def height(self):
+        return self.image.shape[0]
+
+    @property
+    def width(self):
+        return self.image.shape[1]
+
+    @property
+    def gray(self):
+        if self._gray is None:
+            self._gray = self.image if self.image.ndim == 2 else cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    @property
+    def rgb(self):
+        """RGB-Kopie, z.B. für PIL.Image.fromarray (nicht zwischengespeichert, wird meist nur einmal gebraucht)."""
+        if self.image.ndim == 2:
+            return cv2.cvtColor(self.image, cv2.COLOR_GRAY2RGB)
+        return cv2.cvtColor(self.image, cv2.COLOR_BGR2RGB)
+
+    def mask(self, threshold) -> np.ndarray:
+        """bool-Maske gray < threshold (nicht-weisse Pixel)."""
+        if threshold not in self._masks:
+            self._masks[threshold] = self.gray < threshold
+        return self._masks[threshold]
@@ -0,0 +1,61 @@
+"""
+Vektorisierte Geometrie für Verbindungs- und Wall-Prüfungen (ersetzt shapely).
+
+Rechtecke sind (x1, y1, x2, y2) wie die Bounding-Boxen der Erkennung und gelten als
+geschlossen: Berühren des Randes zählt als Schnitt (wie shapely.intersects).
+"""
+import numpy as np
+
+
+def segments_hit_rects(starts, ends, rects):
+    """
+    Liang–Barsky für viele Strecken gegen viele Rechtecke auf einmal.
+
+    Statt die Parameter t = q / p zu dividieren, werden die Ein- und Austritts-Brüche
+    über Kreuzprodukte verglichen; bei ganzzahligen (oder halbzahligen) Koordinaten ist
+    das Ergebnis damit auch bei genauem Berühren exakt.
+
+    Args:
+        starts, ends: (n, 2) Anfangs- und Endpunkte der Strecken.
+        rects: (m, 4) Rechtecke (x1, y1, x2, y2), Reihenfolge der Ecken egal.
+
+    Returns:
+        (n, m) bool-Array, True wo die Strecke das Rechteck schneidet oder darin liegt.
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 1, 2)
+    ends = np.asarray(ends, dtype=np.float64).reshape(-1, 1, 2)
+    rects = np.asarray(rects, dtype=np.float64).reshape(1, -1, 4)
+    if starts.shape[0] == 0 or rects.shape[1] == 0:
+        return np.zeros((starts.shape[0], rects.shape[1]), dtype=bool)
+
+    lowers, uppers = [(0.0, 1.0)], [(1.0, 1.0)]  # t in [0, 1] als Brüche (Zähler, Nenner > 0)
+    inside = True
+    for axis in (0, 1):
+        origin = starts[..., axis]
+        delta = ends[..., axis] - origin
+        lo = np.minimum(rects[..., axis], rects[..., axis + 2])
+        hi = np.maximum(rects[..., axis], rects[..., axis + 2])
+        flat = delta == 0
+        # Parallel zur Achse: nur gültig, wenn die Strecke im Streifen lo..hi liegt, t bleibt frei
+        inside = inside & (~flat | ((lo <= origin) & (origin <= hi)))
+        den = np.where(flat, 1.0, np.abs(delta))
+        enter = np.where(flat, 0.0, np.where(delta > 0, lo - origin, origin - hi))
+        leave = np.where(flat, 1.0, np.where(delta > 0, hi - origin, origin - lo))
+        lowers.append((enter, den))
+        uppers.append((leave, den))
+
+    hits = inside
+    for lower_num, lower_den in lowers:
+        for upper_num, upper_den in uppers:
+            hits = hits & (lower_num * upper_den <= upper_num * lower_den)
+    return np.broadcast_to(hits, (starts.shape[0], rects.shape[1]))
+
+
+def segment_hits_rects(p1, p2, rects):
+    """Eine Strecke p1-p2 gegen viele Rechtecke, (m,) bool-Array."""
+    return segments_hit_rects([p1], [p2], rects)[0]
+
+
+def segment_hits_any_rect(p1, p2, rects):
+    """True, wenn die Strecke p1-p2 mindestens eines der Rechtecke schneidet."""
+    return bool(segment_hits_rects(p1, p2, rects).any())
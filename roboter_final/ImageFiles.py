@@ -0,0 +1,17 @@
+import os
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+# Vom Programm selbst erzeugte Bilder (bearbeitete Fassungen, gezeichnete Ausgaben)
+GENERATED_PREFIXES = ('bearbeitet_', 'edited_', 'output_')
+
+
+def list_images(image_dirs, skip_prefixes=GENERATED_PREFIXES):
+    """Alle Originalbilder in den Ordnern, sortiert; fehlende Ordner werden übersprungen."""
+    paths = []
+    for image_dir in image_dirs:
+        if not os.path.isdir(image_dir):
+            continue
+        for name in sorted(os.listdir(image_dir)):
+            if name.lower().endswith(IMAGE_EXTENSIONS) and not name.startswith(skip_prefixes):
+                paths.append(os.path.join(image_dir, name))
+    return paths
@@ -0,0 +1,202 @@
+"""
+Adjazenzmatrix im Speicher plus Append-only-Journal (.mxj), Ersatz für Currentmatrix.txt.
+
+Die aktuelle Matrix (MatrixState) ist der massgebliche Stand. Jede Änderung wird als
+vollständiger Schnappschuss mit Zeitstempel an das Journal angehängt, im Hintergrund
+(BackgroundWriter), damit find_wall nicht auf die Festplatte wartet. Mit read_journal bzw.
+state_at lässt sich jeder frühere Stand wiederherstellen.
+
+Aufbau (little-endian):
+    Header    struct "<8sHB": MAGIC, Version, Anzahl Knoten n; danach n Byte Knotennamen (ASCII)
+    Einträge  je struct "<dH": Zeitstempel (time.time()), Länge der Beschriftung;
+              Beschriftung (UTF-8), n x n uint8 Matrix (0 = keine Verbindung, 1 = Linie, 2 = Wall)
+
+Ein abgebrochener letzter Eintrag (z.B. Absturz beim Schreiben) wird beim Lesen übersprungen.
+
+Journal ansehen (aus dem Repo-Hauptordner):
+    python -m roboter_final.MatrixJournal src/utils/aplha/Dataset/Matrix/Currentmatrix.mxj
+    python -m roboter_final.MatrixJournal <journal> --at "2025-05-20 14:03:00"
+"""
+import argparse
+import atexit
+import datetime
+import os
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+from roboter_final.BackgroundWriter import BackgroundWriter
+
+MAGIC = b"PRENMXJ\0"
+VERSION = 1
+EXTENSION = ".mxj"
+NODE_LETTERS = ('A', 'B', 'C', 'D', 'E', 'F', 'G', 'H')
+_HEADER = struct.Struct("<8sHB")
+_RECORD = struct.Struct("<dH")
+
+
+def format_matrix(matrix, letters=NODE_LETTERS):
+    """Text wie das bisherige Currentmatrix.txt (zum Ansehen, nicht zum Einlesen)."""
+    lines = ["adjacency_matrix = np.array([", "    # " + " ".join(letters)]
+    for letter, row in zip(letters, matrix):
+        lines.append(f"    {[int(x) for x in row]},  # {letter}")
+    lines.append("])")
+    return "\n".join(lines)
+
+
+class MatrixJournal:
+    """Hängt Schnappschüsse im Hintergrund an eine .mxj-Datei an."""
+
+    def __init__(self, path, letters=NODE_LETTERS, writer: BackgroundWriter = None):
+        """
+        Args:
+            writer: BackgroundWriter für die Schreibaufträge; ohne wird beim ersten
+                Schnappschuss ein eigener gestartet (und beim Beenden des Programms geleert).
+        """
+        self.path = path
+        self.letters = tuple(letters)
+        self._writer = writer
+        self._lock = threading.Lock()
+
+    def append(self, matrix, label="", timestamp=None):
+        """Reiht einen Schnappschuss ein (kehrt sofort zurück)."""
+        record = self._encode(matrix, label, time.time() if timestamp is None else timestamp)
+        return self._get_writer().submit(self._write, record)
+
+    def flush(self):
+        if self._writer is not None:
+            self._writer.flush()
+
+    def _get_writer(self):
+        with self._lock:
+            if self._writer is None:
+                self._writer = BackgroundWriter(max_queue=64, name="MatrixJournal")
+                atexit.register(self._writer.close)
+            return self._writer
+
+    def _encode(self, matrix, label, timestamp):
+        label = label.encode('utf-8')[:0xFFFF]
+        data = np.ascontiguousarray(matrix, dtype=np.uint8)
+        if data.shape != (len(self.letters), len(self.letters)):
+            raise ValueError(f"Matrix {data.shape} passt nicht zu {len(self.letters)} Knoten")
+        return _RECORD.pack(timestamp, len(label)) + label + data.tobytes()
+
+    def _write(self, record):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, 'ab') as f:
+            if f.tell() == 0:
+                f.write(_HEADER.pack(MAGIC, VERSION, len(self.letters)))
+                f.write("".join(self.letters).encode('ascii'))
+            f.write(record)
+
+
+class MatrixState:
+    """
+    Die aktuelle Adjazenzmatrix über alle Knoten (Standard A..H), der massgebliche Stand
+    während eines Laufs. Änderungen gehen zusätzlich ins Journal, falls eines gesetzt ist.
+    """
+
+    def __init__(self, letters=NODE_LETTERS, journal: MatrixJournal = None):
+        self.letters = tuple(letters)
+        self.matrix = np.zeros((len(self.letters), len(self.letters)), dtype=np.uint8)
+        self.journal = journal
+
+    def expand(self, matrix, matrix_buchstaben):
+        """Überträgt eine Matrix über matrix_buchstaben auf alle Knoten (unbekannte Buchstaben entfallen)."""
+        matrix = np.asarray(matrix)
+        full = np.zeros_like(self.matrix)
+        rows = [i for i, letter in enumerate(matrix_buchstaben) if letter in self.letters]
+        targets = [self.letters.index(matrix_buchstaben[i]) for i in rows]
+        full[np.ix_(targets, targets)] = matrix[np.ix_(rows, rows)]
+        return full
+
+    def set(self, matrix, matrix_buchstaben=None, label=""):
+        """Ersetzt den Stand; ohne matrix_buchstaben muss die Matrix schon alle Knoten umfassen."""
+        self.matrix = self.expand(matrix, matrix_buchstaben) if matrix_buchstaben is not None \
+            else np.array(matrix, dtype=np.uint8)
+        if self.journal is not None:
+            self.journal.append(self.matrix, label)
+        return self.matrix
+
+    def __str__(self):
+        return format_matrix(self.matrix, self.letters)
+
+
+def read_journal(path):
+    """
+    Liest alle Schnappschüsse.
+
+    Returns:
+        (letters, [(Zeitstempel, Beschriftung, Matrix)]) in Schreibreihenfolge.
+    """
+    with open(path, 'rb') as f:
+        buffer = f.read()
+    if len(buffer) < _HEADER.size:
+        raise ValueError(f"{path}: Datei zu kurz für einen Journal-Header")
+    magic, version, n = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: kein Matrix-Journal")
+    if version != VERSION:
+        raise ValueError(f"{path}: Version {version} wird nicht unterstützt (erwartet {VERSION})")
+
+    offset = _HEADER.size + n
+    letters = tuple(buffer[_HEADER.size:offset].decode('ascii'))
+    entries = []
+    while offset + _RECORD.size <= len(buffer):
+        timestamp, label_length = _RECORD.unpack_from(buffer, offset)
+        start = offset + _RECORD.size + label_length
+        end = start + n * n
+        if end > len(buffer):
+            print(f"⚠️ {path}: unvollständiger letzter Eintrag übersprungen")
+            break
+        label = buffer[offset + _RECORD.size:start].decode('utf-8', errors='replace')
+        entries.append((timestamp, label, np.frombuffer(buffer, np.uint8, n * n, start).reshape(n, n)))
+        offset = end
+    return letters, entries
+
+
+def state_at(path, timestamp=None, index=None):
+    """
+    Stand zu einem früheren Zeitpunkt (letzter Schnappschuss bis timestamp) oder der
+    index-te Schnappschuss; ohne beides der letzte.
+
+    Returns:
+        MatrixState ohne Journal oder None, wenn es davor keinen Schnappschuss gibt.
+    """
+    letters, entries = read_journal(path)
+    if index is not None:
+        entries = entries[index:index + 1] if index != -1 else entries[-1:]
+    elif timestamp is not None:
+        entries = [entry for entry in entries if entry[0] <= timestamp]
+    if not entries:
+        return None
+    state = MatrixState(letters)
+    state.matrix = entries[-1][2].copy()
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--at", help="Stand zu diesem Zeitpunkt (YYYY-MM-DD HH:MM:SS)")
+    parser.add_argument("--index", type=int, help="n-ter Schnappschuss (-1 = letzter)")
+    args = parser.parse_args(argv)
+
+    letters, entries = read_journal(args.path)
+    for i, (timestamp, label, _) in enumerate(entries):
+        print(f"{i:4d}  {datetime.datetime.fromtimestamp(timestamp):%Y-%m-%d %H:%M:%S}  {label}")
+    if args.at or args.index is not None:
+        timestamp = datetime.datetime.fromisoformat(args.at).timestamp() if args.at else None
+        state = state_at(args.path, timestamp, args.index)
+        if state is None:
+            print("❌ Kein Schnappschuss zu diesem Zeitpunkt")
+            return 1
+        print(state)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
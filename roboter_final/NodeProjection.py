@@ -0,0 +1,304 @@
+"""
+Knoten-Zuordnung über die bekannte Geometrie des Graphen (Alternative zu den Vorlagen in
+ViewpointAssignment).
+
+Der Standpunkt (Knoten) und die Ausrichtung des Roboters sind bekannt, die Lage aller Knoten
+steht in Graph/graph_data.json. Damit lässt sich vorab berechnen, wo jeder Knoten im Bild
+erscheinen muss (Lochkamera mit den Öffnungswinkeln und der Verzeichnung aus src/ocv.py).
+Die erkannten Punkte/Barrieren werden dann in einem Schritt (Ungarische Methode auf der
+Distanzmatrix) den erwarteten Knoten zugeordnet. Erwartete Knoten ohne passende Erkennung
+werden als fehlend gemeldet.
+
+Koordinaten: Graph-Einheiten wie in graph_data.json (y nach unten), Ausrichtung in Grad wie
+Box.get_length_and_angle bzw. current_orientation in main.traverse_graph.
+
+Experimentell, nicht validiert: Das Kameramodell ist auf der einzigen Aufnahme mit bekannter
+Ausrichtung (Test2_E) angepasst. Selbst dort liegt der schlechteste Knoten bei 11 % der
+Bilddiagonale (Schwelle DEFAULT_MAX_DISTANCE = 12 %); auf den anderen Datensatz-Ansichten
+(verzerrte Aufnahmen ohne bekannte Ausrichtung) liegen 11 von 12 Knoten der Vorlagen-Zuordnung
+über der Schwelle, bis 35 % (benchmarks/projection.py). Die Ungarische Methode ist O(n²·m) pro
+Ausrichtung und die Zuordnung mit ~160µs rund 14x langsamer als die Vorlagen (~11µs). main.py
+nutzt sie nicht.
+"""
+import math
+
+import cv2
+import numpy as np
+
+from roboter_final.Detections import NODE_CLASSES
+from roboter_final.Graph import Graph_loader
+from roboter_final.Graph.Graph import canvas_webots_relation
+
+# Grösster Abstand (Anteil der Bilddiagonale) zwischen Erkennung und erwartetem Knoten
+DEFAULT_MAX_DISTANCE = 0.12
+
+
+class CameraModel:
+    def __init__(self, horizontal_fov=102.0, vertical_fov=67.0, dist_coeffs=(-0.2, 0.1, 0.0, 0.0),
+                 height=0.25, pitch=28.5, offset=0.21):
+        """
+        Args:
+            horizontal_fov, vertical_fov: Öffnungswinkel in Grad (src/ocv.py).
+            dist_coeffs: Verzeichnung (k1, k2, p1, p2) wie in src/ocv.py.
+            height: Höhe der Kamera über dem Boden in m.
+            pitch: Neigung nach unten in Grad.
+            offset: Abstand der Kamera hinter dem Knoten in m (der Standpunkt ist unten im Bild sichtbar).
+        Höhe, Neigung und Abstand sind auf Test2_E angepasst (siehe benchmarks/projection.py --calibrate).
+        """
+        self.horizontal_fov = horizontal_fov
+        self.vertical_fov = vertical_fov
+        self.dist_coeffs = np.asarray(dist_coeffs, dtype=np.float64)
+        self.height = height
+        self.pitch = pitch
+        self.offset = offset
+
+    def camera_matrix(self, image_size):
+        w, h = image_size
+        focal_length_x = w / (2 * np.tan(np.radians(self.horizontal_fov) / 2))
+        focal_length_y = h / (2 * np.tan(np.radians(self.vertical_fov) / 2))
+        return np.array([[focal_length_x, 0, w / 2], [0, focal_length_y, h / 2], [0, 0, 1]], dtype=np.float64)
+
+    def project(self, points, position, heading, image_size):
+        """
+        Projiziert Bodenpunkte ins Bild.
+
+        Args:
+            points: (n, 2) Punkte auf dem Boden in m.
+            position: Knoten, auf dem der Roboter steht, in m.
+            heading: Ausrichtung in Grad.
+
+        Returns:
+            (uv, in_front): (n, 2) Bildkoordinaten und (n,) bool, ob der Punkt vor der Kamera liegt.
+        """
+        theta, pitch = math.radians(heading), math.radians(self.pitch)
+        forward = np.array([math.cos(theta), math.sin(theta)])
+        right = np.array([-math.sin(theta), math.cos(theta)])  # y zeigt nach unten
+        relative = np.asarray(points, dtype=np.float64) - (np.asarray(position) - self.offset * forward)
+        ahead, across = relative @ forward, relative @ right
+
+        # Kamerakoordinaten: x rechts, y unten, z entlang der optischen Achse
+        camera_points = np.empty((len(relative), 3))
+        camera_points[:, 0] = across
+        camera_points[:, 1] = self.height * math.cos(pitch) - ahead * math.sin(pitch)
+        camera_points[:, 2] = ahead * math.cos(pitch) + self.height * math.sin(pitch)
+        in_front = camera_points[:, 2] > 1e-6
+        camera_points[~in_front, 2] = 1.0  # nur damit projectPoints rechnen kann, wird verworfen
+        uv, _ = cv2.projectPoints(camera_points, np.zeros(3), np.zeros(3), self.camera_matrix(image_size),
+                                  self.dist_coeffs)
+        return uv.reshape(-1, 2), in_front
+
+
+def linear_assignment(cost):
+    """
+    Ungarische Methode (Kuhn-Munkres) für eine rechteckige Kostenmatrix, pro Zeile vektorisiert.
+    Aufwand O(n²·m) für n <= m (O(n³) bei quadratischer Matrix); bei den höchstens acht Knoten
+    überwiegt der feste Aufwand der NumPy-Aufrufe.
+
+    Returns:
+        (rows, cols): Zuordnung mit minimaler Summe, min(n, m) Paare, nach rows sortiert.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+    # Potentiale u/v, p[j] = Zeile (1-basiert) auf Spalte j, Spalte 0 ist der Startknoten
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.intp)
+    way = np.zeros(m + 1, dtype=np.intp)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            free = ~used
+            reduced = cost[p[j0] - 1] - u[p[j0]] - v[1:]
+            better = free[1:] & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+            candidates = np.where(free[1:], minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(p[1:])
+    rows = p[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+class ProjectionMatch:
+    """Ergebnis von NodeProjector.match."""
+
+    def __init__(self, assigned, missing, extra, heading, cost):
+        self.assigned = assigned  # [(Index der Erkennung, Knoten)]
+        self.missing = missing  # erwartete Knoten ohne Erkennung
+        self.extra = extra  # Indizes der Erkennungen ohne Knoten
+        self.heading = heading  # Ausrichtung, die am besten passt
+        self.cost = cost
+
+    def __repr__(self):
+        assigned = ", ".join(f"{index}={letter}" for index, letter in self.assigned)
+        return (f"ProjectionMatch([{assigned}], fehlend={self.missing}, ohne Knoten={self.extra}, "
+                f"heading={self.heading:.1f})")
+
+
+class NodeProjector:
+    """
+    Erwartete Bildpositionen aller Knoten pro Standpunkt und Ausrichtung (zwischengespeichert)
+    und die Zuordnung der Erkennungen dazu.
+    """
+
+    def __init__(self, nodes=None, edges=None, camera=None, units_to_m=canvas_webots_relation, margin=0.02):
+        """
+        Args:
+            nodes, edges: Wie Graph_loader.load_nodes_and_edges (Standard: graph_data.json).
+                nodes darf auch {Name: (x, y)} sein.
+            units_to_m: Meter pro Graph-Einheit.
+            margin: Knoten, die höchstens so weit (Anteil der Bildgrösse) ausserhalb liegen,
+                gelten noch als sichtbar.
+        """
+        if nodes is None:
+            nodes, edges = Graph_loader.load_nodes_and_edges()
+        self.camera = camera or CameraModel()
+        self.letters = list(nodes)
+        self.positions = np.array([node.get_x_y() if hasattr(node, 'get_x_y') else node
+                                   for node in nodes.values()], dtype=np.float64) * units_to_m
+        self.margin = margin
+        self._headings = {letter: [] for letter in self.letters}
+        for edge in (edges or {}).values():
+            angle = edge.get_length_and_angle()[1]
+            if angle not in self._headings[edge.node1.name]:
+                self._headings[edge.node1.name].append(angle)
+        self._cache = {}
+
+    def headings(self, node):
+        """Ausrichtungen, die der Roboter auf node haben kann (eine pro abgehender Kante)."""
+        return sorted(self._headings[node])
+
+    def expected(self, node, heading, image_size):
+        """
+        Returns:
+            (letters, uv): Sichtbare Knoten und ihre erwarteten Bildpositionen (k, 2).
+        """
+        key = (node, round(heading, 1), tuple(image_size))
+        if key not in self._cache:
+            uv, in_front = self.camera.project(self.positions, self.positions[self.letters.index(node)],
+                                               heading, image_size)
+            w, h = image_size
+            visible = (in_front
+                       & (uv[:, 0] >= -self.margin * w) & (uv[:, 0] <= (1 + self.margin) * w)
+                       & (uv[:, 1] >= -self.margin * h) & (uv[:, 1] <= (1 + self.margin) * h))
+            self._cache[key] = ([self.letters[i] for i in np.flatnonzero(visible)], uv[visible])
+        return self._cache[key]
+
+    def precompute(self, image_size, heading_offsets=(0.0,)):
+        """Füllt den Zwischenspeicher für alle Standpunkte und Kanten-Ausrichtungen."""
+        for node in self.letters:
+            for heading in self.headings(node):
+                for offset in heading_offsets:
+                    self.expected(node, heading + offset, image_size)
+        return len(self._cache)
+
+    def match(self, centers, node, heading, image_size, heading_tolerance=0.0, heading_step=2.5,
+              max_distance=DEFAULT_MAX_DISTANCE):
+        """
+        Ordnet Erkennungen (nur Punkte/Barrieren, siehe Aufrufer) den erwarteten Knoten zu.
+
+        Mit heading_tolerance > 0 werden zusätzlich alle Ausrichtungen im Raster heading_step
+        innerhalb ±heading_tolerance probiert, es gewinnt die kleinste Summe. align_with_next_edge
+        richtet auf 5° genau aus, das fängt die Zuordnung meist schon ohne Suche auf.
+
+        Args:
+            centers: (n, 2) Zentren der Erkennungen in Pixeln.
+            max_distance: Grösster Abstand (Anteil der Bilddiagonale) für eine Zuordnung.
+        """
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        gate = max_distance * math.hypot(*image_size)
+        steps = int(round(heading_tolerance / heading_step)) if heading_step > 0 else 0
+        best = None
+        for offset in sorted(np.arange(-steps, steps + 1) * heading_step, key=abs):
+            letters, uv = self.expected(node, heading + offset, image_size)
+            distances = np.hypot(centers[:, None, 0] - uv[None, :, 0], centers[:, None, 1] - uv[None, :, 1])
+            rows, cols = linear_assignment(np.minimum(distances, gate))
+            keep = distances[rows, cols] < gate
+            # Jede Erkennung ohne Knoten kostet so viel wie der grösste erlaubte Abstand
+            cost = distances[rows, cols][keep].sum() + gate * (len(centers) - keep.sum())
+            if best is None or cost < best[0]:
+                best = (cost, heading + offset, letters, rows[keep], cols[keep])
+
+        cost, best_heading, letters, rows, cols = best
+        matched = set(cols.tolist())
+        return ProjectionMatch(assigned=[(int(r), letters[c]) for r, c in zip(rows, cols)],
+                               missing=[letter for j, letter in enumerate(letters) if j not in matched],
+                               extra=[i for i in range(len(centers)) if i not in set(rows.tolist())],
+                               heading=best_heading, cost=cost)
+
+
+_projector = None
+
+
+def get_projector():
+    """Geteilter NodeProjector für graph_data.json (wird beim ersten Aufruf erstellt)."""
+    global _projector
+    if _projector is None:
+        _projector = NodeProjector()
+    return _projector
+
+
+def assign_objects_by_projection(node, heading, objekte_liste, image_width, image_height, projector=None, **kwargs):
+    """
+    Vergibt die Knotennamen an Objekt-Instanzen (Punkte und Barrieren). Nicht zugeordnete
+    Punkte verlieren ihren Buchstaben (pointa/b/c bekommen sonst A/B/C, egal auf welchem Knoten
+    sie stehen).
+
+    Returns:
+        ProjectionMatch mit Indizes in objekte_liste.
+    """
+    projector = projector or get_projector()
+    indices = [i for i, obj in enumerate(objekte_liste) if obj.klasse in NODE_CLASSES]
+    if image_width <= 0 or image_height <= 0:
+        print(f"Warnung: Keine Bilddimensionen für Standpunkt {node}, keine Zuordnung.")
+        return ProjectionMatch([], [], indices, heading, 0.0)
+    result = projector.match([objekte_liste[i].zentrum[:2] for i in indices], node, heading,
+                             (image_width, image_height), **kwargs)
+    result.assigned = [(indices[i], letter) for i, letter in result.assigned]
+    result.extra = [indices[i] for i in result.extra]
+    for index in result.extra:
+        objekte_liste[index].set_buchstabe(None)
+    for index, letter in result.assigned:
+        objekte_liste[index].set_buchstabe(letter)
+    if result.missing:
+        print(f"⚠️ Erwartete Knoten nicht erkannt (Standpunkt {node}): {', '.join(result.missing)}")
+    return result
+
+
+def assign_detections_by_projection(node, heading, detections, image_size, projector=None, **kwargs):
+    """Wie assign_objects_by_projection, direkt in einer Detections-Tabelle."""
+    projector = projector or get_projector()
+    indices = np.flatnonzero(detections.class_mask(*NODE_CLASSES))
+    result = projector.match(detections.centers[indices], node, heading, image_size, **kwargs)
+    result.assigned = [(int(indices[i]), letter) for i, letter in result.assigned]
+    result.extra = [int(indices[i]) for i in result.extra]
+    for index in result.extra:
+        detections.set_letter(index, '')
+    for index, letter in result.assigned:
+        detections.set_letter(index, letter)
+    return result
@@ -0,0 +1,69 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from roboter_final import lineDetection
+
+
+class PerceptionResult:
+    """Alles, was die Mission pro Knoten aus einer Aufnahme braucht."""
+
+    def __init__(self, image_path, frame, objects, line_image, timings):
+        self.image_path = image_path
+        self.frame = frame
+        self.objects = objects
+        self.line_image = line_image  # Graustufenbild ohne Bodenfarben, direkt für CheckConnection
+        self.timings = timings  # Laufzeiten in ms: 'decode', 'detect', 'preprocess', 'total'
+
+    def __repr__(self):
+        timings = ", ".join(f"{k}={v:.0f}ms" for k, v in self.timings.items())
+        return f"PerceptionResult({len(self.objects)} Objekte, {timings})"
+
+
+class PerceptionStage:
+    """
+    Dekodiert eine Aufnahme einmal und führt Objekterkennung und Farbentfernung
+    (lineDetection) gleichzeitig in einem Thread-Pool aus. OpenCV und torch/onnxruntime
+    geben das GIL während der Berechnung frei, die Zeit pro Knoten ist damit etwa
+    max(Erkennung, Vorverarbeitung) statt der Summe.
+    """
+
+    def __init__(self, detect, bgr_colors=lineDetection.DEFAULT_BGR_COLORS, tol=lineDetection.DEFAULT_TOL,
+                 debug_sink=None):
+        """
+        Args:
+            detect: Funktion frame -> Objekt-Liste (z.B. main.detect_objects).
+            debug_sink: Optionaler BackgroundWriter für die bearbeitet_*.png Debug-Bilder.
+                        None = nichts auf die Festplatte schreiben.
+        """
+        self.detect = detect
+        self.bgr_colors = bgr_colors
+        self.tol = tol
+        self.debug_sink = debug_sink
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="perception")
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        return result, (time.perf_counter() - start) * 1000
+
+    def run(self, image_path):
+        start = time.perf_counter()
+        frame = cv2.imread(image_path)
+        if frame is None:
+            raise FileNotFoundError(f"Bild konnte nicht geladen werden: {image_path}")
+        decode_ms = (time.perf_counter() - start) * 1000
+
+        detect_future = self._pool.submit(self._timed, self.detect, frame)
+        preprocess_future = self._pool.submit(self._timed, lineDetection.process_frame, frame, image_path,
+                                              self.bgr_colors, self.tol, True, self.debug_sink)
+        objects, detect_ms = detect_future.result()
+        line_image, preprocess_ms = preprocess_future.result()
+
+        timings = {'decode': decode_ms, 'detect': detect_ms, 'preprocess': preprocess_ms,
+                   'total': (time.perf_counter() - start) * 1000}
+        return PerceptionResult(image_path, frame, objects, line_image, timings)
+
+    def close(self):
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,144 @@
+"""
+INT8-Quantisierung (Post-Training, statisch) des ONNX-Modells für den YoloDetector.
+
+Kalibriert wird auf den Bildern unter roboter_final/dataset und scripts/work/pictures.
+Das quantisierte Modell wird nur verwendet, wenn daneben ein Bericht
+(<modell>.int8.report.json, erzeugt von roboter_final.benchmarks.quantization) liegt,
+der zu genau diesem INT8- und FP32-Modell gehört, und keine Klasse mehr Recall verliert
+als erlaubt. Quantisiert wird nur von roboter_final.benchmarks.quantization (zusammen mit
+dem Bericht), nie beim Start des Detectors; nach einem Neutraining läuft der Detector mit
+FP32, bis beides neu erstellt ist.
+"""
+import json
+import os
+import shutil
+
+import cv2
+
+from roboter_final.DetectorBackends import (DEFAULT_IMGSZ, labels_path_for, model_fingerprint, onnx_path_for,
+                                            preprocess, read_source_fingerprint, write_source_fingerprint)
+from roboter_final.ImageFiles import list_images
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CALIBRATION_DIRS = [
+    os.path.join(BASE_DIR, "dataset"),
+    os.path.join(os.path.dirname(BASE_DIR), "scripts", "work", "pictures"),
+]
+# Maximal erlaubter Recall-Verlust pro Klasse gegenüber FP32 (0.05 = 5 Prozentpunkte)
+DEFAULT_MAX_RECALL_DROP = 0.05
+
+
+def int8_path_for(onnx_path):
+    return os.path.splitext(onnx_path)[0] + ".int8.onnx"
+
+
+def report_path_for(int8_path):
+    return os.path.splitext(int8_path)[0] + ".report.json"
+
+
+def list_calibration_images(image_dirs=None):
+    return list_images(image_dirs or CALIBRATION_DIRS)
+
+
+def is_stale(int8_path, onnx_path):
+    """True, wenn das INT8-Modell fehlt oder nicht aus dem aktuellen FP32-Modell quantisiert wurde."""
+    return not os.path.exists(int8_path) or read_source_fingerprint(int8_path) != model_fingerprint(onnx_path)
+
+
+def quantize_int8(onnx_path, calibration_images, imgsz=DEFAULT_IMGSZ, output_path=None):
+    """
+    Quantisiert Gewichte und Aktivierungen nach INT8 (QDQ-Format, Gewichte pro Kanal).
+
+    Args:
+        onnx_path: FP32-ONNX-Modell (siehe DetectorBackends.export_onnx).
+        calibration_images: Bildpfade, auf denen die Aktivierungsbereiche bestimmt werden.
+
+    Returns:
+        Pfad zum INT8-Modell.
+    """
+    from onnxruntime.quantization import (CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType,
+                                          quantize_static)
+
+    if not calibration_images:
+        raise ValueError("Keine Kalibrierungsbilder gefunden")
+
+    class _ImageReader(CalibrationDataReader):
+        def __init__(self, input_name):
+            self.input_name = input_name
+            self.paths = iter(calibration_images)
+
+        def get_next(self):
+            for path in self.paths:
+                frame = cv2.imread(path)
+                if frame is not None:
+                    return {self.input_name: preprocess(frame, imgsz)[0]}
+            return None
+
+    import onnxruntime as ort
+    input_name = ort.InferenceSession(onnx_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    output_path = output_path or int8_path_for(onnx_path)
+    quantize_static(onnx_path, output_path, _ImageReader(input_name),
+                    quant_format=QuantFormat.QDQ,
+                    activation_type=QuantType.QUInt8,
+                    weight_type=QuantType.QInt8,
+                    per_channel=True,
+                    calibrate_method=CalibrationMethod.MinMax)
+    if os.path.exists(labels_path_for(onnx_path)):
+        shutil.copyfile(labels_path_for(onnx_path), labels_path_for(output_path))
+    write_source_fingerprint(output_path, onnx_path)
+    print(f"✔ INT8-Modell mit {len(calibration_images)} Kalibrierungsbildern erstellt: {output_path}")
+    return output_path
+
+
+def write_report(int8_path, onnx_path, report):
+    """Speichert den Bericht zusammen mit den Fingerabdrücken beider Modelle."""
+    report = dict(report, fp32_fingerprint=model_fingerprint(onnx_path), int8_fingerprint=model_fingerprint(int8_path))
+    with open(report_path_for(int8_path), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def check_recall_guard(int8_path, onnx_path, max_recall_drop=DEFAULT_MAX_RECALL_DROP):
+    """
+    Prüft den Genauigkeitsbericht des INT8-Modells.
+
+    Returns:
+        (ok, gruende) - ok ist False, wenn der Bericht fehlt, zu einem anderen INT8- oder
+        FP32-Modell gehört oder eine Klasse mehr als max_recall_drop Recall gegenüber FP32 verliert.
+    """
+    path = report_path_for(int8_path)
+    if not os.path.exists(path):
+        return False, [f"kein Genauigkeitsbericht ({os.path.basename(path)})"]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+
+    if report.get("fp32_fingerprint") != model_fingerprint(onnx_path):
+        return False, [f"Bericht gehört nicht zu {os.path.basename(onnx_path)}"]
+    if report.get("int8_fingerprint") != model_fingerprint(int8_path):
+        return False, [f"Bericht gehört nicht zu {os.path.basename(int8_path)}"]
+
+    reasons = []
+    for klasse, values in report.get("classes", {}).items():
+        if values["recall_delta"] < -max_recall_drop:
+            reasons.append(f"{klasse}: Recall {values['recall_delta']:+.3f} (erlaubt -{max_recall_drop:.3f})")
+    return not reasons, reasons
+
+
+def resolve_int8_model(model_path, max_recall_drop=DEFAULT_MAX_RECALL_DROP, imgsz=DEFAULT_IMGSZ):
+    """
+    Liefert das INT8-Modell zu model_path oder das FP32-ONNX-Modell, wenn es fehlt, nicht
+    zum FP32-Modell passt oder der Recall-Guard es ablehnt.
+    """
+    onnx_path = onnx_path_for(model_path, imgsz)
+    int8_path = int8_path_for(onnx_path)
+    if is_stale(int8_path, onnx_path):
+        ok, reasons = False, [f"kein aktuelles INT8-Modell ({os.path.basename(int8_path)})"]
+    else:
+        ok, reasons = check_recall_guard(int8_path, onnx_path, max_recall_drop)
+    if not ok:
+        print(f"⚠️ INT8-Modell abgelehnt, verwende FP32: {'; '.join(reasons)}")
+        print(f"   Quantisieren und Bericht erstellen: "
+              f"python -m roboter_final.benchmarks.quantization --model {model_path}")
+        return onnx_path
+    return int8_path
@@ -0,0 +1,226 @@
+"""
+Buchstaben-Zuordnung der sichtbaren Knoten je Standpunkt des Roboters (ersetzt assignment_A..H).
+
+Jeder Standpunkt hat eine Vorlage: welche Erkennungen Kandidaten sind und in welcher Reihenfolge
+welche Buchstaben nach welcher Regel vergeben werden (z.B. "B = linkster Knoten, H = nächster
+zu B"). Eine Engine arbeitet alle Vorlagen ab (Klassen, Zentren), ein Objekt oder
+eine Zeile bekommt in einem Durchlauf höchstens einen Buchstaben. Gleichstände werden wie in
+den bisherigen assignment_X-Methoden aufgelöst (stabile Sortierung, erster Treffer).
+
+Schritte einer Vorlage:
+    extreme(b, achse, groesster)  b = Kandidat mit kleinstem/grösstem x bzw. y
+    nearest(b, anker, klassen)    b = nächster noch freier Kandidat zum Anker
+    pair(b1b2, anker)             zwei nächste freie Kandidaten zum Anker, nach x + y geordnet
+    row(buchstaben, anzahl)       die untersten freien Kandidaten, von links nach rechts
+    by_class(zuordnung, alle)     feste Buchstaben nach Klasse (pointa/b/c)
+
+Anker: Buchstabe eines schon vergebenen Knotens, BOTTOM_CENTER + dy (angenommene Position des
+Roboters unter der Bildmitte) oder VISIBLE_BOTTOM (unten in der Mitte der sichtbaren Knoten).
+Ohne Bilddimensionen (0x0) wird ein Schritt mit BOTTOM_CENTER übersprungen, ausser er hat
+allow_empty_size: dann gilt wie in assignment_F der Anker (0, dy).
+"""
+import math
+
+import numpy as np
+
+from roboter_final.Detections import NODE_CLASSES
+
+BOTTOM_CENTER = 'bottom_center'
+VISIBLE_BOTTOM = 'visible_bottom'
+
+
+def extreme(letter, axis, largest=False):
+    return ('extreme', letter, 'xy'.index(axis), largest)
+
+
+def nearest(letter, anchor, classes=None, dy=0, allow_empty_size=False):
+    return ('nearest', letter, (anchor, dy, allow_empty_size), classes)
+
+
+def pair(letters, anchor, dy=0, allow_empty_size=False):
+    return ('pair', letters, (anchor, dy, allow_empty_size))
+
+
+def row(letters_by_count, count=3, short_in_input_order=False):
+    """
+    Args:
+        letters_by_count: Buchstaben von links nach rechts je nach Anzahl gefundener Kandidaten.
+        short_in_input_order: Gibt es weniger als count Kandidaten, werden sie in der
+            Eingabereihenfolge (statt von unten nach oben) nach x sortiert (assignment_B).
+    """
+    return ('row', letters_by_count, count, short_in_input_order)
+
+
+def by_class(mapping, first_only=False):
+    return ('class', mapping, first_only)
+
+
+class Template:
+    def __init__(self, steps, unlettered_only=False, order_by_x=False):
+        """
+        Args:
+            steps: Schritte in der Reihenfolge der Vergabe.
+            unlettered_only: Nur Kandidaten ohne Buchstaben (z.B. pointa/b/c haben schon einen).
+            order_by_x: Kandidaten vorab von links nach rechts ordnen (entscheidet Gleichstände).
+        """
+        self.steps = steps
+        self.unlettered_only = unlettered_only
+        self.order_by_x = order_by_x
+
+
+# Erwartete Lage der sichtbaren Knoten je Standpunkt
+VIEWPOINT_TEMPLATES = {
+    'A': Template([extreme('B', 'x'), nearest('H', 'B')], unlettered_only=True, order_by_x=True),
+    'B': Template([row({1: 'C', 2: 'CH', 3: 'CHA'}, short_in_input_order=True)]),
+    'C': Template([extreme('B', 'x', largest=True), nearest('H', 'B')]),
+    'D': Template([extreme('C', 'x', largest=True), nearest('G', 'C')]),
+    'E': Template([extreme('E', 'y', largest=True), row({1: 'F', 2: 'FD', 3: 'FGD'})]),
+    'F': Template([extreme('A', 'x'), pair('HG', BOTTOM_CENTER, dy=50, allow_empty_size=True)]),
+    'G': Template([by_class({'pointa': 'A', 'pointb': 'B', 'pointc': 'C'}),
+                   nearest('H', BOTTOM_CENTER, classes=('point', 'barrier'))]),
+    'H': Template([by_class({'pointb': 'B'}, first_only=True), nearest('B', VISIBLE_BOTTOM)]),
+}
+
+
+def _distance_to(xs, ys, point):
+    px, py = point
+
+    def distance(pos):
+        # Gleicher Ausdruck wie in den assignment_X-Methoden, damit Gleichstände gleich ausfallen
+        return math.sqrt((xs[pos] - px) ** 2 + (ys[pos] - py) ** 2)
+    return distance
+
+
+def assign_letters(viewpoint, classes, centers, has_letter=None, image_size=None):
+    """
+    Vergibt die Buchstaben für den Standpunkt viewpoint.
+
+    Args:
+        classes: Klassenname pro Erkennung.
+        centers: (n, 2) Zentren (wie Objekt.zentrum).
+        has_letter: (n,) bool, ob eine Erkennung schon einen Buchstaben hat.
+        image_size: (Breite, Höhe) für Anker unter dem Bild; None gilt wie (0, 0).
+
+    Returns:
+        Liste von (Index, Buchstabe) in der Reihenfolge der Vergabe.
+    """
+    template = VIEWPOINT_TEMPLATES[viewpoint]
+    # Pro Standpunkt sind es nur eine Handvoll Erkennungen: mit Python-Listen statt NumPy-Arrays
+    # entfällt der feste Aufwand pro Array-Operation, der hier die eigentliche Rechnung überwiegt
+    if isinstance(centers, np.ndarray):
+        centers = centers.tolist()
+
+    # Ein Durchlauf: Kandidaten auswählen und (falls nötig) einmal nach x ordnen
+    skip = has_letter if template.unlettered_only and has_letter is not None else None
+    candidates = []
+    for i, klasse in enumerate(classes):
+        if klasse in NODE_CLASSES and not (skip is not None and skip[i]):
+            candidates.append((float(centers[i][0]), float(centers[i][1]), i, klasse))
+    if template.order_by_x:
+        candidates.sort(key=lambda candidate: candidate[0])
+    xs, ys, candidates, candidate_classes = zip(*candidates) if candidates else ((), (), (), ())
+    free = list(range(len(candidates)))  # freie Positionen in candidates, aufsteigend
+    position = {}  # Buchstabe -> Position in candidates
+    assigned = []
+
+    def give(pos, letter):
+        free.remove(pos)
+        position.setdefault(letter, pos)
+        assigned.append((candidates[pos], letter))
+
+    def anchor_point(anchor, dy, allow_empty_size):
+        if anchor == BOTTOM_CENTER:
+            width, height = image_size or (0, 0)
+            if (width <= 0 or height <= 0) and not allow_empty_size:
+                print(f"Warnung: Keine Bilddimensionen für Standpunkt {viewpoint}, Schritt übersprungen.")
+                return None
+            return (width / 2, height + dy)
+        if anchor == VISIBLE_BOTTOM:
+            return ((min(xs) + max(xs)) / 2, max(ys))
+        pos = position.get(anchor)
+        return None if pos is None else (xs[pos], ys[pos])
+
+    for step in template.steps:
+        kind = step[0]
+        if kind == 'class':
+            _, mapping, first_only = step
+            # In Listenreihenfolge, wie die ursprüngliche Schleife über die Objekte
+            for pos in [pos for pos in free if candidate_classes[pos] in mapping]:
+                letter = mapping[candidate_classes[pos]]
+                if not (first_only and letter in position):
+                    give(pos, letter)
+            continue
+
+        remaining = free[:]
+        if kind == 'extreme':
+            _, letter, axis, largest = step
+            if letter in position or not remaining:
+                continue
+            # min/max liefern bei Gleichstand den ersten Treffer, wie np.argmin/argmax
+            values = (ys if axis else xs).__getitem__
+            give(max(remaining, key=values) if largest else min(remaining, key=values), letter)
+        elif kind == 'nearest':
+            _, letter, anchor, only_classes = step
+            if only_classes is not None:
+                remaining = [pos for pos in free if candidate_classes[pos] in only_classes]
+            if letter in position or not remaining:
+                continue
+            point = anchor_point(*anchor)
+            if point is not None:
+                give(min(remaining, key=_distance_to(xs, ys, point)), letter)
+        elif kind == 'pair':
+            _, letters, anchor = step
+            point = anchor_point(*anchor) if len(remaining) >= 2 else None
+            if point is None:
+                continue
+            nearest_two = sorted(remaining, key=_distance_to(xs, ys, point))[:2]
+            nearest_two.sort(key=lambda pos: xs[pos] + ys[pos])
+            for pos, letter in zip(nearest_two, letters):
+                give(pos, letter)
+        elif kind == 'row':
+            _, letters_by_count, count, short_in_input_order = step
+            if not (short_in_input_order and len(remaining) < count):
+                remaining = sorted(remaining, key=lambda pos: -ys[pos])[:count]
+            remaining.sort(key=xs.__getitem__)
+            for pos, letter in zip(remaining, letters_by_count.get(len(remaining), '')):
+                give(pos, letter)
+    return assigned
+
+
+def assign_objects(viewpoint, objekte_liste, image_width=0, image_height=0):
+    """
+    Vergibt die Buchstaben an Objekt-Instanzen (über set_buchstabe, damit z.B. das
+    Barrier-Logging erhalten bleibt).
+
+    Returns:
+        Die zugeordneten Objekte in der Reihenfolge der Vergabe (wie assignment_X).
+    """
+    if not objekte_liste:
+        return []
+    classes, centers, has_letter = [], [], []
+    for obj in objekte_liste:
+        classes.append(obj.klasse)
+        centers.append(obj.zentrum)
+        has_letter.append(getattr(obj, 'buchstabe', None) is not None)
+    erkannte_punkte = []
+    for index, letter in assign_letters(viewpoint, classes, centers, has_letter, (image_width, image_height)):
+        objekte_liste[index].set_buchstabe(letter)
+        erkannte_punkte.append(objekte_liste[index])
+    return erkannte_punkte
+
+
+def assign_detections(viewpoint, detections, image_size=None):
+    """
+    Vergibt die Buchstaben direkt in einer Detections-Tabelle.
+
+    Returns:
+        Liste von (Zeile, Buchstabe) in der Reihenfolge der Vergabe.
+    """
+    # Als Python-Listen: detections.classes baut bei jedem Zugriff ein NumPy-Array aus Strings
+    names = detections.class_names + ('',)
+    classes = [names[class_id] for class_id in detections.data['class_id'].tolist()]
+    has_letter = [letter != '' for letter in detections.letters.tolist()]
+    assigned = assign_letters(viewpoint, classes, detections.centers, has_letter, image_size)
+    for index, letter in assigned:
+        detections.set_letter(index, letter)
+    return assigned
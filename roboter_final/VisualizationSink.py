@@ -0,0 +1,71 @@
+import os
+
+import cv2
+
+from roboter_final.BackgroundWriter import BackgroundWriter
+
+# Status von CheckConnection, die als Fehlschlag gelten (keine Linie, Barriere im Weg)
+FAILURE_STATUSES = (0, 3)
+
+
+class VisualizationSink:
+    """
+    Zeichnet Analyse-Ergebnisse (CheckConnection.render_connection_analysis) im Hintergrund
+    und speichert sie als Bild. Die Mission übergibt nur das fertige Ergebnis; gezeichnet
+    wird in einem BackgroundWriter, bei voller Warteschlange wird das Bild verworfen.
+
+    Stichprobe: nur jedes every_nth-te Bild, oder mit only_failures=True nur Fehlschläge.
+    """
+
+    def __init__(self, output_dir, every_nth=1, only_failures=False, max_queue=4):
+        """
+        Args:
+            output_dir: Ordner für die Bilder (<name>_status<status>.jpg).
+            every_nth: Jedes n-te übergebene Ergebnis zeichnen (1 = alle).
+            only_failures: Nur Ergebnisse mit Status in FAILURE_STATUSES zeichnen.
+        """
+        self.output_dir = output_dir
+        self.every_nth = max(1, every_nth)
+        self.only_failures = only_failures
+        self.frames = 0
+        self.rendered = 0
+        os.makedirs(output_dir, exist_ok=True)
+        self._writer = BackgroundWriter(max_queue=max_queue, name="VisualizationSink")
+
+    def wants(self, status):
+        """True, wenn das nächste Ergebnis mit diesem Status gezeichnet würde."""
+        if self.only_failures:
+            return status in FAILURE_STATUSES
+        return self.frames % self.every_nth == 0
+
+    def submit(self, name, check_connection, status) -> bool:
+        """
+        Reiht die Analyse zum Zeichnen ein. check_connection danach nicht mehr verändern
+        (z.B. nicht erneut check_connection() aufrufen), sonst ist das Bild inkonsistent.
+
+        Returns:
+            True, wenn das Ergebnis gezeichnet wird.
+        """
+        take = self.wants(status)
+        self.frames += 1
+        return take and self._writer.submit(self._render, name, check_connection, status)
+
+    def _render(self, name, check_connection, status):
+        image = check_connection.render_connection_analysis(status)
+        if image is None:
+            return
+        path = os.path.join(self.output_dir, f"{name}_status{status}.jpg")
+        if cv2.imwrite(path, image):
+            self.rendered += 1
+        else:
+            print(f"❌ Visualisierung konnte nicht gespeichert werden: {path}")
+
+    @property
+    def dropped(self):
+        return self._writer.dropped
+
+    def flush(self):
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
@@ -1,6 +1,14 @@
 import os
+import threading
+import time
+
 import cv2
-from ultralytics import YOLO
+import numpy as np
+
+from roboter_final.DetectionFile import write_detections
+from roboter_final.Detections import Detections
+from roboter_final.DetectorBackends import DEFAULT_IMGSZ, create_backend
+from roboter_final.Quantization import DEFAULT_MAX_RECALL_DROP, resolve_int8_model
 
 # Objektklasse für erkannte Elemente
 class Objekt:
@@ -32,39 +40,216 @@ class Objekt:
 
 # YOLO-Erkennungs-Wrapper
 class YoloDetector:
-    def __init__(self, model_path):
-        self.model = YOLO(model_path)
-        self.labels = self.model.names
+    def __init__(self, model_path, warmup=True, warmup_size=(720, 1280), backend="ultralytics",
+                 precision="fp32", max_recall_drop=DEFAULT_MAX_RECALL_DROP, roi=None, imgsz=None):
+        """
+        Lädt das Modell und führt optional direkt einen Warm-up-Durchlauf aus.
+
+        Args:
+            model_path: Pfad zum YOLO-Modell (.pt Datei, oder .onnx für die ONNX-Backends)
+            warmup: Wenn True, wird nach dem Laden eine Inferenz auf einem leeren Frame gemacht.
+            warmup_size: (Höhe, Breite) des leeren Warm-up-Frames, sollte der Kameraauflösung entsprechen.
+            backend: "ultralytics", "onnx" oder "openvino", siehe DetectorBackends.
+            precision: "fp32" oder "int8". INT8 geht nur mit "onnx"/"openvino" und wird abgelehnt
+                       (Rückfall auf FP32), wenn eine Klasse mehr als max_recall_drop Recall verliert.
+            roi: (x1, y1, x2, y2) als Anteile von Breite/Höhe (0..1). Nur dieser Bildausschnitt geht ins
+                 Modell, die Boxen werden auf den ganzen Frame zurückgerechnet. None = ganzer Frame.
+            imgsz: Eingabegrösse des Modells (Vielfaches von 32). None = Standard des Backends.
+        """
+        self.model_path = model_path
+        start = time.perf_counter()
+        if precision == "int8":
+            if backend == "ultralytics":
+                raise ValueError("INT8 wird nur mit den Backends 'onnx' und 'openvino' unterstützt")
+            model_path = resolve_int8_model(model_path, max_recall_drop, imgsz or DEFAULT_IMGSZ)
+            precision = "int8" if model_path.endswith(".int8.onnx") else "fp32"
+        elif precision != "fp32":
+            raise ValueError(f"Unbekannte Präzision '{precision}', möglich: fp32, int8")
+        self.precision = precision
+        self.roi = self._check_roi(roi)
+        self.backend = create_backend(backend, model_path, imgsz=imgsz)
+        self.imgsz = self.backend.imgsz
+        self.labels = self.backend.labels
+        self.model_version = self._model_version(getattr(self.backend, 'model_path', model_path))
+        self.load_time = time.perf_counter() - start
+        self.warmup_time = None
+
+        if warmup:
+            self.warmup(warmup_size)
+
+    def __repr__(self):
+        warmup_info = f"{self.warmup_time:.2f}s" if self.warmup_time is not None else "-"
+        return (f"YoloDetector(model='{os.path.basename(self.model_path)}', backend={self.backend.name}, "
+                f"precision={self.precision}, imgsz={self.imgsz}, roi={self.roi}, "
+                f"load={self.load_time:.2f}s, warmup={warmup_info})")
+
+    def _model_version(self, model_path):
+        """Kennung des geladenen Modells; ändert sich mit jedem neu trainierten/exportierten Modell."""
+        stat = os.stat(model_path)
+        return (f"{os.path.basename(model_path)}:{stat.st_size}:{int(stat.st_mtime)}:{self.backend.name}:"
+                f"{self.precision}:{self.imgsz}:{self.roi}")
+
+    @staticmethod
+    def _check_roi(roi):
+        if roi is None:
+            return None
+        x1, y1, x2, y2 = (float(v) for v in roi)
+        if not (0 <= x1 < x2 <= 1 and 0 <= y1 < y2 <= 1):
+            raise ValueError(f"Ungültige ROI {roi}, erwartet (x1, y1, x2, y2) mit 0 <= x1 < x2 <= 1")
+        return x1, y1, x2, y2
+
+    def roi_pixels(self, frame_shape):
+        """ROI in Pixeln (x1, y1, x2, y2) für einen Frame der Grösse frame_shape."""
+        height, width = frame_shape[:2]
+        if self.roi is None:
+            return 0, 0, width, height
+        x1, y1, x2, y2 = self.roi
+        return int(x1 * width), int(y1 * height), int(round(x2 * width)), int(round(y2 * height))
+
+    def _predict(self, frame, confidence_threshold):
+        """backend.predict auf der ROI, Boxen in Koordinaten des ganzen Frames."""
+        if self.roi is None:
+            return self.backend.predict(frame, confidence_threshold)
+        x1, y1, x2, y2 = self.roi_pixels(frame.shape)
+        boxes, confidences, class_ids = self.backend.predict(np.ascontiguousarray(frame[y1:y2, x1:x2]),
+                                                             confidence_threshold)
+        return boxes + np.array([x1, y1, x1, y1], dtype=boxes.dtype), confidences, class_ids
+
+    def _predict_batch(self, frames, confidence_threshold):
+        if self.roi is None:
+            return self.backend.predict_batch(frames, confidence_threshold)
+        offsets, crops = [], []
+        for frame in frames:
+            x1, y1, x2, y2 = self.roi_pixels(frame.shape)
+            offsets.append(np.array([x1, y1, x1, y1], dtype=np.float32))
+            crops.append(np.ascontiguousarray(frame[y1:y2, x1:x2]))
+        return [(boxes + offset, confidences, class_ids) for offset, (boxes, confidences, class_ids)
+                in zip(offsets, self.backend.predict_batch(crops, confidence_threshold))]
+
+    def warmup(self, frame_size=(720, 1280)):
+        """
+        Schickt einen schwarzen Frame durch das Modell, damit der Graph-Aufbau
+        der ersten Inferenz nicht erst beim ersten Knoten bezahlt wird.
+
+        Returns:
+            Dauer des Warm-up-Durchlaufs in Sekunden.
+        """
+        height, width = frame_size
+        dummy_frame = np.zeros((height, width, 3), dtype=np.uint8)
+        start = time.perf_counter()
+        self._predict(dummy_frame, 0.25)
+        self.warmup_time = time.perf_counter() - start
+        return self.warmup_time
 
-    def detect(self, image_path, confidence_threshold=0.1):
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Image not found: {image_path}")
+    @staticmethod
+    def decode_frame(image):
+        """
+        Liefert das Bild als BGR-ndarray.
 
-        frame = cv2.imread(image_path)
+        Args:
+            image: Bereits dekodierter Frame (ndarray), JPEG/PNG-Puffer (bytes) oder Pfad zur Bilddatei.
+        """
+        if isinstance(image, np.ndarray):
+            return image
+
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            frame = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                raise ValueError("Image decoding failed.")
+            return frame
+
+        if not os.path.exists(image):
+            raise FileNotFoundError(f"Image not found: {image}")
+
+        frame = cv2.imread(image)
         if frame is None:
             raise ValueError("Image loading failed.")
+        return frame
+
+    def detect(self, image, confidence_threshold=0.1):
+        """
+        Führt die Erkennung aus, ohne etwas auf die Festplatte zu schreiben.
+
+        Args:
+            image: ndarray (BGR), JPEG-Puffer oder Pfad, siehe decode_frame.
+            confidence_threshold: Mindest-Vertrauen (0.1 = 10%).
+        """
+        return self._to_objects(self.detect_table(image, confidence_threshold))
+
+    def detect_table(self, image, confidence_threshold=0.1):
+        """Wie detect, aber als Detections-Tabelle (ohne eine Objekt-Instanz pro Erkennung)."""
+        frame = self.decode_frame(image)
+        boxes, confidences, class_ids = self._predict(frame, confidence_threshold)
+        return Detections.from_arrays(boxes, confidences, class_ids, self.labels)
 
-        results = self.model(frame, conf=confidence_threshold, verbose=False)
-        boxes = results[0].boxes
-        detected_objects = []
+    def detect_batch(self, images, confidence_threshold=0.1, verbose=False):
+        """
+        Erkennung auf mehreren Bildern in einem Backend-Aufruf (für Offline-Auswertungen).
 
-        for det in boxes:
-            x1, y1, x2, y2 = map(int, det.xyxy[0])
-            conf = det.conf.item()
-            cls_id = int(det.cls.item())
-            klass = self.labels[cls_id]
-            obj = Objekt(klass, conf * 100, (x1, y1, x2, y2))
-            detected_objects.append(obj)
-            print(f"Klasse erkannt: {klass}, Vertrauen: {conf:.1f}%, Box: ({x1}, {y1}, {x2}, {y2})")
-        return detected_objects
+        Returns:
+            Eine Objekt-Liste pro Bild, in der Reihenfolge von images.
+        """
+        frames = [self.decode_frame(image) for image in images]
+        if not frames:
+            return []
+        return [self._to_objects(Detections.from_arrays(boxes, confidences, class_ids, self.labels), verbose)
+                for boxes, confidences, class_ids in self._predict_batch(frames, confidence_threshold)]
+
+    def _to_objects(self, detections, verbose=True):
+        if verbose:
+            for klass, conf, (x1, y1, x2, y2) in zip(detections.classes, detections.confidences, detections.bboxes):
+                print(f"Klasse erkannt: {klass}, Vertrauen: {conf / 100:.1f}%, Box: ({x1}, {y1}, {x2}, {y2})")
+        return detections.to_objects(Objekt)
+
+    def save_detections(self, objects, path):
+        """Schreibt eine Objekt-Liste oder eine Detections-Tabelle im Binärformat (.det, siehe DetectionFile)."""
+        if not isinstance(objects, Detections):
+            objects = Detections.from_objects(objects)
+        write_detections(path, objects)
 
     def save_to_txt(self, objects, path):
+        """
+        Schreibt eine Objekt-Liste oder eine Detections-Tabelle als detected_objects.txt
+        (Textformat für ältere Werkzeuge, neu ist save_detections).
+        """
         with open(path, 'w', encoding='utf-8') as f:
+            if isinstance(objects, Detections):
+                f.writelines(line + "\n" for line in objects.to_lines())
+                return
             for obj in objects:
                 f.write(f"{obj.klasse};{obj.vertrauen:.1f}%;{obj.bounding_box};{obj.flaeche};{obj.zentrum};{obj.buchstabe or ''}\n")
 
-    def detect_and_save(self, image_path, save_path="/dataset/detected_objects.txt"):
-        objects = self.detect(image_path)
-        self.save_to_txt(objects, save_path)
+    def detect_and_save(self, image, save_path="/dataset/detected_objects.txt", writer=None):
+        """
+        Erkennung plus Datei (.det im Binärformat, sonst txt). Mit writer (BackgroundWriter)
+        wird die Datei im Hintergrund geschrieben und die Objekte sofort zurückgegeben.
+        """
+        objects = self.detect(image)
+        save = self.save_detections if save_path.endswith(".det") else self.save_to_txt
+        if writer is not None:
+            writer.submit(save, list(objects), save_path)
+        else:
+            save(objects, save_path)
 
         return objects
+
+
+# Langlebige Detector-Instanzen, eine pro Modell (wird über die ganze Mission geteilt)
+_shared_detectors = {}
+_shared_detectors_lock = threading.Lock()
+
+
+def get_detector(model_path, warmup=True, backend="ultralytics", precision="fp32", roi=None, imgsz=None):
+    """
+    Liefert den geteilten Detector für model_path. Beim ersten Aufruf wird das
+    Modell geladen und aufgewärmt, danach wird immer dieselbe Instanz zurückgegeben.
+    """
+    key = (os.path.abspath(model_path), backend, precision, tuple(roi) if roi else None, imgsz)
+    with _shared_detectors_lock:
+        detector = _shared_detectors.get(key)
+        if detector is None:
+            detector = YoloDetector(model_path, warmup=warmup, backend=backend, precision=precision,
+                                    roi=roi, imgsz=imgsz)
+            _shared_detectors[key] = detector
+            print(f"🧠 Detector bereit: {detector}")
+        return detector
@@ -0,0 +1,144 @@
+"""
+Buchstaben-Zuordnung je Standpunkt (roboter_final/ViewpointAssignment.py) gegen die Buchstaben
+der ursprünglichen assignment_A..H-Methoden.
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.assignment
+    python -m roboter_final.benchmarks.assignment --write-expected   # Referenz neu schreiben
+
+assignment_expected.txt enthält pro Bild mit Erkennungsdatei und Standpunkt die Buchstaben,
+die die alten Methoden aus roboter_final/Objekt.py vergeben haben (F/G mit den Bilddimensionen und
+zusätzlich als "F:0x0"/"G:0x0" ohne, wenn die Bildgrösse nicht gelesen werden konnte; Barrieren mit
+dem Zentrum unten auf dem Balken wie Objekt.zentrum und Detections). Geprüft werden
+beide Wege der Engine: Objekt-Listen (assign_objects) und die Detections-Tabelle (assign_detections).
+Exit-Code 1 bei Abweichungen.
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+
+import cv2
+
+from roboter_final.benchmarks.common import REPO_DIR, list_images, load_label_file, time_call
+from roboter_final.DetectionFile import load_detections
+from roboter_final.Objekt import Objekt
+from roboter_final.ViewpointAssignment import VIEWPOINT_TEMPLATES, assign_detections, assign_objects
+
+EXPECTED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assignment_expected.txt")
+HEADER = "# bild;standpunkt;buchstaben pro Erkennung in Dateireihenfolge ('-' = keiner)"
+# Standpunkte mit Anker unter dem Bild, zusätzlich ohne Bilddimensionen geprüft
+ZERO_SIZE_VIEWPOINTS = ("F", "G")
+
+
+def load_expected(path):
+    expected = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                bild, standpunkt, buchstaben = line.strip().split(";")
+                expected[(bild, standpunkt)] = buchstaben.split(",")
+    return expected
+
+
+def load_cases(paths):
+    """(relativer Pfad, Erkennungen, (Breite, Höhe)) pro Bild mit Erkennungsdatei."""
+    cases = []
+    for path in paths:
+        labels = load_label_file(path)
+        frame = cv2.imread(path)
+        if labels and frame is not None:
+            rel = os.path.relpath(path, REPO_DIR).replace(os.sep, "/")
+            cases.append((rel, os.path.splitext(path)[0] + ".txt", labels, (frame.shape[1], frame.shape[0])))
+    return cases
+
+
+def variants(size):
+    """(Schlüssel, Standpunkt, Bildgrösse) für alle Standpunkte und F/G mit Bildgrösse 0x0."""
+    for standpunkt in VIEWPOINT_TEMPLATES:
+        yield standpunkt, standpunkt, size
+    for standpunkt in ZERO_SIZE_VIEWPOINTS:
+        yield f"{standpunkt}:0x0", standpunkt, (0, 0)
+
+
+def letters_from_objects(standpunkt, labels, size):
+    objekte = [Objekt(klasse, vertrauen, bbox) for klasse, vertrauen, bbox in labels]
+    assign_objects(standpunkt, objekte, *size)
+    return [obj.buchstabe or "-" for obj in objekte]
+
+
+def letters_from_detections(standpunkt, label_path, size):
+    detections = load_detections(label_path)
+    assign_detections(standpunkt, detections, size)
+    return [letter or "-" for letter in detections.letters]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", nargs="*", help="Bildordner (Standard: Datensatz-Ordner im Repo)")
+    parser.add_argument("--expected", default=EXPECTED_FILE)
+    parser.add_argument("--write-expected", action="store_true",
+                        help="aktuelle Zuordnung als Referenz speichern (nur nach bewusster Änderung)")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    cases = load_cases(list_images(args.images))
+    if not cases:
+        print("❌ Keine Bilder mit Erkennungsdatei gefunden")
+        return 1
+
+    if args.write_expected:
+        lines = [HEADER]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for rel, _, labels, size in cases:
+                for key, standpunkt, variant_size in variants(size):
+                    letters = letters_from_objects(standpunkt, labels, variant_size)
+                    lines.append(f"{rel};{key};{','.join(letters)}")
+        with open(args.expected, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"✔ {len(lines) - 1} Referenzzeilen nach {args.expected} geschrieben")
+        return 0
+
+    expected = load_expected(args.expected)
+    mismatches = checked = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = [(rel, key, letters_from_objects(standpunkt, labels, variant_size),
+                    letters_from_detections(standpunkt, label_path, variant_size))
+                   for rel, label_path, labels, size in cases
+                   for key, standpunkt, variant_size in variants(size)]
+    for rel, key, from_objects, from_detections in results:
+        reference = expected.get((rel, key))
+        if reference is None:
+            continue
+        checked += 1
+        if from_objects != reference or from_detections != reference:
+            mismatches += 1
+            print(f"  ❌ {rel} Standpunkt {key}: erwartet {reference}, "
+                  f"Objekte {from_objects}, Detections {from_detections}")
+
+    timings = {standpunkt: [] for standpunkt in VIEWPOINT_TEMPLATES}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _, label_path, _, size in cases:
+            detections = load_detections(label_path)
+            for standpunkt in timings:
+                _, ms = time_call(lambda: assign_detections(standpunkt, detections.copy(), size),
+                                  repeat=args.repeat)
+                timings[standpunkt].extend(ms)
+    print(f"{len(cases)} Bilder, {checked} Zuordnungen geprüft, Zeit pro Zuordnung (Median):")
+    for standpunkt, ms in timings.items():
+        print(f"  {standpunkt}: {statistics.median(ms) * 1000:6.1f}µs")
+
+    if not checked:
+        print(f"❌ Keine Referenz für diese Bilder in {args.expected}")
+        return 1
+    if mismatches:
+        print(f"❌ {mismatches} Zuordnungen weichen von den alten assignment-Methoden ab")
+        return 1
+    print("✔ Gleiche Buchstaben wie die alten assignment-Methoden")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Parität und Latenz der Detector-Backends gegenüber ultralytics.
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.backends --model roboter_final/my_model.pt --backends onnx openvino
+
+Für jedes Bild wird das ultralytics-Ergebnis als Referenz genommen. Ein Backend
+gilt als paritätisch, wenn pro Klasse mindestens --min-recall der Referenzboxen
+(IoU >= --iou) mit gleicher Klasse wiedergefunden werden. Der Exit-Code ist 1,
+wenn ein Backend die Parität verfehlt.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import cv2
+
+from roboter_final.benchmarks.common import (as_tuples, list_images, match_detections, merge_stats,
+                                             precision_recall, time_call)
+from roboter_final.YoloDetector import YoloDetector
+
+
+def run_backend(name, model_path, frames, confidence, repeat):
+    start = time.perf_counter()
+    detector = YoloDetector(model_path, backend=name)
+    load_time = time.perf_counter() - start
+    results, timings = [], []
+    for frame in frames:
+        objects, frame_timings = time_call(detector.detect, frame, confidence, repeat=repeat)
+        results.append(as_tuples(objects))
+        timings.extend(frame_timings)
+    return load_time, detector.warmup_time, results, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="Pfad zum .pt-Modell")
+    parser.add_argument("--images", nargs="*", help="Bildordner (Standard: Datensatz-Ordner im Repo)")
+    parser.add_argument("--backends", nargs="+", default=["onnx"], help="Zu vergleichende Backends")
+    parser.add_argument("--conf", type=float, default=0.1)
+    parser.add_argument("--iou", type=float, default=0.5)
+    parser.add_argument("--min-recall", type=float, default=0.9)
+    parser.add_argument("--repeat", type=int, default=3, help="Messungen pro Bild")
+    args = parser.parse_args()
+
+    paths = list_images(args.images)
+    if not paths:
+        print("❌ Keine Bilder gefunden")
+        return 1
+    frames = [cv2.imread(p) for p in paths]
+    print(f"{len(frames)} Bilder geladen")
+
+    reference = run_backend("ultralytics", args.model, frames, args.conf, args.repeat)
+    report = {"ultralytics": reference}
+    for name in args.backends:
+        report[name] = run_backend(name, args.model, frames, args.conf, args.repeat)
+
+    ref_median = statistics.median(reference[3])
+    print(f"\n{'Backend':<12} {'Laden':>8} {'Warm-up':>8} {'Median':>10} {'Mittel':>10} {'Speedup':>8}")
+    for name, (load_time, warmup_time, _, timings) in report.items():
+        median = statistics.median(timings)
+        print(f"{name:<12} {load_time:>7.2f}s {warmup_time:>7.2f}s {median:>8.1f}ms "
+              f"{statistics.mean(timings):>8.1f}ms {ref_median / median:>7.2f}x")
+
+    failed = False
+    for name in args.backends:
+        total = {}
+        for ref, cand in zip(reference[2], report[name][2]):
+            merge_stats(total, match_detections(ref, cand, args.iou))
+        print(f"\nParität {name} gegen ultralytics:")
+        for klasse, entry in sorted(total.items()):
+            precision, recall = precision_recall(entry)
+            conf_diff = max(entry['conf_diff']) if entry['conf_diff'] else 0.0
+            ok = recall >= args.min_recall
+            failed |= not ok
+            print(f"  {'✔' if ok else '❌'} {klasse:<8} recall={recall:.3f} precision={precision:.3f} "
+                  f"max Δvertrauen={conf_diff:.1f}%")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
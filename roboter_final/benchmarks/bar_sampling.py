@@ -0,0 +1,115 @@
+"""
+Balken-Abtastung in src/utils/aplha/Matrix.py: vektorisierte Objekt._balken_werte gegenüber der
+ursprünglichen Pixel-Schleife (_balken_werte_referenz).
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.bar_sampling
+
+Regression: auf den Datensatz-Bildern mit Erkennungsdatei werden alle Punkt-Paare (plus der
+Dummy-Punkt unter dem Bild, wie in create_adjacency_matrix) in Originalgrösse und auf
+4608x2592 abgetastet, dazu zufällige Balken mit Endpunkten ausserhalb des Bildes. Werte und
+Reihenfolge müssen gleich sein, damit sind auch die Ratios gleich. Exit-Code 1 bei Abweichungen.
+Mit --check-only nur die Prüfung (läuft in benchmarks.checks).
+"""
+import argparse
+import itertools
+import os
+import statistics
+import sys
+
+import cv2
+import numpy as np
+
+from roboter_final import lineDetection
+from roboter_final.benchmarks.common import REPO_DIR, list_images, load_label_file, time_call
+
+FRAME_SIZES = {"Original": None, "4608x2592": (4608, 2592)}
+ALPHA_DIR = os.path.join(REPO_DIR, "src", "utils", "aplha")
+
+
+def load_cases(paths, size):
+    """(Graustufen-Linienbild, Balken-Endpunkte) pro Bild mit Erkennungsdatei, optional skaliert."""
+    cases = []
+    for path in paths:
+        labels = load_label_file(path)
+        frame = cv2.imread(path)
+        if not labels or frame is None:
+            continue
+        sx = sy = 1.0
+        if size is not None:
+            sx, sy = size[0] / frame.shape[1], size[1] / frame.shape[0]
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+        gray = lineDetection.process_frame(frame, None, return_gray=True)
+        punkte = [(int((x1 + x2) / 2 * sx), int((y1 + y2) / 2 * sy))
+                  for klasse, _, (x1, y1, x2, y2) in labels if klasse != 'wall']
+        punkte.append((gray.shape[1] // 2, gray.shape[0] + 50))
+        cases.append((gray, [(p1, p2) for p1, p2 in itertools.combinations(punkte, 2) if p1 != p2]))
+    return cases
+
+
+def random_bars(rng, shape, count):
+    h, w = shape
+    starts = rng.integers((-100, -100), (w + 100, h + 100), (count, 2))
+    ends = rng.integers((-100, -100), (w + 100, h + 100), (count, 2))
+    widths = rng.integers(1, 30, count)
+    return [(tuple(map(int, p1)), tuple(map(int, p2)), int(bw)) for p1, p2, bw in zip(starts, ends, widths)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", nargs="*", help="Bildordner (Standard: Datensatz-Ordner im Repo)")
+    parser.add_argument("--bar-width", type=int, default=10)
+    parser.add_argument("--random", type=int, default=300, help="zufällige Balken pro Bildgrösse")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check-only", action="store_true", help="nur auf Gleichheit prüfen, keine Zeitmessung")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ALPHA_DIR)
+    try:
+        from Matrix import Objekt
+    except ImportError as e:
+        print(f"❌ Matrix kann nicht geladen werden, Abhängigkeit fehlt: {e}")
+        return 1
+
+    rng = np.random.default_rng(0)
+    paths = list_images(args.images)
+    mismatches = 0
+    for size_name, size in FRAME_SIZES.items():
+        cases = load_cases(paths, size)
+        if not cases:
+            print("❌ Keine Bilder mit Erkennungsdatei gefunden")
+            return 1
+
+        bars = [(gray, p1, p2, args.bar_width) for gray, paare in cases for p1, p2 in paare]
+        bars += [(cases[0][0], p1, p2, bw) for p1, p2, bw in random_bars(rng, cases[0][0].shape, args.random)]
+        for gray, p1, p2, bw in bars:
+            expected = np.array(Objekt._balken_werte_referenz(gray, p1, p2, bw), dtype=gray.dtype)
+            if not np.array_equal(Objekt._balken_werte(gray, p1, p2, bw), expected):
+                mismatches += 1
+                print(f"  ❌ {size_name}: Balken {p1}-{p2} (Breite {bw}) weicht ab")
+        if args.check_only:
+            print(f"{size_name}: {len(cases)} Bilder, {len(bars)} Balken geprüft")
+            continue
+
+        # Zeit pro Frame: alle Paare eines Bildes, wie create_adjacency_matrix
+        timings = {"Schleife": [], "NumPy": []}
+        for gray, paare in cases:
+            for name, func in (("Schleife", Objekt._balken_werte_referenz), ("NumPy", Objekt._balken_werte)):
+                _, ms = time_call(lambda: [func(gray, p1, p2, args.bar_width) for p1, p2 in paare],
+                                  repeat=args.repeat)
+                timings[name].extend(ms)
+        loop_ms, numpy_ms = statistics.median(timings["Schleife"]), statistics.median(timings["NumPy"])
+        n_pairs = statistics.median(len(paare) for _, paare in cases)
+        print(f"{size_name}: {len(cases)} Bilder, {len(bars)} Balken geprüft, ~{n_pairs:.0f} Paare pro Frame")
+        print(f"  Schleife: {loop_ms:8.1f}ms")
+        print(f"  NumPy:    {numpy_ms:8.1f}ms ({loop_ms / numpy_ms:.0f}x)")
+
+    if mismatches:
+        print(f"❌ {mismatches} Balken weichen von der Pixel-Schleife ab")
+        return 1
+    print("✔ Gleiche Werte wie die Pixel-Schleife")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
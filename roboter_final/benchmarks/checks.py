@@ -0,0 +1,56 @@
+"""
+Führt alle Gleichheitsprüfungen der Benchmarks aus (ohne Zeitmessung) - das Repo hat keine
+Test-Suite, dies ist der Ersatz dafür. Jede Prüfung läuft als eigener Prozess; Exit-Code 1,
+sobald eine davon fehlschlägt.
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.checks
+    python -m roboter_final.benchmarks.checks color_removal   # nur einzelne Prüfungen
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+from roboter_final.benchmarks.common import REPO_DIR
+
+# Benchmark-Modul -> Argumente für einen reinen Gleichheitstest
+CHECKS = {
+    "color_removal": ["--check-only"],
+    "geometry": [],
+    "bar_sampling": ["--check-only"],
+    "assignment": ["--repeat", "1"],
+}
+
+
+def run_check(name, args):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-m", f"roboter_final.benchmarks.{name}", *args], cwd=REPO_DIR,
+                            capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if result.returncode:
+        print(f"❌ {name} ({seconds:.1f}s)")
+        print(result.stdout + result.stderr)
+    else:
+        print(f"✔ {name} ({seconds:.1f}s)")
+    return result.returncode == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help=f"Standard: alle ({', '.join(CHECKS)})")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in CHECKS]
+    if unknown:
+        parser.error(f"unbekannte Prüfung: {', '.join(unknown)}")
+
+    failed = [name for name in args.names or CHECKS if not run_check(name, CHECKS[name])]
+    if failed:
+        print(f"❌ Fehlgeschlagen: {', '.join(failed)}")
+        return 1
+    print("✔ Alle Prüfungen bestanden")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
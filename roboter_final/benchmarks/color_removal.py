@@ -0,0 +1,91 @@
+"""
+Farbentfernung (lineDetection.replace_colors_with_white): LUT-Umsetzung gegenüber der
+ursprünglichen Umsetzung, auf 720p- und 4608x2592-Frames.
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.color_removal
+
+Vor der Zeitmessung wird geprüft, dass beide Umsetzungen bitgenau dasselbe Bild liefern:
+auf den Datensatz-Bildern, auf Zufallsbildern (alle Farbwerte) mit zufälligen Farben und
+Toleranzen, und auf einem Bild mit allen 256³ Farben. Exit-Code 1 bei Abweichungen.
+Mit --check-only nur die Prüfung (läuft in benchmarks.checks).
+"""
+import argparse
+import statistics
+import sys
+
+import cv2
+import numpy as np
+
+from roboter_final.benchmarks.common import list_images, time_call
+from roboter_final.lineDetection import (DEFAULT_BGR_COLORS, DEFAULT_TOL, replace_colors_with_white,
+                                         replace_colors_with_white_reference)
+
+FRAME_SIZES = {"720p": (1280, 720), "4608x2592": (4608, 2592)}
+
+
+def all_colors_image():
+    """4096 x 4096 Bild, das jede BGR-Farbe genau einmal enthält."""
+    values = np.arange(256 ** 3, dtype=np.uint32)
+    image = np.stack([values & 0xFF, (values >> 8) & 0xFF, values >> 16], axis=-1).astype(np.uint8)
+    return image.reshape(4096, 4096, 3)
+
+
+def check_identical(frames, rng, random_trials):
+    cases = [(frame, DEFAULT_BGR_COLORS, DEFAULT_TOL) for frame in frames]
+    cases.append((all_colors_image(), DEFAULT_BGR_COLORS, DEFAULT_TOL))
+    for _ in range(random_trials):
+        image = rng.integers(0, 256, (240, 320, 3), dtype=np.uint8)
+        image[:40] = rng.integers(245, 256, (40, 320, 3), dtype=np.uint8)  # viel Fast-Weiß
+        colors = [tuple(int(v) for v in rng.integers(0, 256, 3)) for _ in range(rng.integers(1, 5))]
+        if rng.random() < 0.3:
+            colors.append((231, 252, 254))  # weicher Farbton liegt selbst in einem Farbbereich
+        cases.append((image, colors, int(rng.integers(0, 130))))
+
+    failures = 0
+    for image, colors, tol in cases:
+        expected = replace_colors_with_white_reference(image, colors, tol)
+        actual = replace_colors_with_white(image, colors, tol)
+        if not np.array_equal(expected, actual):
+            failures += 1
+            print(f"❌ Abweichung bei Farben={colors}, tol={tol}: "
+                  f"{np.count_nonzero(np.any(expected != actual, axis=-1))} Pixel")
+    return len(cases), failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", nargs="*", help="Bildordner (Standard: Datensatz-Ordner im Repo)")
+    parser.add_argument("--max-images", type=int, default=5)
+    parser.add_argument("--random-trials", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check-only", action="store_true", help="nur auf Gleichheit prüfen, keine Zeitmessung")
+    args = parser.parse_args()
+
+    paths = list_images(args.images)[:args.max_images]
+    frames = [cv2.imread(p) for p in paths]
+    frames = [f for f in frames if f is not None] or [np.random.default_rng(1).integers(0, 256, (720, 1280, 3),
+                                                                                         dtype=np.uint8)]
+
+    total, failures = check_identical(frames, np.random.default_rng(0), args.random_trials)
+    print(f"{'✔' if not failures else '❌'} {total - failures}/{total} Fälle bitgenau gleich")
+    if args.check_only:
+        return 1 if failures else 0
+
+    print(f"\n{'Grösse':<10} {'Referenz':>10} {'LUT':>10} {'Speedup':>8}")
+    for name, size in FRAME_SIZES.items():
+        reference, fused = [], []
+        for frame in frames:
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+            reference += time_call(replace_colors_with_white_reference, frame, DEFAULT_BGR_COLORS, DEFAULT_TOL,
+                                   repeat=args.repeat)[1]
+            fused += time_call(replace_colors_with_white, frame, DEFAULT_BGR_COLORS, DEFAULT_TOL,
+                               repeat=args.repeat)[1]
+        ref_ms, fused_ms = statistics.median(reference), statistics.median(fused)
+        print(f"{name:<10} {ref_ms:>8.1f}ms {fused_ms:>8.1f}ms {ref_ms / fused_ms:>7.2f}x")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import os
+import time
+
+import numpy as np
+
+from roboter_final.DetectionFile import load_detections
+from roboter_final.ImageFiles import GENERATED_PREFIXES
+from roboter_final.ImageFiles import list_images as _list_images
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BASE_DIR)
+
+# Bilder, auf denen die Benchmarks standardmässig laufen
+DEFAULT_IMAGE_DIRS = [
+    os.path.join(BASE_DIR, "dataset"),
+    os.path.join(BASE_DIR, "dummy_data"),
+    os.path.join(REPO_DIR, "scripts", "work", "pictures"),
+    os.path.join(REPO_DIR, "src", "utils", "aplha", "Dataset"),
+]
+DETECTION_CLASSES = ['point', 'pointa', 'pointb', 'pointc', 'barrier', 'wall']
+
+
+def list_images(image_dirs=None, skip_prefixes=GENERATED_PREFIXES):
+    """Alle Originalbilder in den Ordnern (bearbeitete Bilder und Ausgaben werden übersprungen)."""
+    return _list_images(image_dirs or DEFAULT_IMAGE_DIRS, skip_prefixes)
+
+
+def load_label_file(image_path):
+    """
+    Liest die Erkennungsdatei mit gleichem Namen wie das Bild (z.B. Test2_A.jpg -> Test2_A.det
+    oder Test2_A.txt, siehe DetectionFile).
+
+    Returns:
+        Liste von (klasse, vertrauen, (x1, y1, x2, y2)) oder None, wenn es keine Datei gibt.
+    """
+    base = os.path.splitext(image_path)[0]
+    if not os.path.exists(base + ".det") and not os.path.exists(base + ".txt"):
+        return None
+    detections = load_detections(base + ".txt")
+    return [(str(klasse), float(conf), tuple(int(v) for v in bbox))
+            for klasse, conf, bbox in zip(detections.classes, detections.confidences, detections.bboxes)]
+
+
+def box_iou(box, boxes):
+    """IoU einer Box (4,) gegen viele Boxen (N, 4), alle xyxy."""
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    xx1 = np.maximum(box[0], boxes[:, 0])
+    yy1 = np.maximum(box[1], boxes[:, 1])
+    xx2 = np.minimum(box[2], boxes[:, 2])
+    yy2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / (area + areas - inter + 1e-9)
+
+
+def match_detections(reference, candidate, iou_threshold=0.5):
+    """
+    Ordnet die Kandidaten-Erkennungen gierig den Referenz-Erkennungen gleicher Klasse zu.
+
+    Args:
+        reference, candidate: Listen von (klasse, vertrauen, (x1, y1, x2, y2)).
+
+    Returns:
+        Dict klasse -> {'tp', 'fp', 'fn', 'conf_diff'} (conf_diff: Liste der Vertrauensdifferenzen der Treffer).
+    """
+    stats = {}
+    used = set()
+    for klasse in set(r[0] for r in reference) | set(c[0] for c in candidate):
+        stats[klasse] = {'tp': 0, 'fp': 0, 'fn': 0, 'conf_diff': []}
+
+    for ref_class, ref_conf, ref_box in sorted(reference, key=lambda r: -r[1]):
+        best, best_iou = None, iou_threshold
+        for idx, (cand_class, cand_conf, cand_box) in enumerate(candidate):
+            if idx in used or cand_class != ref_class:
+                continue
+            iou = box_iou(np.asarray(ref_box, dtype=np.float64), [cand_box])[0]
+            if iou >= best_iou:
+                best, best_iou = idx, iou
+        if best is None:
+            stats[ref_class]['fn'] += 1
+        else:
+            used.add(best)
+            stats[ref_class]['tp'] += 1
+            stats[ref_class]['conf_diff'].append(abs(candidate[best][1] - ref_conf))
+
+    for idx, (cand_class, _, _) in enumerate(candidate):
+        if idx not in used:
+            stats[cand_class]['fp'] += 1
+    return stats
+
+
+def merge_stats(total, stats):
+    for klasse, values in stats.items():
+        entry = total.setdefault(klasse, {'tp': 0, 'fp': 0, 'fn': 0, 'conf_diff': []})
+        entry['tp'] += values['tp']
+        entry['fp'] += values['fp']
+        entry['fn'] += values['fn']
+        entry['conf_diff'].extend(values['conf_diff'])
+    return total
+
+
+def precision_recall(entry):
+    tp, fp, fn = entry['tp'], entry['fp'], entry['fn']
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    return precision, recall
+
+
+def as_tuples(objects):
+    """Objekt-Liste des YoloDetector -> Tupel für match_detections."""
+    return [(obj.klasse, obj.vertrauen, obj.bounding_box) for obj in objects]
+
+
+def time_call(func, *args, repeat=1, **kwargs):
+    """Ruft func repeat-mal auf und gibt (letztes Ergebnis, Laufzeiten in ms) zurück."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, timings
@@ -0,0 +1,194 @@
+"""
+Parameter-Sweep für die Verbindungserkennung: Farbentfernung (tol, bgr_colors) und
+CheckConnection (linien_schwelle, weiss_schwelle, balken_breite, center_zone_width_pixels)
+gegen gelabelte Bilder, parallel in einem Prozess-Pool.
+
+Aufruf (aus dem Repo-Hauptordner):
+    # 1. Label-Vorlage mit den heutigen Standardwerten erzeugen und von Hand korrigieren
+    python -m roboter_final.benchmarks.connection_sweep --write-labels connection_labels.csv
+    # 2. Sweep
+    python -m roboter_final.benchmarks.connection_sweep --labels connection_labels.csv \\
+        --tol 60 95 130 --linien-schwelle 0.03 0.05 0.1 --balken-breite 10 20 --out sweep.csv
+
+Labels: eine Zeile pro Bild "bild;status;richtung" (bild = Dateiname, status 0-3 wie
+check_connection, richtung links/mitte/rechts/keine Richtung, leer = nicht bewerten).
+Die Objekte kommen aus der Erkennungsdatei neben dem Bild (.det/.txt).
+
+Jedes Bild wird pro Farb-Parametersatz nur einmal dekodiert und bearbeitet; alle
+CheckConnection-Kombinationen laufen auf derselben Instanz und teilen sich deren Masken.
+Ausgabe: Tabelle aller Kombinationen (Genauigkeit, Median-Latenz gesamt und nur
+CheckConnection, Pareto-optimal ja/nein bezogen auf die Gesamtlatenz).
+"""
+import argparse
+import csv
+import itertools
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+from roboter_final import lineDetection
+from roboter_final.benchmarks.common import list_images, load_label_file
+from roboter_final.CheckConection import CheckConnection
+
+CHECK_PARAMETERS = ('linien_schwelle', 'weiss_schwelle', 'balken_breite', 'center_zone_width_pixels')
+
+
+def parse_colors(text):
+    """'135,115,100;51,59,76' -> ((135, 115, 100), (51, 59, 76))"""
+    return tuple(tuple(int(v) for v in color.split(',')) for color in text.split(';') if color)
+
+
+def format_colors(colors):
+    return ";".join(",".join(str(v) for v in color) for color in colors)
+
+
+def read_labels(path):
+    labels = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in csv.reader(f, delimiter=';'):
+            if not row or row[0].startswith('#'):
+                continue
+            status = int(row[1]) if len(row) > 1 and row[1].strip() else None
+            direction = row[2].strip() if len(row) > 2 and row[2].strip() else None
+            labels[row[0].strip()] = (status, direction)
+    return labels
+
+
+def evaluate_image(path, objects, colors, tol, check_grid):
+    """
+    Eine Aufgabe im Prozess-Pool: Bild einmal dekodieren und bearbeiten, dann alle
+    CheckConnection-Kombinationen auf derselben Instanz.
+
+    Returns:
+        (Vorverarbeitung in ms, {Kombination: (status, richtung, ms)})
+    """
+    start = time.perf_counter()
+    frame = cv2.imread(path)
+    gray = lineDetection.process_frame(frame, None, colors, tol, return_gray=True)
+    preprocess_ms = (time.perf_counter() - start) * 1000
+
+    check = CheckConnection(gray, objects)
+    results = {}
+    for combo in check_grid:
+        params = dict(zip(CHECK_PARAMETERS, combo))
+        start = time.perf_counter()
+        status = check.check_connection(params['linien_schwelle'], params['weiss_schwelle'], params['balken_breite'])
+        direction = check.get_turn_direction(params['center_zone_width_pixels'])
+        results[combo] = (status, direction, (time.perf_counter() - start) * 1000)
+    return preprocess_ms, results
+
+
+def pareto_flags(rows):
+    """Pareto-optimal: keine andere Zeile ist genauer und mindestens so schnell (oder umgekehrt)."""
+    flags = []
+    for row in rows:
+        dominated = any(other['accuracy'] >= row['accuracy'] and other['latency_ms'] <= row['latency_ms']
+                        and (other['accuracy'] > row['accuracy'] or other['latency_ms'] < row['latency_ms'])
+                        for other in rows)
+        flags.append(not dominated)
+    return flags
+
+
+def write_label_template(path, cases):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write("# bild;status;richtung - Vorschlag mit Standardparametern, bitte prüfen\n")
+        writer = csv.writer(f, delimiter=';')
+        for image_path, objects in cases:
+            _, results = evaluate_image(image_path, objects, lineDetection.DEFAULT_BGR_COLORS,
+                                        lineDetection.DEFAULT_TOL, [(0.05, 255, 10, 600)])
+            status, direction, _ = results[(0.05, 255, 10, 600)]
+            writer.writerow([os.path.basename(image_path), status, direction])
+    print(f"✔ Label-Vorlage für {len(cases)} Bilder gespeichert unter: {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", nargs="*", help="Bildordner (Standard: Datensatz-Ordner im Repo)")
+    parser.add_argument("--labels", help="Label-Datei (bild;status;richtung)")
+    parser.add_argument("--write-labels", help="Label-Vorlage mit den Standardwerten schreiben und beenden")
+    parser.add_argument("--tol", type=int, nargs="+", default=[lineDetection.DEFAULT_TOL])
+    parser.add_argument("--colors", nargs="+", default=[format_colors(lineDetection.DEFAULT_BGR_COLORS)],
+                        help="Farbsätze als 'B,G,R;B,G,R'")
+    parser.add_argument("--linien-schwelle", type=float, nargs="+", default=[0.05])
+    parser.add_argument("--weiss-schwelle", type=int, nargs="+", default=[255])
+    parser.add_argument("--balken-breite", type=int, nargs="+", default=[10])
+    parser.add_argument("--center-zone", type=int, nargs="+", default=[600])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="connection_sweep.csv", help="Ergebnistabelle (CSV)")
+    args = parser.parse_args()
+
+    cases = []
+    for image_path in list_images(args.images):
+        detections = load_label_file(image_path)
+        if detections is not None:
+            cases.append((image_path, [{'type': klasse, 'bbox': bbox} for klasse, _, bbox in detections]))
+    if not cases:
+        print("❌ Keine Bilder mit Erkennungsdatei gefunden")
+        return 1
+    if args.write_labels:
+        write_label_template(args.write_labels, cases)
+        return 0
+    if not args.labels:
+        print("❌ --labels fehlt (Vorlage mit --write-labels erzeugen)")
+        return 1
+
+    labels = read_labels(args.labels)
+    cases = [case for case in cases if os.path.basename(case[0]) in labels]
+    if not cases:
+        print("❌ Keines der Bilder ist in der Label-Datei")
+        return 1
+
+    color_grid = list(itertools.product([parse_colors(c) for c in args.colors], args.tol))
+    check_grid = list(itertools.product(args.linien_schwelle, args.weiss_schwelle, args.balken_breite,
+                                        args.center_zone))
+    print(f"{len(cases)} Bilder x {len(color_grid) * len(check_grid)} Kombinationen, {args.workers} Prozesse")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {(colors, tol, image_path): pool.submit(evaluate_image, image_path, objects, colors, tol, check_grid)
+                   for colors, tol in color_grid for image_path, objects in cases}
+        outcomes = {key: future.result() for key, future in futures.items()}
+    print(f"Sweep in {time.perf_counter() - start:.1f}s")
+
+    rows = []
+    for (colors, tol), combo in itertools.product(color_grid, check_grid):
+        correct, rated, latencies, check_latencies = 0, 0, [], []
+        for image_path, _ in cases:
+            preprocess_ms, results = outcomes[(colors, tol, image_path)]
+            status, direction, check_ms = results[combo]
+            latencies.append(preprocess_ms + check_ms)
+            check_latencies.append(check_ms)
+            expected_status, expected_direction = labels[os.path.basename(image_path)]
+            if expected_status is None:
+                continue
+            rated += 1
+            correct += status == expected_status and (expected_direction is None or direction == expected_direction)
+        rows.append(dict(zip(CHECK_PARAMETERS, combo), tol=tol, bgr_colors=format_colors(colors),
+                         accuracy=correct / rated if rated else 0.0, latency_ms=statistics.median(latencies),
+                         check_ms=statistics.median(check_latencies)))
+
+    for row, pareto in zip(rows, pareto_flags(rows)):
+        row['pareto'] = pareto
+    rows.sort(key=lambda row: (-row['accuracy'], row['latency_ms']))
+
+    columns = ['accuracy', 'latency_ms', 'check_ms', 'pareto', 'tol', 'bgr_colors'] + list(CHECK_PARAMETERS)
+    with open(args.out, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, delimiter=';')
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print("\nPareto-Front (Genauigkeit / Latenz):")
+    for row in rows:
+        if row['pareto']:
+            params = ", ".join(f"{name}={row[name]}" for name in ('tol',) + CHECK_PARAMETERS)
+            print(f"  {row['accuracy']:6.1%} {row['latency_ms']:7.1f}ms (Check {row['check_ms']:.1f}ms)  {params}")
+    print(f"✔ {len(rows)} Kombinationen gespeichert unter: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Ladezeit vieler Erkennungsdateien: txt (Objekt.parse_text_to_objects) gegenüber .det.
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.detection_files --files 2000
+
+Erzeugt --files zufällige Erkennungsdateien in einem temporären Ordner, in beiden
+Formaten, und prüft, dass beide Formate dieselben Erkennungen liefern.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from roboter_final.DetectionFile import read_detections, read_txt, write_detections
+from roboter_final.Detections import CLASSES, Detections
+from roboter_final.Objekt import Objekt
+
+
+def random_detections(rng, count):
+    boxes = rng.uniform(0, 4000, (count, 4)).astype(np.float32)
+    boxes[:, 2:] = boxes[:, :2] + rng.uniform(20, 400, (count, 2))
+    return Detections.from_arrays(boxes, rng.uniform(0.1, 1, count), rng.integers(0, len(CLASSES), count))
+
+
+def timed(func, paths):
+    start = time.perf_counter()
+    results = [func(path) for path in paths]
+    return results, time.perf_counter() - start
+
+
+def parse_txt_objects(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return Objekt.parse_text_to_objects(f.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--objects", type=int, default=10, help="Erkennungen pro Datei")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        txt_paths, det_paths = [], []
+        for i in range(args.files):
+            detections = random_detections(rng, args.objects)
+            txt_paths.append(os.path.join(tmp, f"{i}.txt"))
+            det_paths.append(os.path.join(tmp, f"{i}.det"))
+            with open(txt_paths[-1], 'w', encoding='utf-8') as f:
+                f.write("\n".join(detections.to_lines()) + "\n")
+            write_detections(det_paths[-1], detections)
+
+        objects, t_objects = timed(parse_txt_objects, txt_paths)
+        tables, t_txt = timed(read_txt, txt_paths)
+        binary, t_det = timed(read_detections, det_paths)
+
+        same = all(np.array_equal(a.bboxes, b.bboxes) and list(a.classes) == list(b.classes)
+                   and np.array_equal(a.letters, b.letters) for a, b in zip(tables, binary))
+        same &= all([o.bounding_box for o in objs] == [tuple(map(int, bbox)) for bbox in table.bboxes]
+                    for objs, table in zip(objects, binary))
+
+    print(f"{args.files} Dateien x {args.objects} Erkennungen")
+    print(f"  txt -> Objekt-Liste:  {t_objects * 1000:8.1f}ms")
+    print(f"  txt -> Detections:    {t_txt * 1000:8.1f}ms")
+    print(f"  .det:                 {t_det * 1000:8.1f}ms ({t_objects / t_det:.1f}x)")
+    print("✔ Gleiche Erkennungen in beiden Formaten" if same else "❌ Formate liefern unterschiedliche Erkennungen")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
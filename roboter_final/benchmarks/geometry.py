@@ -0,0 +1,73 @@
+"""
+Geometry.segments_hit_rects gegen shapely: gleiche Ergebnisse und Laufzeit.
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.geometry --cases 5000
+
+shapely wird nur für diesen Vergleich gebraucht, nicht mehr auf dem Roboter.
+Die Koordinaten sind klein und ganzzahlig gewählt, damit viele Strecken Ecken und
+Kanten genau berühren oder darauf liegen. Exit-Code 1 bei Abweichungen (läuft in
+benchmarks.checks).
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from roboter_final.Geometry import segments_hit_rects
+
+
+def shapely_hits(starts, ends, rects):
+    from shapely.geometry import LineString, Point, box
+
+    hits = np.zeros((len(starts), len(rects)), dtype=bool)
+    for i, (p1, p2) in enumerate(zip(starts, ends)):
+        geom = Point(p1) if tuple(p1) == tuple(p2) else LineString([p1, p2])
+        for j, rect in enumerate(rects):
+            hits[i, j] = geom.intersects(box(*rect))
+    return hits
+
+
+def random_case(rng, size):
+    starts = rng.integers(0, size, (int(rng.integers(1, 6)), 2))
+    ends = starts.copy() if rng.random() < 0.1 else rng.integers(0, size, starts.shape)
+    rects = rng.integers(0, size, (int(rng.integers(0, 8)), 4))
+    rects[:, 2:] = rects[:, :2] + rng.integers(1, size // 3, (len(rects), 2))
+    return starts.tolist(), ends.tolist(), rects.tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=40, help="Koordinatenbereich 0..size")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    cases = [random_case(rng, args.size) for _ in range(args.cases)]
+
+    start = time.perf_counter()
+    try:
+        expected = [shapely_hits(*case) for case in cases]
+    except ImportError:
+        print("❌ shapely ist für den Vergleich nötig (pip install shapely)")
+        return 1
+    t_shapely = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = [segments_hit_rects(*case) for case in cases]
+    t_numpy = time.perf_counter() - start
+
+    mismatches = sum(not np.array_equal(a, b) for a, b in zip(expected, actual))
+    tests = sum(hits.size for hits in expected)
+    print(f"{args.cases} Fälle, {tests} Strecke/Rechteck-Tests")
+    print(f"  shapely:  {t_shapely * 1000:8.1f}ms")
+    print(f"  Geometry: {t_numpy * 1000:8.1f}ms ({t_shapely / t_numpy:.1f}x)")
+    if mismatches:
+        print(f"❌ {mismatches} Fälle weichen von shapely ab")
+        return 1
+    print("✔ Gleiche Ergebnisse wie shapely")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Matrix-Stand im Speicher mit Journal (roboter_final/MatrixJournal.py) gegenüber dem bisherigen
+Neuschreiben von Currentmatrix.txt bei jedem find_wall.
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.matrix_journal
+
+Gemessen wird die Zeit, die find_wall auf das Speichern wartet (Median), dazu die Zeit, bis das
+Journal alles geschrieben hat. Danach wird das Journal wieder eingelesen: jeder Schnappschuss
+und der Stand zu jedem Zeitpunkt müssen der Matrix im Speicher entsprechen. Exit-Code 1 bei
+Abweichungen.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from roboter_final.MatrixJournal import NODE_LETTERS, MatrixJournal, MatrixState, read_journal, state_at
+
+
+def write_text_matrix(path, matrix):
+    """Bisheriges Speichern in find_wall (Python-Quelltext, jedes Mal neu geschrieben)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write("adjacency_matrix = np.array([\n")
+        f.write("    # " + " ".join(NODE_LETTERS) + "\n")
+        for i, row in enumerate(matrix):
+            f.write(f"    {[int(x) for x in row]},  # {NODE_LETTERS[i]}\n")
+        f.write("])")
+
+
+def random_views(rng, count):
+    """(Matrix, Buchstaben) wie von create_adjacency_matrix/find_wall, 3 bis 8 sichtbare Knoten."""
+    for _ in range(count):
+        letters = sorted(rng.choice(list(NODE_LETTERS), rng.integers(3, 9), replace=False))
+        matrix = np.triu(rng.integers(0, 3, (len(letters), len(letters))), 1)
+        yield matrix + matrix.T, letters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--views", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    views = list(random_views(rng, args.views))
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = os.path.join(tmp, "Matrix", "Currentmatrix.txt")
+        state = MatrixState(journal=MatrixJournal(os.path.join(tmp, "Matrix", "Currentmatrix.mxj")))
+
+        text_ms, state_ms, expected = [], [], []
+        for i, (matrix, letters) in enumerate(views):
+            start = time.perf_counter()
+            write_text_matrix(text_path, state.expand(matrix, letters))
+            text_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            state.set(matrix, letters, f"view{i}")
+            state_ms.append((time.perf_counter() - start) * 1000)
+            expected.append(state.matrix.copy())
+
+        start = time.perf_counter()
+        state.journal.flush()
+        flush_ms = (time.perf_counter() - start) * 1000
+
+        path = state.journal.path
+        _, entries = read_journal(path)
+        timestamps = [entry[0] for entry in entries]
+        mismatches = abs(len(entries) - len(expected))
+        for i, (entry, matrix) in enumerate(zip(entries, expected)):
+            mismatches += not np.array_equal(entry[2], matrix)
+            mismatches += not np.array_equal(state_at(path, index=i).matrix, matrix)
+            # Stand zum Zeitpunkt: letzter Schnappschuss bis dahin (gleiche Zeitstempel möglich)
+            last = max(j for j, t in enumerate(timestamps) if t <= timestamps[i])
+            mismatches += not np.array_equal(state_at(path, timestamps[i]).matrix, expected[last])
+        journal_size = os.path.getsize(path)
+
+    print(f"{args.views} Matrizen, Wartezeit in find_wall (Median):")
+    print(f"  Currentmatrix.txt neu schreiben: {statistics.median(text_ms) * 1000:7.1f}µs")
+    print(f"  Stand + Journal im Hintergrund:  {statistics.median(state_ms) * 1000:7.1f}µs")
+    print(f"  Rest des Journals nach dem letzten Aufruf: {flush_ms:.1f}ms, {journal_size / 1024:.1f}KiB")
+
+    if mismatches:
+        print(f"❌ {mismatches} Schnappschüsse weichen vom Stand im Speicher ab")
+        return 1
+    print("✔ Journal gibt jeden Stand wieder")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+create_adjacency_matrix (src/utils/aplha/Matrix.py) seriell gegenüber dem Prozess-Pool mit
+Shared Memory (workers > 1).
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.matrix_parallel --workers 4
+
+Läuft auf den Datensatz-Bildern mit Erkennungsdatei in Originalgrösse und auf 4608x2592.
+Der Pool wird unabhängig von PARALLEL_MIN_PIXELS erzwungen, damit beide Grössen verglichen
+werden können; der erste Aufruf (Start des Pools) zählt nicht zur Zeit. Exit-Code 1, wenn eine
+Matrix von der seriellen abweicht.
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+
+import cv2
+
+from roboter_final import lineDetection
+from roboter_final.benchmarks.common import REPO_DIR, list_images, load_label_file
+
+FRAME_SIZES = {"Original": None, "4608x2592": (4608, 2592)}
+ALPHA_DIR = os.path.join(REPO_DIR, "src", "utils", "aplha")
+
+
+def load_cases(paths, size):
+    """(Graustufen-Linienbild, Objekt-Dicts) pro Bild mit Erkennungsdatei, optional skaliert."""
+    cases = []
+    for path in paths:
+        labels = load_label_file(path)
+        frame = cv2.imread(path)
+        if not labels or frame is None:
+            continue
+        sx = sy = 1.0
+        if size is not None:
+            sx, sy = size[0] / frame.shape[1], size[1] / frame.shape[0]
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+        objects = [{'type': klasse, 'bbox': (int(x1 * sx), int(y1 * sy), int(x2 * sx), int(y2 * sy))}
+                   for klasse, _, (x1, y1, x2, y2) in labels]
+        cases.append((lineDetection.process_frame(frame, None, return_gray=True), objects))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", nargs="*", help="Bildordner (Standard: Datensatz-Ordner im Repo)")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ALPHA_DIR)
+    try:
+        from Matrix import Objekt
+    except ImportError as e:
+        print(f"❌ Matrix kann nicht geladen werden, Abhängigkeit fehlt: {e}")
+        return 1
+
+    def run(path, objects, workers):
+        objekte = [Objekt(o['type'], 100.0, o['bbox']) for o in objects]
+        punkte = sorted((o for o in objekte if o.klasse != 'wall'), key=lambda o: o.zentrum[0])
+        for obj, buchstabe in zip(punkte, "ABCDEFGH"):
+            obj.buchstabe = buchstabe
+        with contextlib.redirect_stdout(io.StringIO()):
+            return Objekt.create_adjacency_matrix(objekte, path, workers=workers, parallel_min_pixels=0)[0]
+
+    print(f"{args.workers} Prozesse, {os.cpu_count()} CPUs")
+    if (os.cpu_count() or 1) < 2:
+        print("⚠️ Nur eine CPU: die Zeiten sagen nichts über den Nutzen des Pools, nur die Matrizen zählen")
+    paths = list_images(args.images)
+    mismatches = 0
+    for size_name, size in FRAME_SIZES.items():
+        cases = load_cases(paths, size)
+        if not cases:
+            print("❌ Keine Bilder mit Erkennungsdatei gefunden")
+            return 1
+        with tempfile.TemporaryDirectory() as tmp:
+            frames = []
+            for i, (gray, objects) in enumerate(cases):
+                frames.append((os.path.join(tmp, f"frame{i}.png"), objects))
+                cv2.imwrite(frames[-1][0], gray)
+            run(*frames[0], args.workers)  # Pool starten
+
+            timings = {1: [], args.workers: []}
+            for path, objects in frames:
+                matrices = {}
+                for workers in timings:
+                    for _ in range(args.repeat):
+                        start = cv2.getTickCount()
+                        matrices[workers] = run(path, objects, workers)
+                        timings[workers].append((cv2.getTickCount() - start) / cv2.getTickFrequency() * 1000)
+                mismatches += (matrices[1] != matrices[args.workers]).any()
+
+        serial_ms, pool_ms = statistics.median(timings[1]), statistics.median(timings[args.workers])
+        print(f"{size_name}: {len(cases)} Bilder, Zeit pro Matrix (Median über {args.repeat})")
+        print(f"  seriell: {serial_ms:7.1f}ms")
+        print(f"  Pool:    {pool_ms:7.1f}ms ({serial_ms / pool_ms:.2f}x)")
+
+    if mismatches:
+        print(f"❌ {mismatches} Matrizen weichen von der seriellen Auswertung ab")
+        return 1
+    print("✔ Pool liefert dieselben Matrizen wie die serielle Auswertung")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
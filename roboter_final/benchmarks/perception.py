@@ -0,0 +1,73 @@
+"""
+Zeit pro Knoten: Erkennung und Farbentfernung nacheinander (bearbeitet_*.png schreiben und
+wieder einlesen) gegenüber PerceptionStage (Graustufenbild im Speicher).
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.perception --model roboter_final/my_model.pt
+
+Prüft ausserdem, dass das Graustufenbild im Speicher pixelgleich mit dem wieder
+eingelesenen PNG ist. Die PNGs werden dafür neben die Originale geschrieben.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from roboter_final import lineDetection
+from roboter_final.benchmarks.common import list_images
+from roboter_final.Perception import PerceptionStage
+from roboter_final.YoloDetector import YoloDetector
+
+
+def run_sequential(detector, image_path):
+    start = time.perf_counter()
+    frame = cv2.imread(image_path)
+    detector.detect(frame)
+    processed_path = lineDetection.process_image(image_path)
+    gray = cv2.imread(processed_path, cv2.IMREAD_GRAYSCALE)
+    return gray, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="Pfad zum .pt- oder .onnx-Modell")
+    parser.add_argument("--backend", default="ultralytics", choices=["ultralytics", "onnx", "openvino"])
+    parser.add_argument("--images", nargs="*", help="Bildordner (Standard: Datensatz-Ordner im Repo)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = list_images(args.images)
+    if not paths:
+        print("❌ Keine Bilder gefunden")
+        return 1
+
+    detector = YoloDetector(args.model, backend=args.backend)
+    stage = PerceptionStage(detector.detect)
+    sequential, concurrent, detect, preprocess = [], [], [], []
+    same = True
+    for path in paths:
+        for _ in range(args.repeat):
+            gray, sequential_ms = run_sequential(detector, path)
+            sequential.append(sequential_ms)
+            result = stage.run(path)
+            same &= bool(np.array_equal(gray, result.line_image))
+            concurrent.append(result.timings['total'])
+            detect.append(result.timings['detect'])
+            preprocess.append(result.timings['preprocess'])
+    stage.close()
+
+    print(f"\n{len(paths)} Bilder x {args.repeat}")
+    print(f"  Erkennung allein:      {statistics.median(detect):8.1f}ms")
+    print(f"  Vorverarbeitung allein:{statistics.median(preprocess):8.1f}ms")
+    print(f"  Nacheinander:          {statistics.median(sequential):8.1f}ms")
+    print(f"  PerceptionStage:       {statistics.median(concurrent):8.1f}ms "
+          f"({statistics.median(sequential) / statistics.median(concurrent):.2f}x)")
+    print("✔ Graustufenbild gleich wie das PNG" if same else "❌ Graustufenbild weicht vom PNG ab")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Knoten-Zuordnung über die Graph-Geometrie (roboter_final/NodeProjection.py).
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.projection
+    python -m roboter_final.benchmarks.projection --calibrate   # Kamerahöhe/-neigung anpassen
+
+projection_labels.txt enthält echte Aufnahmen mit bekanntem Standpunkt, Ausrichtung und dem
+Knoten pro Erkennung; auf genau diese wird das Kameramodell mit --calibrate angepasst, sie
+prüfen also nur die Konsistenz, nicht die Übertragbarkeit. Für jede wird der Abstand jedes
+beschrifteten Knotens zu seiner erwarteten Position (Anteil der Bilddiagonale) gegen die
+Schwelle DEFAULT_MAX_DISTANCE ausgegeben.
+
+Unabhängig davon die übrigen Datensatz-Ansichten mit Erkennungsdatei (verzerrte Aufnahmen
+ohne bekannte Ausrichtung): Referenz sind die Buchstaben der Vorlagen (ViewpointAssignment),
+ausgegeben wird der Fehler bei der am besten passenden Kanten-Ausrichtung. Das ist nur ein
+Hinweis und kein Prüfkriterium, weder die Vorlagen noch die Verzerrung sind eine Wahrheit.
+
+Dazu kommen synthetische Ansichten für jeden Standpunkt und jede Kanten-Ausrichtung:
+projizierte Knoten mit Rauschen, zufällig fehlenden Knoten und zusätzlichen Fehlerkennungen.
+Sie stammen aus demselben Kameramodell und prüfen nur die Zuordnung, nicht das Modell.
+linear_assignment wird gegen alle Permutationen geprüft. Exit-Code 1 bei Abweichungen auf den
+echten Aufnahmen, einer nicht optimalen Zuordnung oder einer Trefferquote unter --min-accuracy.
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import statistics
+import sys
+
+import numpy as np
+
+from roboter_final.benchmarks.common import REPO_DIR, list_images, load_label_file, time_call
+from roboter_final.DetectionFile import load_detections
+from roboter_final.NodeProjection import (DEFAULT_MAX_DISTANCE, CameraModel, NodeProjector,
+                                          assign_detections_by_projection, linear_assignment)
+from roboter_final.ViewpointAssignment import assign_detections
+
+LABELS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "projection_labels.txt")
+# Ansichten aus demselben Aufbau wie graph_data.json (dummy_data zeigt einen anderen Aufbau)
+DATASET_DIR = os.path.join(REPO_DIR, "src", "utils", "aplha", "Dataset")
+
+
+def load_labels(path):
+    """(Bildpfad, Standpunkt, Ausrichtung, Knoten pro Erkennung, Bildgrösse)."""
+    import cv2
+
+    labels = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                bild, standpunkt, ausrichtung, knoten = line.strip().split(";")
+                image_path = os.path.join(REPO_DIR, bild)
+                frame = cv2.imread(image_path)
+                if frame is None:
+                    print(f"⚠️ Bild fehlt: {bild}")
+                    continue
+                labels.append((image_path, standpunkt, float(ausrichtung),
+                               [k if k != "-" else "" for k in knoten.split(",")], frame.shape[1::-1]))
+    return labels
+
+
+def node_errors(projector, standpunkt, ausrichtung, centers, knoten, size):
+    """Abstand (Anteil der Bilddiagonale) pro beschriftetem Knoten, inf wenn er ausserhalb erwartet wird."""
+    letters, uv = projector.expected(standpunkt, ausrichtung, size)
+    diagonal = np.hypot(*size)
+    return {letter: np.hypot(*(center - uv[letters.index(letter)])) / diagonal if letter in letters else np.inf
+            for center, letter in zip(centers, knoten) if letter}
+
+
+def other_views(projector, labelled_paths):
+    """
+    (Bild, Standpunkt, Ausrichtung, Fehler pro Knoten) für die übrigen Datensatz-Ansichten, Referenz
+    sind die Vorlagen; die Kanten-Ausrichtung mit dem kleinsten mittleren Fehler gewinnt.
+    """
+    import cv2
+
+    views = []
+    for path in list_images([DATASET_DIR]):
+        standpunkt = os.path.splitext(os.path.basename(path))[0][-1:].upper()
+        if path in labelled_paths or standpunkt not in projector.letters or not load_label_file(path):
+            continue
+        size = cv2.imread(path).shape[1::-1]
+        detections = load_detections(os.path.splitext(path)[0] + ".txt")
+        with contextlib.redirect_stdout(io.StringIO()):
+            assign_detections(standpunkt, detections, size)
+        best = min(((node_errors(projector, standpunkt, heading, detections.centers, detections.letters, size),
+                     heading) for heading in projector.headings(standpunkt)),
+                   key=lambda candidate: np.mean(list(candidate[0].values()) or [np.inf]))
+        views.append((os.path.basename(path), standpunkt, best[1], best[0]))
+    return views
+
+
+def format_errors(errors, gate):
+    return ", ".join(f"{letter} {error:.1%}{'' if error < gate else ' ✗'}" if np.isfinite(error)
+                     else f"{letter} ausserhalb ✗" for letter, error in errors.items())
+
+
+def check_linear_assignment(rng, count):
+    """Anzahl Kostenmatrizen, bei denen linear_assignment nicht das Optimum findet."""
+    failures = 0
+    for _ in range(count):
+        n, m = (int(v) for v in rng.integers(0, 7, 2))
+        cost = rng.random((n, m))
+        rows, cols = linear_assignment(cost)
+        if n <= m:
+            best = min(sum(cost[i, p[i]] for i in range(n)) for p in itertools.permutations(range(m), n))
+        else:
+            best = min(sum(cost[p[j], j] for j in range(m)) for p in itertools.permutations(range(n), m))
+        failures += len(rows) != min(n, m) or not np.isclose(cost[rows, cols].sum(), best)
+    return failures
+
+
+def synthetic_views(projector, rng, image_size, noise, drop, clutter):
+    """Pro Standpunkt und Kanten-Ausrichtung eine Ansicht mit gestörten Erkennungen."""
+    diagonal = np.hypot(*image_size)
+    for node in projector.letters:
+        for heading in projector.headings(node):
+            letters, uv = projector.expected(node, heading, image_size)
+            keep = rng.random(len(letters)) >= drop
+            centers = uv[keep] + rng.normal(0, noise * diagonal, (keep.sum(), 2))
+            truth = [letter for letter, k in zip(letters, keep) if k]
+            extra = rng.integers(0, clutter + 1)
+            centers = np.vstack([centers, rng.random((extra, 2)) * image_size])
+            truth += [""] * extra
+            order = rng.permutation(len(truth))
+            yield node, heading, centers[order], [truth[i] for i in order], sorted(np.array(letters)[~keep])
+
+
+def calibrate(labels, image_detections):
+    """
+    Grobe, dann feinere Rastersuche über Höhe, Neigung, Abstand und eine Korrektur der
+    Ausrichtung (der Roboter steht auf den Aufnahmen nie genau ausgerichtet), mittlerer Pixelfehler.
+    Alle beschrifteten Knoten müssen im Bild liegen, sonst taugt das Modell nicht zur Zuordnung.
+    """
+
+    def error(height, pitch, offset, yaw):
+        projector = NodeProjector(camera=CameraModel(height=height, pitch=pitch, offset=offset))
+        errors = []
+        for (_, standpunkt, ausrichtung, knoten, size), detections in zip(labels, image_detections):
+            letters, uv = projector.expected(standpunkt, ausrichtung + yaw, size)
+            for center, letter in zip(detections.centers, knoten):
+                if letter and letter not in letters:
+                    return np.inf
+                if letter:
+                    errors.append(np.hypot(*(center - uv[letters.index(letter)])))
+        return np.mean(errors) if errors else np.inf
+
+    best = min((error(h, p, o, y), h, p, o, y) for h in np.arange(0.1, 0.6, 0.05) for p in range(10, 50, 3)
+               for o in np.arange(-0.2, 0.8, 0.1) for y in range(-10, 11, 2))
+    for step in (0.02, 0.01):
+        _, h, p, o, y = best
+        deltas = np.arange(-3, 4) * step
+        best = min((error(h + dh, p + dp, o + do, y + dy), h + dh, p + dp, o + do, y + dy)
+                   for dh in deltas for dp in deltas * 50 for do in deltas for dy in deltas * 50)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--labels", default=LABELS_FILE)
+    parser.add_argument("--calibrate", action="store_true", help="Kameramodell auf die Aufnahmen anpassen")
+    parser.add_argument("--image-size", type=int, nargs=2, default=(4096, 1834))
+    parser.add_argument("--noise", type=float, default=0.01, help="Rauschen (Anteil der Bilddiagonale)")
+    parser.add_argument("--drop", type=float, default=0.2, help="Anteil fehlender Knoten")
+    parser.add_argument("--clutter", type=int, default=2, help="höchstens so viele Fehlerkennungen pro Ansicht")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--min-accuracy", type=float, default=0.95)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    labels = load_labels(args.labels)
+    image_detections = [load_detections(os.path.splitext(path)[0] + ".txt") for path, *_ in labels]
+    if args.calibrate:
+        err, height, pitch, offset, yaw = calibrate(labels, image_detections)
+        print(f"CameraModel(height={height:.2f}, pitch={pitch:.1f}, offset={offset:.2f}): "
+              f"mittlerer Fehler {err:.0f}px, Ausrichtung auf den Aufnahmen um {yaw:+.1f}° daneben")
+        return 0
+
+    rng = np.random.default_rng(0)
+    failures = check_linear_assignment(rng, 2000)
+    print(f"linear_assignment: {failures} von 2000 Kostenmatrizen nicht optimal")
+
+    projector = NodeProjector()
+    gate = DEFAULT_MAX_DISTANCE
+    mismatches = 0
+    print(f"Abstand zur erwarteten Position (Anteil der Bilddiagonale, Schwelle {gate:.0%}, ✗ = darüber):")
+    for (path, standpunkt, ausrichtung, knoten, size), detections in zip(labels, image_detections):
+        errors = node_errors(projector, standpunkt, ausrichtung, detections.centers, knoten, size)
+        print(f"  {os.path.basename(path)} (Kalibrierbild): {format_errors(errors, gate)}")
+        result = assign_detections_by_projection(standpunkt, ausrichtung, detections.copy(), size, projector)
+        letters = [""] * len(detections)
+        for index, letter in result.assigned:
+            letters[index] = letter
+        if letters != knoten:
+            mismatches += 1
+            print(f"  ❌ {os.path.basename(path)}: erwartet {knoten}, erhalten {letters}")
+    outside = total_nodes = 0
+    for name, standpunkt, heading, errors in other_views(projector, {path for path, *_ in labels}):
+        outside += sum(error >= gate for error in errors.values())
+        total_nodes += len(errors)
+        print(f"  {name} (Standpunkt {standpunkt}, {heading:.0f}°, Referenz Vorlage): {format_errors(errors, gate)}")
+    if outside:
+        print(f"⚠️ {outside} von {total_nodes} Knoten der übrigen Ansichten über der Schwelle: "
+              "Kameramodell ausserhalb der Kalibrierbilder nicht validiert")
+
+    # Synthetische Ansichten
+    image_size = tuple(args.image_size)
+    _, precompute_ms = time_call(lambda: NodeProjector().precompute(image_size), repeat=3)
+    correct = total = missing_ok = views = 0
+    for _ in range(args.rounds):
+        for node, heading, centers, truth, dropped in synthetic_views(projector, rng, image_size, args.noise,
+                                                                      args.drop, args.clutter):
+            result = projector.match(centers, node, heading, image_size)
+            letters = [""] * len(truth)
+            for index, letter in result.assigned:
+                letters[index] = letter
+            correct += sum(a == b for a, b in zip(letters, truth) if b)
+            total += sum(1 for b in truth if b)
+            missing_ok += sorted(result.missing) == dropped
+            views += 1
+    accuracy = correct / max(total, 1)
+
+    # Zeit pro Frame gegenüber den Vorlagen (ViewpointAssignment)
+    timings = {"Vorlage": [], "Projektion": []}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for (_, standpunkt, ausrichtung, _, size), detections in zip(labels, image_detections):
+            _, ms = time_call(lambda: assign_detections(standpunkt, detections.copy(), size), repeat=args.repeat)
+            timings["Vorlage"].extend(ms)
+            _, ms = time_call(lambda: assign_detections_by_projection(standpunkt, ausrichtung, detections.copy(),
+                                                                      size, projector), repeat=args.repeat)
+            timings["Projektion"].extend(ms)
+
+    print(f"{len(labels)} echte Aufnahmen, {mismatches} abweichend")
+    print(f"{views} synthetische Ansichten: {accuracy:.1%} der Knoten richtig, "
+          f"fehlende Knoten in {missing_ok / max(views, 1):.1%} der Ansichten genau gemeldet")
+    print(f"Vorberechnung aller Standpunkte/Ausrichtungen: {statistics.median(precompute_ms):.1f}ms")
+    for name, ms in timings.items():
+        if ms:
+            print(f"  {name}: {statistics.median(ms) * 1000:6.1f}µs pro Zuordnung")
+
+    if failures or mismatches or accuracy < args.min_accuracy:
+        print("❌ Zuordnung über die Projektion fehlerhaft")
+        return 1
+    print("✔ Zuordnung über die Projektion stimmt")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
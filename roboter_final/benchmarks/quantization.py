@@ -0,0 +1,115 @@
+"""
+Genauigkeit, Latenz und Speicher des INT8-Modells gegenüber FP32.
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.quantization --model roboter_final/my_model.pt
+
+Referenz sind die gelabelten Erkennungen (<bild>.txt neben dem Bild), sonst die
+FP32-Ausgabe. Pro Klasse werden Precision/Recall beider Varianten und die Deltas
+INT8 - FP32 ausgegeben. Jede Variante läuft in einem eigenen Prozess, damit der
+Spitzen-RSS vergleichbar ist. Der Bericht wird neben dem INT8-Modell abgelegt und
+vom Recall-Guard in Quantization.check_recall_guard gelesen.
+"""
+import argparse
+import multiprocessing
+import resource
+import statistics
+import sys
+import time
+
+import cv2
+
+from roboter_final.benchmarks.common import (DETECTION_CLASSES, as_tuples, list_images, load_label_file,
+                                             match_detections, merge_stats, precision_recall, time_call)
+from roboter_final.DetectorBackends import onnx_path_for
+from roboter_final.Quantization import (DEFAULT_MAX_RECALL_DROP, check_recall_guard, int8_path_for, is_stale,
+                                        list_calibration_images, quantize_int8, report_path_for, write_report)
+
+
+def _run_variant(model_path, backend, paths, confidence, repeat):
+    from roboter_final.YoloDetector import YoloDetector
+
+    start = time.perf_counter()
+    detector = YoloDetector(model_path, backend=backend)
+    load_time = time.perf_counter() - start
+    results, timings = [], []
+    for path in paths:
+        frame = cv2.imread(path)
+        objects, frame_timings = time_call(detector.detect, frame, confidence, repeat=repeat)
+        results.append(as_tuples(objects))
+        timings.extend(frame_timings)
+    # ru_maxrss ist unter Linux in KiB
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return load_time, results, timings, peak_rss_mb
+
+
+def run_isolated(model_path, backend, paths, confidence, repeat):
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_run_variant, (model_path, backend, paths, confidence, repeat))
+
+
+def class_metrics(references, results, iou):
+    total = {}
+    for ref, result in zip(references, results):
+        merge_stats(total, match_detections(ref, result, iou))
+    return {klasse: precision_recall(entry) for klasse, entry in total.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="Pfad zum .pt- oder FP32-.onnx-Modell")
+    parser.add_argument("--backend", default="onnx", choices=["onnx", "openvino"])
+    parser.add_argument("--images", nargs="*", help="Auswertungsbilder (Standard: Datensatz-Ordner im Repo)")
+    parser.add_argument("--requantize", action="store_true", help="INT8-Modell neu kalibrieren")
+    parser.add_argument("--conf", type=float, default=0.1)
+    parser.add_argument("--iou", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-recall-drop", type=float, default=DEFAULT_MAX_RECALL_DROP)
+    args = parser.parse_args()
+
+    fp32_path = onnx_path_for(args.model)
+    int8_path = int8_path_for(fp32_path)
+    if args.requantize or is_stale(int8_path, fp32_path):
+        quantize_int8(fp32_path, list_calibration_images())
+
+    paths = list_images(args.images)
+    if not paths:
+        print("❌ Keine Bilder gefunden")
+        return 1
+
+    fp32 = run_isolated(fp32_path, args.backend, paths, args.conf, args.repeat)
+    int8 = run_isolated(int8_path, args.backend, paths, args.conf, args.repeat)
+
+    labels = [load_label_file(p) for p in paths]
+    references = [label if label is not None else fp32_result for label, fp32_result in zip(labels, fp32[1])]
+    labelled = sum(label is not None for label in labels)
+    print(f"{len(paths)} Bilder, davon {labelled} mit Labels (Rest: FP32 als Referenz)")
+
+    fp32_metrics = class_metrics(references, fp32[1], args.iou)
+    int8_metrics = class_metrics(references, int8[1], args.iou)
+
+    report = {"model": int8_path, "images": len(paths), "classes": {}}
+    print(f"\n{'Klasse':<8} {'P fp32':>7} {'P int8':>7} {'ΔP':>7} {'R fp32':>7} {'R int8':>7} {'ΔR':>7}")
+    for klasse in DETECTION_CLASSES:
+        p32, r32 = fp32_metrics.get(klasse, (1.0, 1.0))
+        p8, r8 = int8_metrics.get(klasse, (1.0, 1.0))
+        report["classes"][klasse] = {"precision_fp32": p32, "precision_int8": p8, "precision_delta": p8 - p32,
+                                     "recall_fp32": r32, "recall_int8": r8, "recall_delta": r8 - r32}
+        print(f"{klasse:<8} {p32:>7.3f} {p8:>7.3f} {p8 - p32:>+7.3f} {r32:>7.3f} {r8:>7.3f} {r8 - r32:>+7.3f}")
+
+    print(f"\n{'Variante':<8} {'Laden':>8} {'Median':>10} {'Mittel':>10} {'Spitzen-RSS':>12}")
+    for name, (load_time, _, timings, rss) in (("fp32", fp32), ("int8", int8)):
+        report[f"latency_ms_{name}"] = statistics.median(timings)
+        report[f"rss_mb_{name}"] = rss
+        print(f"{name:<8} {load_time:>7.2f}s {statistics.median(timings):>8.1f}ms "
+              f"{statistics.mean(timings):>8.1f}ms {rss:>10.0f}MB")
+
+    write_report(int8_path, fp32_path, report)
+    ok, reasons = check_recall_guard(int8_path, fp32_path, args.max_recall_drop)
+    print(f"\nBericht gespeichert: {report_path_for(int8_path)}")
+    print("✔ INT8-Modell freigegeben" if ok else f"❌ INT8-Modell abgelehnt: {'; '.join(reasons)}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Latenz gegenüber Recall für ROI-Ausschnitt und Eingabegrösse des YoloDetector.
+
+Aufruf (aus dem Repo-Hauptordner):
+    python -m roboter_final.benchmarks.roi --model roboter_final/my_model.pt \
+        --rois full 0,0.3,1,1 0.1,0.4,0.9,1 --imgsz 320 480 640
+
+Referenz sind die gelabelten Erkennungen (<bild>.txt neben dem Bild), sonst das
+Ergebnis auf dem ganzen Frame mit der Standard-Eingabegrösse. Für jede Kombination
+aus ROI und imgsz werden die Median-Latenz sowie der Recall der Punkte
+(point, pointa, pointb, pointc) und aller Klassen ausgegeben. Markiert wird die
+schnellste Einstellung, die noch --min-recall der Punkte findet.
+"""
+import argparse
+import statistics
+import sys
+
+import cv2
+
+from roboter_final.benchmarks.common import (as_tuples, list_images, load_label_file, match_detections,
+                                             merge_stats, time_call)
+from roboter_final.YoloDetector import YoloDetector
+
+POINT_CLASSES = ('point', 'pointa', 'pointb', 'pointc')
+
+
+def parse_roi(text):
+    if text == "full":
+        return None
+    return tuple(float(v) for v in text.split(","))
+
+
+def recall(total, classes=None):
+    tp = sum(entry['tp'] for klasse, entry in total.items() if classes is None or klasse in classes)
+    fn = sum(entry['fn'] for klasse, entry in total.items() if classes is None or klasse in classes)
+    return tp / (tp + fn) if tp + fn else 1.0
+
+
+def run_setting(args, roi, imgsz, frames):
+    detector = YoloDetector(args.model, backend=args.backend, roi=roi, imgsz=imgsz,
+                            warmup_size=frames[0].shape[:2])
+    results, timings = [], []
+    for frame in frames:
+        objects, frame_timings = time_call(detector.detect, frame, args.conf, repeat=args.repeat)
+        results.append(as_tuples(objects))
+        timings.extend(frame_timings)
+    return results, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="Pfad zum .pt-Modell")
+    parser.add_argument("--backend", default="ultralytics", choices=["ultralytics", "onnx", "openvino"])
+    parser.add_argument("--images", nargs="*", help="Bildordner (Standard: Datensatz-Ordner im Repo)")
+    parser.add_argument("--rois", nargs="+", default=["full", "0,0.3,1,1", "0.15,0.4,0.85,1"],
+                        help="'full' oder x1,y1,x2,y2 in Anteilen")
+    parser.add_argument("--imgsz", nargs="+", type=int, default=[320, 416, 512, 640])
+    parser.add_argument("--conf", type=float, default=0.1)
+    parser.add_argument("--iou", type=float, default=0.5)
+    parser.add_argument("--min-recall", type=float, default=0.95, help="Geforderter Recall der Punkte")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = list_images(args.images)
+    if not paths:
+        print("❌ Keine Bilder gefunden")
+        return 1
+    frames = [cv2.imread(p) for p in paths]
+    labels = [load_label_file(p) for p in paths]
+
+    reference_results = None
+    if any(label is None for label in labels):
+        reference_results, _ = run_setting(args, None, None, frames)
+    references = [label if label is not None else reference_results[i] for i, label in enumerate(labels)]
+    print(f"{len(frames)} Bilder, davon {sum(label is not None for label in labels)} mit Labels "
+          f"(Rest: ganzer Frame als Referenz)")
+
+    rows = []
+    for roi_text in args.rois:
+        for imgsz in args.imgsz:
+            results, timings = run_setting(args, parse_roi(roi_text), imgsz, frames)
+            total = {}
+            for ref, result in zip(references, results):
+                merge_stats(total, match_detections(ref, result, args.iou))
+            rows.append((roi_text, imgsz, statistics.median(timings), recall(total, POINT_CLASSES), recall(total)))
+
+    rows.sort(key=lambda row: row[2])
+    best = next((row for row in rows if row[3] >= args.min_recall), None)
+    print(f"\n{'ROI':<20} {'imgsz':>6} {'Median':>10} {'Recall Punkte':>14} {'Recall alle':>12}")
+    for row in rows:
+        marker = "  ⬅ günstigste" if row is best else ""
+        print(f"{row[0]:<20} {row[1]:>6} {row[2]:>8.1f}ms {row[3]:>14.3f} {row[4]:>12.3f}{marker}")
+
+    if best is None:
+        print(f"\n❌ Keine Einstellung erreicht Recall {args.min_recall:.2f} für die Punkte")
+        return 1
+    roi_env = "" if best[0] == "full" else best[0]
+    print(f"\n✔ Empfehlung: DETECTOR_ROI={roi_env} DETECTOR_IMGSZ={best[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,22 @@
+import functools
+import os
+
 import cv2
 import numpy as np
-import os
+
+# Liste mit den zwei spezifischen Farben, die entfernt werden
+DEFAULT_BGR_COLORS = [
+    (135, 115, 100),    # BGR für RGB(109, 125, 148)
+    (51, 59, 76)         # BGR für RGB(76, 59, 51)
+]
+# Viel kleinere, sinnvollere Standard-Toleranz
+DEFAULT_TOL = 95
+# Pixel, deren Kanäle alle über WHITE_THRESHOLD liegen, bekommen den weicheren Farbton SOFT_WHITE
+WHITE_THRESHOLD = 250
+SOFT_WHITE = (231, 252, 254)
+_MAX_LUT_COLORS = 7  # Bit 7 ist für WHITE_THRESHOLD reserviert
+# Graustufen-Gewichte (B, G, R) / 2^15 wie cv2.imread(..., IMREAD_GRAYSCALE) beim Laden eines PNG
+_PNG_GRAY_WEIGHTS = np.array([[3737, 19234, 9797]], dtype=np.float32) / 32768
 
 
 def replace_colors_with_white(img, bgr_colors, tol):
@@ -8,6 +24,74 @@ def replace_colors_with_white(img, bgr_colors, tol):
     Ersetzt zuerst reine Weißpixel mit einem weicheren Farbton,
     dann ersetzt die angegebenen Farben durch echtes Weiß.
 
+    Gleiches Ergebnis wie replace_colors_with_white_reference, aber über eine einmal pro
+    (Farben, Toleranz) gebaute Lookup-Tabelle statt einem Durchlauf pro Farbe.
+
+    Args:
+        img: Das Eingabebild (BGR-Format von OpenCV).
+        bgr_colors: Eine LISTE von zu entfernenden Farben,
+                    jedes als BGR-Tupel (Blau, Grün, Rot).
+        tol: Die Toleranz, wie stark andere Farben abweichen dürfen.
+
+    Returns:
+        Ein neues Bild im BGR-Format, bei dem die Farben durch Weiß ersetzt wurden.
+    """
+    colors = tuple(tuple(int(v) for v in color) for color in bgr_colors)
+    if len(colors) > _MAX_LUT_COLORS or img.ndim != 3 or img.shape[2] != 3:
+        return replace_colors_with_white_reference(img, bgr_colors, tol)
+    channel_lut, soft_lut, white_lut = _color_luts(colors, int(tol))
+
+    # Pro Kanal ein Bitmuster (Bit i: im Bereich von Farbe i, Bit 7: > WHITE_THRESHOLD),
+    # UND über die drei Kanäle ergibt, welche Bedingungen für das ganze Pixel gelten
+    blue, green, red = cv2.split(cv2.LUT(img, channel_lut))
+    code = cv2.bitwise_and(cv2.bitwise_and(blue, green), red)
+    soft_mask = cv2.LUT(code, soft_lut)
+    white_mask = cv2.LUT(code, white_lut)
+
+    result_img = img.copy()
+    cv2.bitwise_and(result_img, (0, 0, 0, 0), dst=result_img, mask=soft_mask)
+    cv2.bitwise_or(result_img, SOFT_WHITE + (0,), dst=result_img, mask=soft_mask)
+    cv2.bitwise_or(result_img, (255, 255, 255, 0), dst=result_img, mask=white_mask)
+    return result_img
+
+
+@functools.lru_cache(maxsize=8)
+def _color_luts(colors, tol):
+    """
+    Lookup-Tabellen für replace_colors_with_white.
+
+    Returns:
+        (channel_lut (256, 1, 3), soft_lut (256,), white_lut (256,)) - soft_lut/white_lut bilden
+        das UND-verknüpfte Bitmuster auf 255 ab, wenn das Pixel weich bzw. weiß wird.
+    """
+    values = np.arange(256)
+    channel_lut = np.zeros((256, 1, 3), dtype=np.uint8)
+    lowers = [np.clip(np.array(color) - tol, 0, 255) for color in colors]
+    uppers = [np.clip(np.array(color) + tol, 0, 255) for color in colors]
+    for channel in range(3):
+        bits = (values > WHITE_THRESHOLD).astype(np.uint8) << 7
+        for i, (lower, upper) in enumerate(zip(lowers, uppers)):
+            bits |= ((values >= lower[channel]) & (values <= upper[channel])).astype(np.uint8) << i
+        channel_lut[:, 0, channel] = bits
+
+    # Der weiche Farbton wird im Original selbst noch gegen die Farbbereiche geprüft
+    soft_is_removed = any(np.all((np.array(SOFT_WHITE) >= lower) & (np.array(SOFT_WHITE) <= upper))
+                          for lower, upper in zip(lowers, uppers))
+    is_white = (values & 0x80) != 0
+    in_color_range = (values & 0x7F) != 0
+    soft_lut = np.where(is_white & (not soft_is_removed), 255, 0).astype(np.uint8)
+    white_lut = np.where((~is_white & in_color_range) | (is_white & soft_is_removed), 255, 0).astype(np.uint8)
+    return channel_lut, soft_lut, white_lut
+
+
+def replace_colors_with_white_reference(img, bgr_colors, tol):
+    """
+    Ursprüngliche Umsetzung (mehrere Durchläufe über das ganze Bild), dient als Referenz
+    für replace_colors_with_white und benchmarks/color_removal.py.
+
+    Ersetzt zuerst reine Weißpixel mit einem weicheren Farbton,
+    dann ersetzt die angegebenen Farben durch echtes Weiß.
+
     Args:
         img: Das Eingabebild (BGR-Format von OpenCV).
         bgr_colors: Eine LISTE von zu entfernenden Farben,
@@ -20,8 +104,8 @@ def replace_colors_with_white(img, bgr_colors, tol):
 
     # 1️⃣ Reines Weiß (255,255,255) zuerst durch soften Farbton ersetzen
     result_img = img.copy()
-    white_pixels = np.all(result_img > 250, axis=-1)
-    result_img[white_pixels] = [231,252,254]  # weichere Farbe
+    white_pixels = np.all(result_img > WHITE_THRESHOLD, axis=-1)
+    result_img[white_pixels] = SOFT_WHITE  # weichere Farbe
 
     # 2️⃣ Maske aufbauen für alle Ziel-Farben
     master_mask = np.zeros(result_img.shape[:2], dtype=np.uint8)
@@ -39,16 +123,21 @@ def replace_colors_with_white(img, bgr_colors, tol):
     return result_img
 
 
-def process_image(input_path: str,
-                  # NEU: Liste mit deinen zwei spezifischen Farben
-                  bgr_colors=[
-                      (135, 115, 100),    # BGR für RGB(109, 125, 148)
-                      (51, 59, 76)         # BGR für RGB(76, 59, 51)
-                  ],
-                  # NEU: Viel kleinere, sinnvollere Standard-Toleranz
-                  tol=95):
+def to_gray(img):
+    """
+    BGR -> Graustufen, pixelgenau wie das frühere Speichern als bearbeitet_*.png und
+    Wiedereinlesen mit cv2.IMREAD_GRAYSCALE (cv2.cvtColor rundet anders und weicht um 1 ab).
+    """
+    if img.ndim == 2:
+        return img
+    return cv2.transform(img.astype(np.float32), _PNG_GRAY_WEIGHTS).astype(np.uint8)
+
+
+def process_image(input_path: str, bgr_colors=DEFAULT_BGR_COLORS, tol=DEFAULT_TOL, return_gray=False,
+                  debug_sink=None):
     """
     Liest ein Bild, ruft die Funktion zum Ersetzen der Farben auf und speichert das Ergebnis.
+    Mit return_gray=True siehe process_frame.
     """
     if not os.path.isfile(input_path):
         print(f"❌ Datei nicht gefunden: {input_path}")
@@ -59,12 +148,35 @@ def process_image(input_path: str,
         print("❌ Fehler beim Einlesen des Bildes!")
         return
 
-    resultat = replace_colors_with_white(img, bgr_colors, tol)
+    return process_frame(img, input_path, bgr_colors, tol, return_gray, debug_sink)
+
 
+def processed_path_for(input_path: str):
     input_dir, input_file = os.path.split(input_path)
     name, ext = os.path.splitext(input_file)
+    return os.path.join(input_dir, f"bearbeitet_{name}.png")
+
+
+def process_frame(img, input_path: str, bgr_colors=DEFAULT_BGR_COLORS, tol=DEFAULT_TOL, return_gray=False,
+                  debug_sink=None):
+    """
+    Wie process_image, aber für einen bereits dekodierten Frame (BGR). input_path
+    bestimmt nur den Namen der Ausgabedatei (bearbeitet_<name>.png daneben).
+
+    Args:
+        return_gray: Das Graustufenbild für CheckConnection direkt zurückgeben, statt es zu
+                     speichern und den Pfad zurückzugeben.
+        debug_sink: Nur mit return_gray: BackgroundWriter, der bearbeitet_<name>.png im
+                    Hintergrund schreibt. None = kein Debug-Bild.
+    """
+    resultat = replace_colors_with_white(img, bgr_colors, tol)
+
+    output_path = processed_path_for(input_path) if input_path else None
 
-    output_path = os.path.join(input_dir, f"bearbeitet_{name}.png")
+    if return_gray:
+        if debug_sink is not None and output_path:
+            debug_sink.submit(cv2.imwrite, output_path, resultat)
+        return to_gray(resultat)
 
     if cv2.imwrite(output_path, resultat):
         print(f"✔ Ergebnis mit weiß ersetzten Farben gespeichert unter: {output_path}")
@@ -3,9 +3,12 @@ import RPi.GPIO as GPIO
 
 from roboter_final import communication
 from roboter_final.get_picture import capture_picture_from_api, capture_picture_from_cv2
-from roboter_final.YoloDetector import YoloDetector
+from roboter_final.YoloDetector import get_detector
+from roboter_final.BackgroundWriter import BackgroundWriter
+from roboter_final.DetectionCache import DetectionCache
+from roboter_final.Perception import PerceptionStage
+from roboter_final.VisualizationSink import VisualizationSink
 
-from roboter_final import lineDetection
 import os
 from roboter_final.CheckConection import  CheckConnection
 from roboter_final.Graph.Graph import Graph
@@ -15,9 +18,25 @@ START_NODE = "E"
 TARGET_NODES = ["A", "B", "C"]
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_PATH = os.path.join(BASE_DIR, "my_model.pt")
-TXT_PATH = os.path.join(BASE_DIR, "dataset", "detected_objects.txt")
+# "ultralytics", "onnx" oder "openvino" (siehe DetectorBackends)
+DETECTOR_BACKEND = os.getenv("DETECTOR_BACKEND", "ultralytics")
+# "fp32" oder "int8" (nur mit onnx/openvino, siehe Quantization)
+DETECTOR_PRECISION = os.getenv("DETECTOR_PRECISION", "fp32")
+# Bildausschnitt für YOLO als "x1,y1,x2,y2" in Anteilen (z.B. "0,0.3,1,1"), leer = ganzer Frame
+DETECTOR_ROI = tuple(float(v) for v in os.getenv("DETECTOR_ROI", "").split(",")) if os.getenv("DETECTOR_ROI") else None
+# Eingabegrösse des Modells, leer = Standard des Backends (siehe benchmarks/roi.py)
+DETECTOR_IMGSZ = int(os.getenv("DETECTOR_IMGSZ")) if os.getenv("DETECTOR_IMGSZ") else None
+DETECTIONS_PATH = os.path.join(BASE_DIR, "dataset", "detected_objects.det")
 PICTURES = os.path.join(BASE_DIR, "dataset")
 FLAGS = []
+# bearbeitet_*.png pro Knoten im Hintergrund speichern (nur zum Debuggen, CheckConnection braucht sie nicht)
+SAVE_DEBUG_IMAGES = os.getenv("SAVE_DEBUG_IMAGES", "0") == "1"
+# Analyse-Bilder im Hintergrund zeichnen: jedes n-te (0 = aus), oder nur Status 0/3
+VISUALIZE_EVERY_NTH = int(os.getenv("VISUALIZE_EVERY_NTH", "0"))
+VISUALIZE_ONLY_FAILURES = os.getenv("VISUALIZE_ONLY_FAILURES", "0") == "1"
+VISUALIZATION_DIR = os.path.join(BASE_DIR, "dataset", "analyse")
+# Wiederholungsaufnahmen am selben Knoten (nach Status 0/3) ohne neue Inferenz
+DETECTION_CACHE = DetectionCache(max_distance=int(os.getenv("DETECTION_CACHE_MAX_DISTANCE", "6")))
 
 def reset_tof():
     GPIO.setmode(GPIO.BCM)
@@ -29,12 +48,19 @@ def reset_tof():
         time.sleep(1)
 
 
-def detect_objects(image_path: str):
-    detector = YoloDetector(MODEL_PATH)
-    print(detector)
-    objects = detector.detect_and_save(image_path=image_path,save_path=TXT_PATH)
+def detect_objects(frame, writer: BackgroundWriter = None, view=None):
+    """
+    Erkennt die Objekte im bereits dekodierten Frame (als Detections-Tabelle). Die .det-Datei wird nur
+    geschrieben, wenn ein BackgroundWriter übergeben wird, und dann im Hintergrund.
+    Fast gleiche Ansichten vom selben Standpunkt (view = (Knoten, Ausrichtung)) werden aus dem
+    DETECTION_CACHE beantwortet.
+    """
+    detector = get_detector(MODEL_PATH, backend=DETECTOR_BACKEND, precision=DETECTOR_PRECISION,
+                            roi=DETECTOR_ROI, imgsz=DETECTOR_IMGSZ)
+    objects = DETECTION_CACHE.detect(detector, frame, as_table=True, view=view)
     print(objects)
-    detector.save_to_txt(objects, TXT_PATH)
+    if writer is not None:
+        writer.submit(detector.save_detections, objects.copy(), DETECTIONS_PATH)
     return objects
 
 
@@ -78,6 +104,17 @@ def align_with_next_edge(graph:Graph, current_orientation:float):
 def traverse_graph():
     target_node = communication.read_position()
     #camera = Camera()
+    # Modell einmal laden und aufwärmen, solange wir noch auf den Start warten
+    get_detector(MODEL_PATH, backend=DETECTOR_BACKEND, precision=DETECTOR_PRECISION,
+                 roi=DETECTOR_ROI, imgsz=DETECTOR_IMGSZ)
+    writer = BackgroundWriter()
+    # Cache nur innerhalb desselben Standpunkts (graph/current_orientation werden beim Aufruf gelesen)
+    perception = PerceptionStage(lambda frame: detect_objects(frame, writer,
+                                                              (graph.current_node.name, round(current_orientation))),
+                                 debug_sink=writer if SAVE_DEBUG_IMAGES else None)
+    visualization = (VisualizationSink(VISUALIZATION_DIR, every_nth=VISUALIZE_EVERY_NTH or 1,
+                                       only_failures=VISUALIZE_ONLY_FAILURES)
+                     if VISUALIZE_EVERY_NTH or VISUALIZE_ONLY_FAILURES else None)
     graph: Graph = Graph(target_node)
     print(graph.nodes[target_node])
 
@@ -90,27 +127,45 @@ def traverse_graph():
     time.sleep(1)
     print("🚦 Start empfangen – Traversierung beginnt")
     communication.special_command(0,50,0)
+    # Ergebnis der letzten Aufnahme nach Status 0/3: bleiben Knoten und Ausrichtung gleich, zeigt
+    # eine neue Aufnahme dasselbe Bild und check_connection käme zum selben Ergebnis. Nach einer
+    # Drehung wird immer neu aufgenommen, die Kandidaten im alten Bild lassen sich ohne
+    # validiertes Kameramodell (NodeProjection) keiner anderen Kante sicher zuordnen.
+    last_view = None  # (Knoten, line_status, direction)
     while graph.current_node != graph.target_node:
         print(graph.current_node)
 
 
 
+        previous_orientation = current_orientation
         next_node, current_orientation = align_with_next_edge(graph, current_orientation)
+        turned = abs((current_orientation - previous_orientation + 180) % 360 - 180) >= 5
 
         print(f"📍 Aktueller Punkt: {graph.current_node}")
 
-        #image_path = camera.capture(os.path.join(PICTURES, f"{graph.current_node.name}.jpg"))
-        image_path = capture_picture_from_api(os.path.join(PICTURES, f"{graph.current_node.name}.jpg"))
+        if last_view is not None and last_view[0] == graph.current_node and not turned:
+            line_status, direction = last_view[1:]
+            print(f"♻️ Gleiche Ansicht wie die letzte Aufnahme, Ergebnis für {next_node} ohne neue Aufnahme")
+        else:
+            #image_path = camera.capture(os.path.join(PICTURES, f"{graph.current_node.name}.jpg"))
+            image_path = capture_picture_from_api(os.path.join(PICTURES, f"{graph.current_node.name}.jpg"))
 
 
-        print(image_path)
-        objects = detect_objects(image_path)
-        processed_image_path: str = lineDetection.process_image(image_path)
-        print(objects)
+            print(image_path)
+            # Erkennung und Farbentfernung laufen gleichzeitig auf demselben Frame
+            result = perception.run(image_path)
+            objects = result.objects
+            print(result)
 
-        check_connection = CheckConnection(processed_image_path,objects)
-        line_status = check_connection.check_connection()
-        direction = check_connection.get_turn_direction()
+            check_connection = CheckConnection(result.line_image, objects)
+            line_status = check_connection.check_connection()
+            direction = check_connection.get_turn_direction()
+            last_view = (graph.current_node, line_status, direction)
+            if visualization is not None:
+                visualization.submit(graph.current_node.name, check_connection, line_status)
+
+        if line_status in (1, 2):
+            last_view = None
 
         print(line_status)
         if line_status == 0:
@@ -143,6 +198,11 @@ def traverse_graph():
 
     print(f"🎉 Ziel erreicht: {graph.current_node}")
     communication.flash_led(5, 1)
+    print(f"Detection-Cache: {DETECTION_CACHE.stats()}")
+    perception.close()
+    writer.close()
+    if visualization is not None:
+        visualization.close()
     camera.close()
 
 def main():
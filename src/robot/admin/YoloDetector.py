@@ -1,7 +1,11 @@
 # object_detector.py (trimmed down)
 
 import os
+import threading
+import time
+
 import cv2
+import numpy as np
 from ultralytics import YOLO
 from camera_client import capture_picture_from_api
 
@@ -34,9 +38,30 @@ class Objekt:
 
 
 class YoloDetector:
-    def __init__(self, model_path):
+    def __init__(self, model_path, warmup=True, warmup_size=(720, 1280)):
+        self.model_path = model_path
+        start = time.perf_counter()
         self.model = YOLO(model_path)
         self.labels = self.model.names
+        self.load_time = time.perf_counter() - start
+        self.warmup_time = None
+
+        if warmup:
+            self.warmup(warmup_size)
+
+    def __repr__(self):
+        warmup_info = f"{self.warmup_time:.2f}s" if self.warmup_time is not None else "-"
+        return (f"YoloDetector(model='{os.path.basename(self.model_path)}', "
+                f"load={self.load_time:.2f}s, warmup={warmup_info})")
+
+    def warmup(self, frame_size=(720, 1280)):
+        # Erste Inferenz auf einem leeren Frame, damit der Graph-Aufbau nicht beim ersten Bild anfällt
+        height, width = frame_size
+        dummy_frame = np.zeros((height, width, 3), dtype=np.uint8)
+        start = time.perf_counter()
+        self.model(dummy_frame, verbose=False)
+        self.warmup_time = time.perf_counter() - start
+        return self.warmup_time
 
     def detect(self, image_path, confidence_threshold=0.3):
         if not os.path.exists(image_path):
@@ -69,3 +94,19 @@ class YoloDetector:
         objects = self.detect(image_path, confidence_threshold)
         self.save_to_txt(objects, save_path)
         return objects
+
+
+_shared_detectors = {}
+_shared_detectors_lock = threading.Lock()
+
+
+def get_detector(model_path, warmup=True):
+    # Ein geladenes und aufgewärmtes Modell pro Pfad, für die ganze Laufzeit des Prozesses
+    key = os.path.abspath(model_path)
+    with _shared_detectors_lock:
+        detector = _shared_detectors.get(key)
+        if detector is None:
+            detector = YoloDetector(model_path, warmup=warmup)
+            _shared_detectors[key] = detector
+            print(f"Detector bereit: {detector}")
+        return detector
@@ -9,7 +9,9 @@ import cv2
 import numpy as np
 import time
 import Matrix
+from YoloDetector import get_detector
 
+MODEL_PATH = "yoloModels/my_model.pt"
 
 
 def test(uart_command):
@@ -21,19 +23,17 @@ def test(uart_command):
 
 
 def process():
+    # Modell laden und aufwärmen, bevor auf den Start gewartet wird
+    detector = get_detector(MODEL_PATH)
     communication.wait_for_start()
     image_path = capture_picture_from_api()
 
 
     processed_image_path = process_image(image_path)
 
-    model_path = "yoloModels/my_model.pt"
+    txt_path = "/tmp/detected_objects.txt"
+    detected_objects = detector.detect_and_save(image_path, save_path=txt_path)
 
-    detector = YoloDetector(model_path)
-
-    detected_objects = detector.detect_and_save(image_path)
-
-    detector.save_to_txt(detected_objects, "/tmp/detected_objects.txt")
     Matrix.build_matrix_from_detection(txt_path, processed_image_path)
 
     # Example image processing
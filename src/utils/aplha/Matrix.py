@@ -1,9 +1,109 @@
 from sympy.strategies.core import switch
-import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
+import atexit
 import os
+from concurrent.futures import ProcessPoolExecutor
 from itertools import combinations
+from multiprocessing import shared_memory
+
+from roboter_final.FrameContext import FrameContext
+from roboter_final.Geometry import segments_hit_rects
+from roboter_final.MatrixJournal import MatrixJournal, MatrixState
+from roboter_final.ViewpointAssignment import VIEWPOINT_TEMPLATES, assign_objects
+
+DATASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Dataset")
+MATRIX_DIR = os.path.join(DATASET_DIR, "Matrix")
+
+# Aktuelle 8x8-Matrix im Speicher. Ein Journal hängt erst nach open_matrix_journal an, damit
+# Importe, Benchmarks und Batch-Läufe nichts im Quellordner anlegen
+CURRENT_MATRIX = MatrixState()
+# Umgebungsvariable für den Journal-Pfad, falls open_matrix_journal keinen bekommt
+MATRIX_JOURNAL_ENV = "MATRIX_JOURNAL"
+DEFAULT_MATRIX_JOURNAL = os.path.join(MATRIX_DIR, "Currentmatrix.mxj")
+
+# Mindestgrösse für den Prozess-Pool in create_adjacency_matrix (4608x2592 ~ 12 MP). Geschätzt,
+# nicht gemessen: auf einer Maschine mit mehreren Kernen mit benchmarks/matrix_parallel.py prüfen
+PARALLEL_MIN_PIXELS = 8_000_000
+
+# Prozess-Pool für die Balken-Auswertung, wird beim ersten Gebrauch gestartet, wiederverwendet
+# und beim Beenden des Programms (oder mit einer anderen Anzahl Worker) heruntergefahren.
+# Dazu ein Shared-Memory-Block für das Bild, der bleibt, solange das Bild hineinpasst.
+_kanten_pool = None
+_kanten_pool_workers = 0
+_kanten_shm = None
+
+
+def _kanten_pool_holen(workers):
+    global _kanten_pool, _kanten_pool_workers
+    if _kanten_pool is None or _kanten_pool_workers != workers:
+        _kanten_pool_beenden()
+        _kanten_pool = ProcessPoolExecutor(max_workers=workers)
+        _kanten_pool_workers = workers
+    return _kanten_pool
+
+
+def _kanten_pool_beenden():
+    global _kanten_pool, _kanten_pool_workers, _kanten_shm
+    if _kanten_pool is not None:
+        _kanten_pool.shutdown()
+        _kanten_pool, _kanten_pool_workers = None, 0
+    if _kanten_shm is not None:
+        _kanten_shm.close()
+        _kanten_shm.unlink()
+        _kanten_shm = None
+
+
+def _kanten_bild_teilen(gray):
+    """Kopiert gray in den Shared-Memory-Block des Pools; neu angelegt wird er nur für grössere Bilder."""
+    global _kanten_shm
+    if _kanten_shm is None or _kanten_shm.size < gray.nbytes:
+        if _kanten_shm is not None:
+            _kanten_shm.close()
+            _kanten_shm.unlink()
+        _kanten_shm = shared_memory.SharedMemory(create=True, size=max(1, gray.nbytes))
+    np.ndarray(gray.shape, dtype=gray.dtype, buffer=_kanten_shm.buf)[...] = gray
+    return _kanten_shm.name, gray.shape, gray.dtype.str
+
+
+atexit.register(_kanten_pool_beenden)
+
+
+def open_matrix_journal(path=None):
+    """
+    Hängt ab jetzt jede Änderung von CURRENT_MATRIX im Hintergrund an ein Journal an
+    (python -m roboter_final.MatrixJournal <Pfad> zeigt frühere Stände).
+
+    Args:
+        path: Journal-Datei; ohne aus der Umgebungsvariable MATRIX_JOURNAL, sonst
+            DEFAULT_MATRIX_JOURNAL.
+
+    Returns:
+        Das verwendete MatrixJournal.
+    """
+    path = path or os.getenv(MATRIX_JOURNAL_ENV) or DEFAULT_MATRIX_JOURNAL
+    journal = CURRENT_MATRIX.journal
+    if journal is None or os.path.abspath(journal.path) != os.path.abspath(path):
+        if journal is not None:
+            journal.flush()
+        CURRENT_MATRIX.journal = MatrixJournal(path)
+    return CURRENT_MATRIX.journal
+
+
+# Im Pool-Prozess: zuletzt angehängter Shared-Memory-Block, bleibt bis zu einem neuen Block offen
+_worker_shm = None
+
+
+def _kanten_worker(bild, paare, parameter):
+    """Wertet einen Teil der Balken im Pool aus; bild ist (name, shape, dtype) des Shared Memory."""
+    global _worker_shm
+    name, shape, dtype = bild
+    if _worker_shm is None or _worker_shm.name != name:
+        if _worker_shm is not None:
+            _worker_shm.close()
+        _worker_shm = shared_memory.SharedMemory(name=name)
+    gray = np.ndarray(shape, dtype=dtype, buffer=_worker_shm.buf)
+    return [Objekt._balken_zaehler(gray, p1, p2, *parameter) for p1, p2 in paare]
 
 
 class Objekt:
@@ -55,7 +155,7 @@ class Objekt:
         if image_path:
             base_dir = os.path.dirname(image_path)
         else:
-            base_dir = os.path.join(os.path.dirname(os.path.dirname("dummy_path.jpg")), "Dataset")
+            base_dir = DATASET_DIR
 
         log_path = os.path.join(base_dir, "Matrix/barrier_assignments.txt")
 
@@ -115,8 +215,10 @@ class Objekt:
 
         Args:
             objekte_liste: Liste der Objekte
-            image_path: Pfad zum aktuellen Bild
+            image_path: Pfad zum aktuellen Bild oder FrameContext
         """
+        if isinstance(image_path, FrameContext):
+            image_path = image_path.image_path
         for obj in objekte_liste:
             obj._current_image_path = image_path
 
@@ -125,12 +227,18 @@ class Objekt:
 
 
     @staticmethod
-    def create_adjacency_matrix(objekte_liste, connection_image_path, connection_threshold=0.15, bar_width=10):
+    def create_adjacency_matrix(objekte_liste, connection_image_path, connection_threshold=0.15, bar_width=10,
+                                workers=1, parallel_min_pixels=PARALLEL_MIN_PIXELS):
         """Erstellt eine Adjazenzmatrix mit Analyse eines breiten Balkens zwischen Punkten.
         Ergänzt automatisch den Punkt, auf dem der Roboter steht (aus Bildname), falls nicht sichtbar.
-        Speichert die Matrix in eine Datei unter Dataset/Matrix/Currentmatrix.txt."""
+
+        Mit workers > 1 werden die Balken in einem Prozess-Pool ausgewertet (Bild im Shared Memory),
+        aber nur ab parallel_min_pixels Bildpunkten; darunter und mit workers=1 seriell.
+        Die Matrix ist in beiden Fällen gleich.
+
+        connection_image_path darf auch ein FrameContext sein; dann wird das Bild nicht erneut
+        gelesen, und die Graustufen bleiben für die weiteren Schritte im Kontext."""
         import re
-        import os
 
         # Buchstaben-Liste für das Original-Schema
         buchstaben = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
@@ -152,15 +260,13 @@ class Objekt:
         vorhandene_buchstaben = sorted(list(punkt_dict.keys()))
         print("Vorhandene Buchstaben (vor Ergänzung):", vorhandene_buchstaben)
 
-        # Bild laden, um Höhe/Breite zu bekommen
-        connection_image = cv2.imread(connection_image_path)
-        if connection_image is None:
-            raise FileNotFoundError(f"Verbindungsbild nicht gefunden: {connection_image_path}")
-        gray = cv2.cvtColor(connection_image, cv2.COLOR_BGR2GRAY)
+        # Bild laden (nur ohne FrameContext), um Höhe/Breite zu bekommen
+        frame = FrameContext.of(connection_image_path)
+        gray = frame.gray
         image_height, image_width = gray.shape
 
         # Extrahiere Roboterbuchstaben aus Dateiname
-        match = re.search(r'_([A-Ha-h])(?:\.|_|\b)', os.path.basename(connection_image_path))
+        match = re.search(r'_([A-Ha-h])(?:\.|_|\b)', frame.name)
         roboter_buchstabe = match.group(1).upper() if match else None
 
         # Ergänze nur den geschätzten Punkt, falls er fehlt
@@ -184,7 +290,8 @@ class Objekt:
         # Mapping zu Original-Indizes
         buchstaben_zu_original_index = {b: buchstaben.index(b) for b in vorhandene_buchstaben if b in buchstaben}
 
-        # Verbindungsanalyse
+        # Verbindungsanalyse: erst alle zu prüfenden Kanten sammeln, dann seriell oder im Pool auswerten
+        kanten = []
         for i, b1 in enumerate(vorhandene_buchstaben):
             for j, b2 in enumerate(vorhandene_buchstaben):
                 if i >= j:
@@ -200,44 +307,106 @@ class Objekt:
                 p1 = (int(punkt1.zentrum[0]), int(punkt1.zentrum[1]))
                 p2 = (int(punkt2.zentrum[0]), int(punkt2.zentrum[1]))
 
-                dx = p2[0] - p1[0]
-                dy = p2[1] - p1[1]
-                length = max(1, int(np.sqrt(dx * dx + dy * dy)))
-                if dx == 0 and dy == 0:
+                if p1 == p2:
                     continue
 
-                nx = -dy / length
-                ny = dx / length
-
-                non_white_count = 0
-                total_pixels = 0
-
-                for t in range(length):
-                    x = int(p1[0] + t * dx / length)
-                    y = int(p1[1] + t * dy / length)
-                    for w in range(-bar_width // 2, bar_width // 2 + 1):
-                        wx = int(x + w * nx)
-                        wy = int(y + w * ny)
-                        if 0 <= wx < gray.shape[1] and 0 <= wy < gray.shape[0]:
-                            total_pixels += 1
-                            if gray[wy, wx] < 245:
-                                non_white_count += 1
-
-                if total_pixels == 0:
-                    print(f"Warnung: Keine Pixel im Balken zwischen {b1}-{b2}")
-                    continue
+                kanten.append((i, j, b1, b2, p1, p2))
 
-                connection_ratio = non_white_count / total_pixels
-                if connection_ratio >= connection_threshold:
-                    adjacency_matrix[i][j] = 1
-                    adjacency_matrix[j][i] = 1
-                    print(f"Verbindung bestätigt: {b1}-{b2} (Ratio: {connection_ratio:.2f})")
-                else:
-                    print(f"Keine Verbindung: {b1}-{b2} (Ratio: {connection_ratio:.2f})")
+        parameter = (bar_width,)
+        paare = [(p1, p2) for _, _, _, _, p1, p2 in kanten]
+        if workers > 1 and len(paare) > 1 and gray.size >= parallel_min_pixels:
+            zaehler = Objekt._kanten_parallel(gray, paare, parameter, workers)
+        else:
+            zaehler = [Objekt._balken_zaehler(gray, p1, p2, *parameter) for p1, p2 in paare]
+
+        # Ergebnisse in der Reihenfolge der Kanten übernehmen, unabhängig davon, wer sie gerechnet hat
+        for (i, j, b1, b2, _, _), (non_white_count, total_pixels) in zip(kanten, zaehler):
+            if total_pixels == 0:
+                print(f"Warnung: Keine Pixel im Balken zwischen {b1}-{b2}")
+                continue
+
+            connection_ratio = non_white_count / total_pixels
+            if connection_ratio >= connection_threshold:
+                adjacency_matrix[i][j] = 1
+                adjacency_matrix[j][i] = 1
+                print(f"Verbindung bestätigt: {b1}-{b2} (Ratio: {connection_ratio:.2f})")
+            else:
+                print(f"Keine Verbindung: {b1}-{b2} (Ratio: {connection_ratio:.2f})")
 
 
         return adjacency_matrix, vorhandene_buchstaben
 
+    @staticmethod
+    def _balken_zaehler(gray, p1, p2, bar_width):
+        """Zählt die Pixel eines Balkens für create_adjacency_matrix: (nicht-weisse Pixel, Pixel im Balken)."""
+        werte = Objekt._balken_werte(gray, p1, p2, bar_width)
+        return int(np.count_nonzero(werte < 245)), werte.size
+
+    @staticmethod
+    def _kanten_parallel(gray, paare, parameter, workers):
+        """
+        Verteilt die Balken auf den Prozess-Pool. Das Bild wird in den Shared-Memory-Block des
+        Pools kopiert, jeder Prozess bekommt nur Namen und Form; die Ergebnisse kommen in der
+        Reihenfolge von paare zurück.
+        """
+        pool = _kanten_pool_holen(workers)
+        bild = _kanten_bild_teilen(gray)
+        teile = [paare[k::workers] for k in range(workers) if paare[k::workers]]
+        ergebnisse = [future.result() for future in
+                      [pool.submit(_kanten_worker, bild, teil, parameter) for teil in teile]]
+
+        # Zurück in die ursprüngliche Reihenfolge (Teil k enthält die Paare k, k + workers, ...)
+        zaehler = [None] * len(paare)
+        for k, teil_ergebnis in enumerate(ergebnisse):
+            zaehler[k::workers] = teil_ergebnis
+        return zaehler
+
+    @staticmethod
+    def _balken_werte(bild, p1, p2, bar_width):
+        """
+        Werte aller Bildpixel im Balken der Breite bar_width von p1 nach p2 (ausserhalb des Bildes
+        übersprungen), als Array in derselben Reihenfolge wie _balken_werte_referenz.
+
+        Die Koordinaten werden als Gitter (Schritt t x Querversatz w) mit denselben
+        float64-Ausdrücken und derselben Rundung Richtung 0 berechnet wie in der Schleife.
+        """
+        dx = p2[0] - p1[0]
+        dy = p2[1] - p1[1]
+        length = max(1, int(np.sqrt(dx * dx + dy * dy)))
+
+        nx = -dy / length
+        ny = dx / length
+
+        t = np.arange(length)
+        x = np.trunc(p1[0] + t * dx / length).astype(np.int64)[:, None]
+        y = np.trunc(p1[1] + t * dy / length).astype(np.int64)[:, None]
+        w = np.arange(-bar_width // 2, bar_width // 2 + 1)
+        wx = np.trunc(x + w * nx).astype(np.int64).ravel()
+        wy = np.trunc(y + w * ny).astype(np.int64).ravel()
+        im_bild = (wx >= 0) & (wx < bild.shape[1]) & (wy >= 0) & (wy < bild.shape[0])
+        return bild[wy[im_bild], wx[im_bild]]
+
+    @staticmethod
+    def _balken_werte_referenz(bild, p1, p2, bar_width):
+        """Ursprüngliche Pixel-Schleife zu _balken_werte, für den Vergleich im Benchmark."""
+        dx = p2[0] - p1[0]
+        dy = p2[1] - p1[1]
+        length = max(1, int(np.sqrt(dx * dx + dy * dy)))
+
+        nx = -dy / length
+        ny = dx / length
+
+        werte = []
+        for t in range(length):
+            x = int(p1[0] + t * dx / length)
+            y = int(p1[1] + t * dy / length)
+            for w in range(-bar_width // 2, bar_width // 2 + 1):
+                wx = int(x + w * nx)
+                wy = int(y + w * ny)
+                if 0 <= wx < bild.shape[1] and 0 <= wy < bild.shape[0]:
+                    werte.append(bild[wy, wx])
+        return werte
+
     @staticmethod
     def find_wall(objekte_liste, adjacency_matrix, matrix_buchstaben):
         """
@@ -245,87 +414,34 @@ class Objekt:
         0 = keine Verbindung
         1 = Verbindung ohne Wall
         2 = Verbindung mit Wall
+
+        Die Matrix wird als aktueller Stand in CURRENT_MATRIX übernommen (über alle Knoten A..H),
+        ins Journal nur nach open_matrix_journal.
         """
-        walls = [obj for obj in objekte_liste if obj.klasse == "wall"]
+        walls = np.array([obj.bounding_box for obj in objekte_liste if obj.klasse == "wall"]).reshape(-1, 4)
         punkte = {obj.buchstabe: obj for obj in objekte_liste if obj.buchstabe in matrix_buchstaben}
 
         erweiterte_matrix = np.copy(adjacency_matrix)
 
-        for i, b1 in enumerate(matrix_buchstaben):
-            for j, b2 in enumerate(matrix_buchstaben):
-                if i >= j or adjacency_matrix[i][j] != 1:
-                    continue
-
-                p1 = np.array(punkte[b1].zentrum)
-                p2 = np.array(punkte[b2].zentrum)
-
-                # Prüfe, ob irgendein Wall die Linie p1-p2 schneidet
-                for wall in walls:
-                    wx1, wy1, wx2, wy2 = wall.bounding_box
-
-                    if Objekt._linie_schneidet_rechteck(p1, p2, (wx1, wy1, wx2, wy2)):
-                        erweiterte_matrix[i][j] = 2
-                        erweiterte_matrix[j][i] = 2
-                        break
-
-        # Matrix speichern (nur einmal am Ende)
-        dataset_dir = os.path.join(os.path.dirname(os.path.dirname("dummy_path.jpg")), "Dataset")
-        matrix_dir = os.path.join(dataset_dir, "Matrix")
-        os.makedirs(matrix_dir, exist_ok=True)
-        matrix_path = os.path.join(matrix_dir, "Currentmatrix.txt")
-
-        buchstaben = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
-        vollstaendige_matrix = np.zeros((8, 8), dtype=int)
-
-        for i, b1 in enumerate(matrix_buchstaben):
-            if b1 in buchstaben:
-                orig_i = buchstaben.index(b1)
-                for j, b2 in enumerate(matrix_buchstaben):
-                    if b2 in buchstaben:
-                        orig_j = buchstaben.index(b2)
-                        vollstaendige_matrix[orig_i][orig_j] = erweiterte_matrix[i][j]
-
-        with open(matrix_path, 'w') as f:
-            f.write("adjacency_matrix = np.array([\n")
-            f.write("    # " + " ".join(buchstaben) + "\n")
-            for i, row in enumerate(vollstaendige_matrix):
-                simple_ints = [int(x) for x in row]
-                f.write(f"    {simple_ints},  # {buchstaben[i]}\n")
-            f.write("])")
-
-        print(f"Matrix mit Walls gespeichert unter: {matrix_path}")
+        # Alle verbundenen Paare auf einmal gegen alle Walls prüfen
+        paare = [(i, j) for i in range(len(matrix_buchstaben)) for j in range(i + 1, len(matrix_buchstaben))
+                 if adjacency_matrix[i][j] == 1]
+        if paare:
+            starts = [punkte[matrix_buchstaben[i]].zentrum for i, _ in paare]
+            ends = [punkte[matrix_buchstaben[j]].zentrum for _, j in paare]
+            blockiert = segments_hit_rects(starts, ends, walls).any(axis=1)
+            for (i, j), hat_wall in zip(paare, blockiert):
+                if hat_wall:
+                    erweiterte_matrix[i][j] = 2
+                    erweiterte_matrix[j][i] = 2
+
+        # Stand im Speicher aktualisieren, das Journal schreibt im Hintergrund
+        bild = next((obj._current_image_path for obj in objekte_liste
+                     if getattr(obj, '_current_image_path', None)), None)
+        CURRENT_MATRIX.set(erweiterte_matrix, matrix_buchstaben, os.path.basename(bild) if bild else "")
 
         return erweiterte_matrix
 
-    @staticmethod
-    def _linie_schneidet_rechteck(p1, p2, rect):
-        """Prüft, ob die Linie zwischen p1 und p2 das Rechteck schneidet oder innerhalb liegt"""
-        x_min, y_min, x_max, y_max = rect
-
-        # Check 1: Beide Punkte liegen innerhalb → gilt als "durchgeschnitten"
-        if (x_min <= p1[0] <= x_max and y_min <= p1[1] <= y_max) or \
-                (x_min <= p2[0] <= x_max and y_min <= p2[1] <= y_max):
-            return True
-
-        # Check 2: Linie schneidet irgendeine Kante
-        ecken = [(x_min, y_min), (x_max, y_min), (x_max, y_max), (x_min, y_max)]
-        kanten = list(zip(ecken, ecken[1:] + [ecken[0]]))
-
-        for a, b in kanten:
-            if Objekt._linien_schneiden(np.array(p1), np.array(p2), np.array(a), np.array(b)):
-                return True
-
-        return False
-
-    @staticmethod
-    def _linien_schneiden(a1, a2, b1, b2):
-        """Prüft, ob sich zwei Liniensegmente (a1-a2 und b1-b2) schneiden."""
-
-        def ccw(p1, p2, p3):
-            return (p3[1] - p1[1]) * (p2[0] - p1[0]) > (p2[1] - p1[1]) * (p3[0] - p1[0])
-
-        return (ccw(a1, b1, b2) != ccw(a2, b1, b2)) and (ccw(a1, a2, b1) != ccw(a1, a2, b2))
-
     @staticmethod
     def parse_text_to_objects(text):
         """
@@ -368,63 +484,7 @@ class Objekt:
            - D (rechts)
         3. Gibt eine Liste der erkannten Punkte zurück
         """
-        if not objekte_liste:
-            return []
-
-        # Liste für erkannte Punkte erstellen
-        erkannte_punkte = []
-
-        # Relevante Objekte (nur Punkte und Barrieren)
-        relevante_objekte = [
-            obj for obj in objekte_liste
-            if obj.klasse in ['point', 'pointa', 'pointb', 'pointc', 'barrier']
-        ]
-
-        # Nach Y-Position sortieren (absteigend, unterster zuerst)
-        sortierte_objekte = sorted(relevante_objekte,
-                                   key=lambda obj: obj.zentrum[1],
-                                   reverse=True)
-
-        # 1. E - unterster Punkt
-        if sortierte_objekte:
-            unterster = sortierte_objekte[0]
-            unterster.set_buchstabe('E')
-            erkannte_punkte.append(unterster)
-
-        # 2. Die nächsten 3 untersten Punkte (ohne E)
-        naechste_drei = [obj for obj in sortierte_objekte[1:] if obj not in erkannte_punkte][:3]
-
-        # Nach X-Position sortieren (aufsteigend)
-        if naechste_drei:
-            naechste_drei.sort(key=lambda obj: obj.zentrum[0])
-
-            # F - Links
-            if len(naechste_drei) >= 1:
-                naechste_drei[0].set_buchstabe('F')
-                erkannte_punkte.append(naechste_drei[0])
-
-            # G - Mitte
-            if len(naechste_drei) >= 2:
-                if len(naechste_drei) == 2:
-                    # Bei nur zwei Punkten: den zweiten auf D setzen
-                    naechste_drei[1].set_buchstabe('D')
-                    erkannte_punkte.append(naechste_drei[1])
-                else:
-                    # Bei drei Punkten: den mittleren auf G setzen
-                    naechste_drei[1].set_buchstabe('G')
-                    erkannte_punkte.append(naechste_drei[1])
-
-            # D - Rechts
-            if len(naechste_drei) >= 3:
-                naechste_drei[2].set_buchstabe('D')
-                erkannte_punkte.append(naechste_drei[2])
-
-        # Konsistenzprüfung
-        buchstaben = [getattr(obj, 'buchstabe', None) for obj in erkannte_punkte]
-        if len([b for b in buchstaben if b]) != len(set(b for b in buchstaben if b)):
-            print("Warnung: Doppelte Buchstaben erkannt!")
-
-        return erkannte_punkte
+        return assign_objects('E', objekte_liste)
 
     @classmethod
     def assignment_D(cls, objekte_liste):
@@ -434,48 +494,7 @@ class Objekt:
         2. G - nächster Punkt zu C
         3. Gibt eine Liste der erkannten Punkte zurück
         """
-        if not objekte_liste:
-            return []
-
-        # Liste für erkannte Punkte erstellen
-        erkannte_punkte = []
-
-        # Relevante Objekte (nur Punkte und Barrieren)
-        relevante_objekte = [
-            obj for obj in objekte_liste
-            if obj.klasse in ['point', 'pointa', 'pointb', 'pointc', 'barrier']
-        ]
-
-        # Nach X-Position sortieren (absteigend, rechtester zuerst)
-        sortierte_objekte = sorted(relevante_objekte,
-                                   key=lambda obj: obj.zentrum[0],
-                                   reverse=True)
-
-        # 1. C - rechtester Punkt
-        if sortierte_objekte:
-            rechtester = sortierte_objekte[0]
-            rechtester.set_buchstabe('C')
-            erkannte_punkte.append(rechtester)
-
-        # 2. G - nächster Punkt zu C
-        if erkannte_punkte:
-            punkt_c = erkannte_punkte[0]
-            verbleibende_punkte = [obj for obj in relevante_objekte if obj not in erkannte_punkte]
-
-            if verbleibende_punkte:
-                # Finde den nächsten Punkt zu C basierend auf euklidischer Distanz
-                naechster_zu_c = min(verbleibende_punkte,
-                                     key=lambda obj: np.sqrt((obj.zentrum[0] - punkt_c.zentrum[0]) ** 2 +
-                                                             (obj.zentrum[1] - punkt_c.zentrum[1]) ** 2))
-                naechster_zu_c.set_buchstabe('G')
-                erkannte_punkte.append(naechster_zu_c)
-
-        # Konsistenzprüfung
-        buchstaben = [getattr(obj, 'buchstabe', None) for obj in erkannte_punkte]
-        if len([b for b in buchstaben if b]) != len(set(b for b in buchstaben if b)):
-            print("Warnung: Doppelte Buchstaben erkannt!")
-
-        return erkannte_punkte
+        return assign_objects('D', objekte_liste)
 
     @classmethod
     def assignment_F(cls, objekte_liste, image_width, image_height):
@@ -487,48 +506,7 @@ class Objekt:
            - H ist weiter links und oben
            - G ist mehr rechts und unten
         """
-        if not objekte_liste:
-            return []
-
-        erkannte_punkte = []
-
-        # Relevante Objekte
-        relevante_objekte = [
-            obj for obj in objekte_liste
-            if obj.klasse in ['point', 'pointa', 'pointb', 'pointc', 'barrier']
-        ]
-
-        # 1. A - linkster Punkt
-        if relevante_objekte:
-            linkster = min(relevante_objekte, key=lambda obj: obj.zentrum[0])
-            linkster.set_buchstabe('A')
-            erkannte_punkte.append(linkster)
-
-        # 2. F - angenommene Position
-        f_zentrum = (image_width / 2, image_height + 50)
-        print(f"Info: Verwende angenommene Position für F (Mitte unten +50): {f_zentrum}")
-
-        # 3. Zwei nächste Punkte zu F
-        verbleibende = [obj for obj in relevante_objekte if obj not in erkannte_punkte]
-        if len(verbleibende) >= 2:
-            verbleibende.sort(
-                key=lambda obj: np.sqrt((obj.zentrum[0] - f_zentrum[0]) ** 2 +
-                                        (obj.zentrum[1] - f_zentrum[1]) ** 2)
-            )
-            naechste_zwei = verbleibende[:2]
-
-            # Sortiere die zwei: H = weiter links und oben (kleineres x+y), G = anderes
-            naechste_zwei.sort(key=lambda obj: obj.zentrum[0] + obj.zentrum[1])
-            naechste_zwei[0].set_buchstabe('H')
-            naechste_zwei[1].set_buchstabe('G')
-            erkannte_punkte.extend(naechste_zwei)
-
-        # Konsistenzprüfung
-        buchstaben = [obj.buchstabe for obj in erkannte_punkte]
-        if len(buchstaben) != len(set(buchstaben)):
-            print("Warnung: Doppelte Buchstaben in assignment_F erkannt!")
-
-        return erkannte_punkte
+        return assign_objects('F', objekte_liste, image_width, image_height)
 
     @classmethod
     def assignment_G(cls, objekte_liste, image_width, image_height):  # <-- NEUE PARAMETER
@@ -538,63 +516,7 @@ class Objekt:
         2. Die pointa, pointb, pointc-Objekte werden zu A, B, C
         3. Gibt eine Liste der erkannten Punkte zurück
         """
-        # ... (Anfang der Methode bleibt gleich: if not objekte_liste, erkannte_punkte, Zuweisung A,B,C) ...
-        if not objekte_liste:
-            return []
-
-        erkannte_punkte = []
-
-        # Automatische Zuweisung für pointa, pointb, pointc
-        for obj in objekte_liste:
-            if obj.klasse == 'pointa':
-                obj.set_buchstabe('A')
-                erkannte_punkte.append(obj)
-            elif obj.klasse == 'pointb':
-                obj.set_buchstabe('B')
-                erkannte_punkte.append(obj)
-            elif obj.klasse == 'pointc':
-                obj.set_buchstabe('C')
-                erkannte_punkte.append(obj)
-
-        # Relevante Objekte, die noch nicht zugeordnet wurden (nur Punkte und Barrieren)
-        relevante_objekte = [
-            obj for obj in objekte_liste
-            if obj.klasse in ['point', 'barrier'] and obj not in erkannte_punkte
-        ]
-
-
-        # Annahme: Der Roboter steht auf G. G ist nicht sichtbar.
-        # Verwende die Mitte des unteren Bildschirmrands als Referenzpunkt für G.
-        if image_width > 0 and image_height > 0:
-            # Y-Koordinate ist die Höhe (oder Höhe - 1, je nach Konvention, hier nehmen wir Höhe an)
-            # X-Koordinate ist die halbe Breite
-            g_zentrum = (image_width / 2, image_height)
-            print(f"Info: Verwende angenommene Position für G (untere Mitte): {g_zentrum}")
-        else:
-            # Fallback oder Fehlerbehandlung, falls keine Bilddimensionen vorhanden sind
-            print("Warnung: Keine Bilddimensionen für assignment_G erhalten. Kann G-Referenz nicht setzen.")
-            g_zentrum = None  # Oder einen Standardwert, oder Fehler auslösen
-
-
-        # 1. H - nächster Punkt zum angenommenen G-Zentrum
-        if g_zentrum and relevante_objekte:
-            # Finde den nächsten Punkt zum *angenommenen* G-Zentrum
-            try:
-                naechster_zu_g = min(relevante_objekte,
-                                     key=lambda obj: np.sqrt((obj.zentrum[0] - g_zentrum[0]) ** 2 +
-                                                             (obj.zentrum[1] - g_zentrum[1]) ** 2))
-                naechster_zu_g.set_buchstabe('H')
-                erkannte_punkte.append(naechster_zu_g)
-                print(f"Info: H zugewiesen (nächster zu angenommener G-Position): {naechster_zu_g}")
-            except ValueError:
-                print("Warnung: Keine relevanten Objekte gefunden, um H relativ zu G zuzuordnen.")
-
-        # Konsistenzprüfung
-        buchstaben = [getattr(obj, 'buchstabe', None) for obj in erkannte_punkte]
-        if len([b for b in buchstaben if b]) != len(set(b for b in buchstaben if b)):
-            print("Warnung: Doppelte Buchstaben nach assignment_G erkannt!")
-
-        return erkannte_punkte
+        return assign_objects('G', objekte_liste, image_width, image_height)
 
     @classmethod
     def assignment_C(cls, objekte_liste):
@@ -604,57 +526,7 @@ class Objekt:
         2. H - nächster Punkt zu B
         3. Gibt eine Liste der erkannten Punkte zurück
         """
-        if not objekte_liste:
-            return []
-
-        # Liste für erkannte Punkte erstellen
-        erkannte_punkte = []
-
-        # Relevante Objekte (alle Punkte und Barrieren)
-        relevante_objekte = [
-            obj for obj in objekte_liste
-            if obj.klasse in ['point', 'pointa', 'pointb', 'pointc', 'barrier']
-        ]
-
-        # Nach X-Position sortieren (absteigend, rechtester zuerst)
-        sortierte_objekte = sorted(relevante_objekte,
-                                   key=lambda obj: obj.zentrum[0],
-                                   reverse=True)
-
-        # 1. B - rechtester Punkt mit Prüfung auf pointb
-        if sortierte_objekte:
-            # Prüfe, ob der rechteste Punkt ein pointb ist
-            pointb_objekte = [obj for obj in sortierte_objekte if obj.klasse == 'pointb']
-
-            if pointb_objekte and pointb_objekte[0] == sortierte_objekte[0]:
-                # Der rechteste Punkt ist ein pointb
-                punkt_b = pointb_objekte[0]
-            else:
-                # Nimm einfach den rechtesten Punkt
-                punkt_b = sortierte_objekte[0]
-
-            punkt_b.set_buchstabe('B')
-            erkannte_punkte.append(punkt_b)
-
-        # 2. H - nächster Punkt zu B
-        if erkannte_punkte:
-            punkt_b = erkannte_punkte[0]
-            verbleibende_punkte = [obj for obj in relevante_objekte if obj not in erkannte_punkte]
-
-            if verbleibende_punkte:
-                # Finde den nächsten Punkt zu B basierend auf euklidischer Distanz
-                naechster_zu_b = min(verbleibende_punkte,
-                                     key=lambda obj: np.sqrt((obj.zentrum[0] - punkt_b.zentrum[0]) ** 2 +
-                                                             (obj.zentrum[1] - punkt_b.zentrum[1]) ** 2))
-                naechster_zu_b.set_buchstabe('H')
-                erkannte_punkte.append(naechster_zu_b)
-
-        # Konsistenzprüfung
-        buchstaben = [getattr(obj, 'buchstabe', None) for obj in erkannte_punkte]
-        if len([b for b in buchstaben if b]) != len(set(b for b in buchstaben if b)):
-            print("Warnung: Doppelte Buchstaben erkannt!")
-
-        return erkannte_punkte
+        return assign_objects('C', objekte_liste)
 
     @classmethod
     def assignment_H(cls, objekte_liste):
@@ -664,53 +536,7 @@ class Objekt:
         2. Gibt eine Liste der erkannten Punkte zurück
         3. Position von H wird als unten in der Mitte des Bildes angenommen
         """
-        if not objekte_liste:
-            return []
-
-        # Liste für erkannte Punkte erstellen
-        erkannte_punkte = []
-
-        # Relevante Objekte (alle Punkte und Barrieren)
-        relevante_objekte = [
-            obj for obj in objekte_liste
-            if obj.klasse in ['point', 'pointa', 'pointb', 'pointc', 'barrier']
-        ]
-
-        # 1. Prüfen, ob ein Objekt als pointb klassifiziert wurde
-        pointb_objekte = [obj for obj in relevante_objekte if obj.klasse == 'pointb']
-
-        if pointb_objekte:
-            # Verwende das als pointb erkannte Objekt
-            punkt_b = pointb_objekte[0]
-            punkt_b.set_buchstabe('B')
-            erkannte_punkte.append(punkt_b)
-        else:
-            # Schätze die Position von H (unten in der Mitte des Bildes)
-            # In einer realen Anwendung würde diese Information aus den Bilddimensionen oder
-            # aus Sensorwerten kommen
-
-            # Berechne die maximalen X- und Y-Koordinaten aus allen sichtbaren Objekten
-            if relevante_objekte:
-                max_x = max(obj.zentrum[0] for obj in relevante_objekte)
-                max_y = max(obj.zentrum[1] for obj in relevante_objekte)
-                min_x = min(obj.zentrum[0] for obj in relevante_objekte)
-
-                # H ist am unteren Rand in der Mitte des Bildes
-                h_position = ((min_x + max_x) / 2, max_y)
-
-                # Finde das nächste Objekt zu dieser geschätzten H-Position
-                naechster_zu_h = min(relevante_objekte,
-                                     key=lambda obj: np.sqrt((obj.zentrum[0] - h_position[0]) ** 2 +
-                                                             (obj.zentrum[1] - h_position[1]) ** 2))
-                naechster_zu_h.set_buchstabe('B')
-                erkannte_punkte.append(naechster_zu_h)
-
-        # Konsistenzprüfung
-        buchstaben = [getattr(obj, 'buchstabe', None) for obj in erkannte_punkte]
-        if len([b for b in buchstaben if b]) != len(set(b for b in buchstaben if b)):
-            print("Warnung: Doppelte Buchstaben erkannt!")
-
-        return erkannte_punkte
+        return assign_objects('H', objekte_liste)
 
     @classmethod
     def assignment_A(cls, objekte_liste):
@@ -720,63 +546,7 @@ class Objekt:
         2. H - nächster Punkt zu B
         3. Gibt eine Liste der erkannten Punkte zurück
         """
-        if not objekte_liste:
-            print("Warnung: Leere Objektliste an assignment_A übergeben.")
-            return []
-
-        erkannte_punkte = []
-        punkt_b = None
-
-        # Relevante Objekte filtern (z.B. Punkte und Barrieren)
-        # Passe die Klassen bei Bedarf an.
-        relevante_objekte = [
-            obj for obj in objekte_liste
-            if obj.klasse in ['point', 'pointa', 'pointb', 'pointc', 'barrier']
-               and getattr(obj, 'buchstabe', None) is None  # Nur Objekte ohne Buchstaben berücksichtigen
-        ]
-
-        if not relevante_objekte:
-            print("Warnung: Keine relevanten, nicht zugewiesenen Objekte für assignment_A gefunden.")
-            return []  # Rückgabe leerer Liste, wenn keine relevanten Objekte da sind
-
-        # --- 1. B - linkster Punkt ---
-        try:
-            # Sortiere nach X-Koordinate (aufsteigend), um den linkesten zu finden
-            relevante_objekte.sort(key=lambda obj: obj.zentrum[0])
-            punkt_b = relevante_objekte[0]
-            punkt_b.set_buchstabe('B')
-            erkannte_punkte.append(punkt_b)
-            print(f"Info [assignment_A]: B zugewiesen (linkster Punkt): {punkt_b}")
-        except IndexError:
-            print("Fehler [assignment_A]: Konnte keinen linksten Punkt für B finden (Liste evtl. leer nach Filterung).")
-            return erkannte_punkte  # B konnte nicht zugewiesen werden
-
-        # --- 2. H - nächster Punkt zu B ---
-        # Entferne B aus der Liste der Kandidaten für H
-        verbleibende_punkte = [obj for obj in relevante_objekte if obj is not punkt_b]  # Identitätsvergleich
-
-        if verbleibende_punkte:
-            try:
-                # Finde den nächsten Punkt zu B basierend auf euklidischer Distanz
-                naechster_zu_b = min(verbleibende_punkte,
-                                     key=lambda obj: np.sqrt((obj.zentrum[0] - punkt_b.zentrum[0]) ** 2 +
-                                                             (obj.zentrum[1] - punkt_b.zentrum[1]) ** 2))
-                naechster_zu_b.set_buchstabe('H')
-                erkannte_punkte.append(naechster_zu_b)
-                print(f"Info [assignment_A]: H zugewiesen (nächster zu B): {naechster_zu_b}")
-            except ValueError:
-                # Sollte nicht passieren, wenn verbleibende_punkte nicht leer ist, aber sicherheitshalber
-                print("Warnung [assignment_A]: Fehler beim Finden des nächsten Punktes zu B.")
-        else:
-            print(
-                "Warnung [assignment_A]: Keine verbleibenden Punkte nach Zuweisung von B gefunden, um H zu bestimmen.")
-
-        # Konsistenzprüfung (optional, aber empfohlen)
-        buchstaben_gefunden = [p.buchstabe for p in erkannte_punkte]
-        if len(buchstaben_gefunden) != len(set(buchstaben_gefunden)):
-            print(f"Warnung [assignment_A]: Doppelte Buchstaben erkannt: {buchstaben_gefunden}")
-
-        return erkannte_punkte
+        return assign_objects('A', objekte_liste)
 
     @classmethod
     def assignment_B(cls, objekte_liste):
@@ -789,65 +559,25 @@ class Objekt:
            - A (rechts)
         3. Gibt eine Liste der erkannten Punkte zurück
         """
-        if not objekte_liste:
-            return []
-
-        # Liste für erkannte Punkte erstellen
-        erkannte_punkte = []
-
-        # Relevante Objekte (nur Punkte und Barrieren)
-        relevante_objekte = [
-            obj for obj in objekte_liste
-            if obj.klasse in ['point', 'pointa', 'pointb', 'pointc', 'barrier']
-        ]
-
-        if len(relevante_objekte) < 3:
-            print(
-                f"Warnung: Nur {len(relevante_objekte)} relevante Objekte gefunden, benötige mindestens 3 für assignment_B")
-            # Verarbeite trotzdem die vorhandenen Objekte
-            verfuegbare_objekte = relevante_objekte
-        else:
-            # Nach Y-Position sortieren (absteigend, unterster zuerst)
-            sortierte_objekte = sorted(relevante_objekte,
-                                       key=lambda obj: obj.zentrum[1],
-                                       reverse=True)
-
-            # Die 3 untersten Punkte nehmen
-            verfuegbare_objekte = sortierte_objekte[:3]
-
-        # Nach X-Position sortieren (aufsteigend, von links nach rechts)
-        verfuegbare_objekte.sort(key=lambda obj: obj.zentrum[0])
-
-        # Zuweisungen basierend auf verfügbaren Objekten
-        zuweisungen = ['C', 'H', 'A']  # Links, Mitte, Rechts
-
-        for i, obj in enumerate(verfuegbare_objekte):
-            if i < len(zuweisungen):
-                obj.set_buchstabe(zuweisungen[i])
-                erkannte_punkte.append(obj)
-                print(f"Info [assignment_B]: {zuweisungen[i]} zugewiesen an Position {i + 1} von links")
-
-        # Konsistenzprüfung
-        buchstaben = [getattr(obj, 'buchstabe', None) for obj in erkannte_punkte]
-        if len([b for b in buchstaben if b]) != len(set(b for b in buchstaben if b)):
-            print("Warnung: Doppelte Buchstaben in assignment_B erkannt!")
-
-        return erkannte_punkte
+        return assign_objects('B', objekte_liste)
 
 
 
     @classmethod
-    def draw_objects_on_image(cls, image_path, objekte_liste, output_path="output.jpg", bar_width=20):
+    def draw_objects_on_image(cls, image_path, objekte_liste, output_path="output.jpg", bar_width=20,
+                              adj_matrix=None, matrix_buchstaben=None):
         """
         Zeichnet alle Objekte mit Buchstaben und Verbindungsbalken auf das Bild,
         aber nur Verbindungen, die in der tatsächlichen Adjazenzmatrix gefunden wurden.
+
+        image_path darf auch ein FrameContext sein, dann wird das Bild nicht erneut gelesen.
+        adj_matrix/matrix_buchstaben: bereits berechnetes Ergebnis von create_adjacency_matrix
+        für dieses Bild; nur wenn sie fehlen, wird die Matrix hier neu berechnet.
         """
         try:
-            # Bild laden
-            if not os.path.exists(image_path):
-                raise FileNotFoundError(f"Bilddatei nicht gefunden: {image_path}")
-
-            image = Image.open(image_path)
+            # Bild laden (nur ohne FrameContext)
+            frame = FrameContext.of(image_path)
+            image = Image.fromarray(frame.rgb)
             draw = ImageDraw.Draw(image)
 
             # Schriftart laden
@@ -878,8 +608,9 @@ class Objekt:
             punkt_dict = {obj.buchstabe: obj for obj in objekte_liste if obj.buchstabe in buchstaben}
             vorhandene_buchstaben = sorted(list(punkt_dict.keys()))
 
-            # Erstelle die Adjazenzmatrix basierend auf dem aktuellen Bild
-            adj_matrix, matrix_buchstaben = cls.create_adjacency_matrix(objekte_liste, image_path)
+            # Erstelle die Adjazenzmatrix basierend auf dem aktuellen Bild, falls nicht übergeben
+            if adj_matrix is None or matrix_buchstaben is None:
+                adj_matrix, matrix_buchstaben = cls.create_adjacency_matrix(objekte_liste, frame)
 
             # Erstelle ein Mapping der Buchstaben-Indizes in der Matrix
             buchstaben_zu_matrix_index = {b: matrix_buchstaben.index(b) for b in matrix_buchstaben}
@@ -997,10 +728,10 @@ if __name__ == "__main__":
     import os
     import re
     import numpy as np
-    import cv2
 
     try:
         base_dir = r'C:\Users\marin\PycharmProjects\PREN1G11\src\utils\aplha\Dataset'
+        journal = open_matrix_journal()
 
         # Alle Szenarien (Bild + Text)
         szenarien = []
@@ -1028,21 +759,13 @@ if __name__ == "__main__":
             with open(txt_path, 'r') as file:
                 objekte = Objekt.parse_text_to_objects(file.read())
 
+            # Bild einmal laden, alle weiteren Schritte arbeiten auf demselben Kontext
+            frame = FrameContext(bild_path)
+
             # Zuweisung
-            assignment_func = getattr(Objekt, f'assignment_{buchstabe}', None)
-            if assignment_func:
-                if assignment_func.__name__ in ['assignment_G', 'assignment_F']:
-                    image = cv2.imread(bild_path)
-                    if image is None:
-                        raise FileNotFoundError(f"Bild für assignment_G nicht gefunden: {bild_path}")
-                    height, width = image.shape[:2]
-                    erkannte = assignment_func(objekte, width, height)
-                else:
-                    if hasattr(Objekt, f'assignment_{buchstabe}_with_logging'):
-                        erkannte = getattr(Objekt, f'assignment_{buchstabe}_with_logging')(objekte, bild_path)
-                    else:
-                        Objekt.set_current_image_context(objekte, bild_path)
-                        erkannte = assignment_func(objekte)
+            if buchstabe in VIEWPOINT_TEMPLATES:
+                Objekt.set_current_image_context(objekte, frame)
+                erkannte = assign_objects(buchstabe, objekte, frame.width, frame.height)
             else:
                 print(f"⚠️ Keine Assignment-Methode für Buchstabe {buchstabe} gefunden.")
                 erkannte = []
@@ -1050,7 +773,7 @@ if __name__ == "__main__":
             alle_erkannten_objekte += erkannte
 
             # Matrix (nur Linien)
-            matrix, matrix_buchstaben = Objekt.create_adjacency_matrix(objekte, bild_path)
+            matrix, matrix_buchstaben = Objekt.create_adjacency_matrix(objekte, frame)
 
             print(f"\nMatrix nach Assignment {buchstabe} (nur Linien):")
             print("   " + " ".join(matrix_buchstaben))
@@ -1065,24 +788,15 @@ if __name__ == "__main__":
             for i, row in enumerate(matrix_mit_walls):
                 print(f"{matrix_buchstaben[i]} {list(map(int, row))}")
 
-            # Umwandlung in vollständige 8x8 Matrix
-            buchstaben_liste = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
-            vollmatrix = np.zeros((8, 8), dtype=int)
-
-            # Exakte Übernahme der Wände von matrix_mit_walls in 8x8-Matrix
-            for i_local, b1 in enumerate(matrix_buchstaben):
-                if b1 in buchstaben_liste:
-                    i_global = buchstaben_liste.index(b1)
-                    for j_local, b2 in enumerate(matrix_buchstaben):
-                        if b2 in buchstaben_liste:
-                            j_global = buchstaben_liste.index(b2)
-                            vollmatrix[i_global][j_global] = matrix_mit_walls[i_local][j_local]
+            # Vollständige 8x8 Matrix (wie von find_wall übernommen)
+            vollmatrix = CURRENT_MATRIX.expand(matrix_mit_walls, matrix_buchstaben)
 
             finale_matrixen.append(vollmatrix)
 
             # Bild mit Balken
             output_path = os.path.join(base_dir, f'output_{buchstabe}.jpg')
-            Objekt.draw_objects_on_image(bild_path, objekte, output_path)
+            Objekt.draw_objects_on_image(frame, objekte, output_path,
+                                         adj_matrix=matrix, matrix_buchstaben=matrix_buchstaben)
 
         # Endgültige kombinierte Matrix (nur geprüfte)
         if finale_matrixen:
@@ -1090,20 +804,10 @@ if __name__ == "__main__":
             for m in finale_matrixen:
                 combined = np.maximum(combined, m)
 
-            dataset_dir = os.path.join(os.path.dirname(os.path.dirname("dummy_path.jpg")), "Dataset")
-            matrix_dir = os.path.join(dataset_dir, "Matrix")
-            os.makedirs(matrix_dir, exist_ok=True)
-            matrix_path = os.path.join(matrix_dir, "Currentmatrix.txt")
-
-            buchstaben = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
-            with open(matrix_path, 'w') as f:
-                f.write("adjacency_matrix = np.array([\n")
-                f.write("    # " + " ".join(buchstaben) + "\n")
-                for i, row in enumerate(combined):
-                    f.write(f"    {list(map(int, row))},  # {buchstaben[i]}\n")
-                f.write("])")
-
-            print(f"\n✅ Kombinierte Matrix (mit Walls) gespeichert unter: {matrix_path}")
+            CURRENT_MATRIX.set(combined, label="kombiniert")
+            journal.flush()
+            print(f"\n✅ Kombinierte Matrix (mit Walls):\n{CURRENT_MATRIX}")
+            print(f"Journal: {journal.path}")
         else:
             print("⚠️ Keine geprüften Matrizen zum Zusammenführen gefunden.")
 
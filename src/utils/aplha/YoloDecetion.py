@@ -1,6 +1,7 @@
 import os
 import cv2
-from ultralytics import YOLO
+
+from roboter_final.DetectorBackends import create_backend
 
 
 # Ihre existierende Objekt-Klasse wird hier importiert
@@ -85,23 +86,25 @@ class Objekt:
 
 
 class YoloDetector:
-    def __init__(self, model_path):
+    def __init__(self, model_path, backend="ultralytics"):
         """
         Initialisiert den YOLO Detector ohne GUI
 
         :param model_path: Pfad zum YOLO-Modell (.pt Datei)
+        :param backend: "ultralytics", "onnx" oder "openvino" (siehe roboter_final/DetectorBackends.py)
         """
         self.model_path = model_path
-        self.model = None
+        self.backend_name = backend
+        self.backend = None
         self.labels = None
         self.load_model()
 
     def load_model(self):
-        """Lädt das YOLO-Modell"""
+        """Lädt das YOLO-Modell über das gewählte Backend"""
         try:
-            print(f"Lade Modell: {os.path.basename(self.model_path)}")
-            self.model = YOLO(self.model_path)
-            self.labels = self.model.names
+            print(f"Lade Modell: {os.path.basename(self.model_path)} ({self.backend_name})")
+            self.backend = create_backend(self.backend_name, self.model_path)
+            self.labels = self.backend.labels
             print(f"Modell erfolgreich geladen: {len(self.labels)} Klassen erkannt")
         except Exception as e:
             print(f"Fehler beim Laden des Modells: {str(e)}")
@@ -127,16 +130,15 @@ class YoloDetector:
 
         # Objekterkennung durchführen
         print(f"Führe Objekterkennung durch (Mindest-Zuverlässigkeit: {confidence_threshold * 100}%)")
-        results = self.model(frame, verbose=False, conf=confidence_threshold)
-        detections = results[0].boxes
+        boxes, confidences, class_ids = self.backend.predict(frame, confidence_threshold)
 
         detected_objects = []
 
         # Erkannte Objekte verarbeiten
-        for det in detections:
-            xmin, ymin, xmax, ymax = map(int, det.xyxy[0])
-            conf = det.conf.item()
-            classidx = int(det.cls.item())
+        for box, conf, classidx in zip(boxes, confidences, class_ids):
+            xmin, ymin, xmax, ymax = map(int, box)
+            conf = float(conf)
+            classidx = int(classidx)
             classname = self.labels[classidx]
 
             # Objekt erstellen